@@ -3,27 +3,61 @@ from flask import Flask
 
 
 def create_app(config_class=None):
-    app = Flask(__name__,
-                instance_relative_config=True,
-                template_folder='templates')
+    from app.startup import StartupTimer
+    timer = StartupTimer()
 
-    if config_class is None:
-        from app.config import Config
-        app.config.from_object(Config)
-    else:
-        app.config.from_object(config_class)
+    with timer.phase('config'):
+        app = Flask(__name__,
+                    instance_relative_config=True,
+                    template_folder='templates')
 
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        if config_class is None:
+            from app.config import Config
+            app.config.from_object(Config)
+        else:
+            app.config.from_object(config_class)
 
-    from app.extensions import db, login_manager
-    db.init_app(app)
-    login_manager.init_app(app)
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-    from app.routes import register_blueprints
-    register_blueprints(app)
+    with timer.phase('extensions'):
+        from app.database import database_binds, engine_options, init_engine
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+        app.config['SQLALCHEMY_BINDS'] = database_binds(app.config)
+
+        from app.extensions import db, login_manager
+        db.init_app(app)
+        login_manager.init_app(app)
+
+        from app.identity import identity_cache
+        identity_cache.init_app(app)
+
+        from app.events import broadcaster
+        broadcaster.init_app(app)
+
+        from app.instrumentation import instrumentation
+        instrumentation.init_app(app)
+
+        from app.assets import assets
+        assets.init_app(app)
+
+        from app.storage import init_app as init_storage
+        init_storage(app)
+
+    with timer.phase('blueprints'):
+        from app.routes import register_blueprints
+        register_blueprints(app)
+
+        from app.cli import register_commands
+        register_commands(app)
 
     with app.app_context():
-        from app.services import init_db
-        init_db()
+        with timer.phase('engine'):
+            init_engine(app)
+
+        with timer.phase('bootstrap'):
+            from app.services import bootstrap_db
+            bootstrap_db(seed=app.config['SEED_ON_BOOTSTRAP'])
 
+    app.extensions['startup_timings'] = timer
+    app.logger.debug('startup timings\n%s', timer.format())
     return app
@@ -0,0 +1,263 @@
+"""오래된 처리완료 제출의 보관.
+
+`flask archive run` 은 제출 후 ARCHIVE_AFTER_DAYS 가 지난 처리완료 제출을 id 순으로
+ARCHIVE_BATCH_SIZE 건씩 보관 DB(SQLALCHEMY_BINDS['archive'])의 archived_submissions 로
+옮긴다. 녹취는 zlib 으로 압축해 배치·제출 월마다 묶음 파일 하나(YYYY-MM-NNNN.pack)로
+만들어 녹취 저장소(app/storage.py)의 archive/ 아래에 올리고, 위치(offset, length)를
+archived_recordings 에 기록한다. 묶음 파일은 한 번 쓰면 바꾸지 않으므로 오브젝트
+스토리지에도 그대로 두고 Range 요청으로 읽는다.
+
+두 DB 를 한 트랜잭션으로 묶을 수 없으므로 배치마다 보관 DB 에 먼저 쓰고 커밋한 뒤
+운영 DB 에서 행을 지우고 카운터를 조정한다. 중간에 멈추면 같은 제출이 양쪽에 남지만
+조회는 운영 DB 를 먼저 보므로 결과가 같고, 다시 실행하면 이미 보관된 행은 건너뛰고
+운영 쪽만 지운다. 보관 DB 에 기록되지 않은 묶음 파일은 남아도 다시 쓰지 않는다
+(새 번호를 받는다). 한 번에 한 프로세스만 실행한다고 가정한다.
+
+상세 화면과 녹취 재생은 find_submission / read_archived_recording 으로 운영 DB 에 없으면
+보관 DB 를 찾는다. QC 집계는 그대로 두며 (rollups.rebuild 는 보관 DB 도 집계한다),
+그래서 refresh 로 집계에 반영된 제출만 옮긴다. 내보내기(app/exports.py)는 보관 DB 도
+함께 읽는다. 제출 현황 목록·카운터·검색은 운영 DB 의 제출만 다룬다. SQLite 는 지운 페이지를 새 행에 재사용하며, 파일 크기를
+줄이려면 VACUUM 한다.
+"""
+import json
+import os
+import tempfile
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, func
+from sqlalchemy.orm import joinedload, undefer
+from app.counters import record_submissions
+from app.database import run_in_transaction
+from app.events import emit
+from app.extensions import db
+from app.models import ArchivedRecording, ArchivedSubmission, Job, RollupState, Submission, SubmissionDetail
+from app.rollups import STATE_NAME, refresh
+from app.storage import get_storage
+
+PACK_COMPRESS_LEVEL = 6
+PACK_PREFIX = 'archive/'
+SUBMISSION_COLUMNS = [column.key for column in Submission.__table__.columns]
+DETAIL_COLUMNS = [column.key for column in SubmissionDetail.__table__.columns if column.key != 'submission_id']
+
+
+# === 조회 ===
+
+def find_submission(submission_id):
+    """운영 DB 에 없으면 보관 DB 에서 찾는다. 둘 다 없으면 None."""
+    return db.session.get(Submission, submission_id) or db.session.get(ArchivedSubmission, submission_id)
+
+
+def find_customer_submission(customer_id):
+    """고객의 제출 (운영 DB 우선, 보관된 제출 포함). 없으면 None."""
+    return (Submission.query.filter_by(customer_id=customer_id).first()
+            or ArchivedSubmission.query.filter_by(customer_id=customer_id).first())
+
+
+def read_archived_recording(key):
+    """묶음 파일에서 녹취 원본 바이트를 읽는다. 보관되지 않았거나 묶음이 손상되었으면 None."""
+    entry = db.session.get(ArchivedRecording, key) if key else None
+    if entry is None:
+        return None
+    try:
+        data = get_storage().read_range(PACK_PREFIX + entry.pack, entry.offset, entry.length)
+        if entry.compressed:
+            data = zlib.decompress(data)
+    except (OSError, zlib.error):
+        current_app.logger.exception('archived recording unreadable: %s', key)
+        return None
+    return data if len(data) == entry.size else None
+
+
+# === 보관 ===
+
+def _archive_upper_id():
+    """옮겨도 되는 id 상한: 집계에 반영된 범위 안에서, 가장 최근 제출은 남긴다.
+
+    SQLite 의 INTEGER PRIMARY KEY 는 최대 id 행이 지워지면 그 번호를 다시 쓰므로
+    (보관 DB 의 id·집계 상한과 겹친다) 최대 id 행은 옮기지 않는다.
+    """
+    state = db.session.get(RollupState, STATE_NAME)
+    max_id = db.session.scalar(db.select(func.max(Submission.id))) or 0
+    return min(state.last_id if state else 0, max_id - 1)
+
+
+def _candidates(cutoff, after_id, upper_id, limit):
+    active_jobs = (db.select(Job.id)
+                   .where(Job.submission_id == Submission.id, Job.status.in_(('queued', 'running')))
+                   .exists())
+    return (Submission.query
+            .options(undefer(Submission.raw_customer_data), joinedload(Submission.detail))
+            .filter(Submission.admin_status == '처리완료', Submission.created_at < cutoff,
+                    Submission.id > after_id, Submission.id <= upper_id, ~active_jobs)
+            .order_by(Submission.id)
+            .limit(limit)
+            .all())
+
+
+def _archived(submission):
+    values = {name: getattr(submission, name) for name in SUBMISSION_COLUMNS}
+    detail = submission.detail
+    if detail is not None:
+        values['detail_data'] = json.dumps({name: getattr(detail, name) for name in DETAIL_COLUMNS},
+                                           ensure_ascii=False, default=str)
+    return ArchivedSubmission(**values)
+
+
+def _pack_name(storage, month):
+    """month 의 다음 묶음 파일 이름. 보관 DB 에 없더라도 저장소에 이미 있는 이름은 건너뛴다."""
+    seq = db.session.scalar(db.select(func.count(func.distinct(ArchivedRecording.pack)))
+                            .where(ArchivedRecording.pack.like(f'{month}-%')))
+    while True:
+        seq += 1
+        pack = f'{month}-{seq:04d}.pack'
+        if not storage.exists(PACK_PREFIX + pack):
+            return pack
+
+
+def _write_pack(storage, out, items, stats):
+    entries = []
+    offset = 0
+    for key in items:
+        try:
+            with storage.open(key) as f:
+                data = f.read()
+        except FileNotFoundError:
+            current_app.logger.warning('recording missing, not archived: %s', key)
+            continue
+        packed = zlib.compress(data, PACK_COMPRESS_LEVEL)
+        compressed = len(packed) < len(data)
+        stored = packed if compressed else data
+        out.write(stored)
+        entries.append(ArchivedRecording(key=key, offset=offset, length=len(stored),
+                                         size=len(data), compressed=compressed))
+        offset += len(stored)
+        stats['recording_bytes'] += len(data)
+        stats['packed_bytes'] += len(stored)
+    return entries
+
+
+def _pack_recordings(submissions, stats):
+    """아직 보관되지 않은 녹취를 제출 월별 묶음 파일로 만들어 올리고 ArchivedRecording 목록을 돌려준다."""
+    keys = {s.recording_file for s in submissions if s.recording_file}
+    if not keys:
+        return []
+    storage = get_storage()
+    done = set(db.session.scalars(db.select(ArchivedRecording.key).where(ArchivedRecording.key.in_(keys))))
+
+    by_month = {}
+    for submission in submissions:
+        key = submission.recording_file
+        if not key or key in done:
+            continue
+        done.add(key)
+        by_month.setdefault(f'{submission.created_at:%Y-%m}', []).append(key)
+
+    if storage.temp_dir:
+        os.makedirs(storage.temp_dir, exist_ok=True)
+    entries = []
+    for month, items in sorted(by_month.items()):
+        pack = _pack_name(storage, month)
+        fd, tmp_path = tempfile.mkstemp(dir=storage.temp_dir, suffix='.pack')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                pack_entries = _write_pack(storage, out, items, stats)
+                out.flush()
+                os.fsync(out.fileno())
+            if not pack_entries:
+                os.remove(tmp_path)
+                continue
+            storage.put_file(PACK_PREFIX + pack, tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        for entry in pack_entries:
+            entry.pack = pack
+        entries.extend(pack_entries)
+    stats['recordings'] += len(entries)
+    return entries
+
+
+def _remove_hot(ids, final_statuses):
+    """운영 DB 에서 보관한 제출과 딸린 행을 지우고 카운터를 조정한다 (run_in_transaction 안에서)."""
+    db.session.execute(delete(SubmissionDetail).where(SubmissionDetail.submission_id.in_(ids))
+                       .execution_options(synchronize_session=False))
+    db.session.execute(delete(Job).where(Job.submission_id.in_(ids))
+                       .execution_options(synchronize_session=False))
+    db.session.execute(delete(Submission).where(Submission.id.in_(ids))
+                       .execution_options(synchronize_session=False))
+    record_submissions(((final_status, '처리완료'), None, count)
+                       for final_status, count in Counter(final_statuses).items())
+    emit('submissions.archived', None, counters=True, ids=ids)
+
+
+def _release_recordings(keys):
+    """운영 DB 에서 더 이상 참조하지 않고 보관이 끝난 녹취 파일을 지운다."""
+    if not keys:
+        return
+    referenced = set(db.session.scalars(
+        db.select(Submission.recording_file).where(Submission.recording_file.in_(keys)).distinct()))
+    archived = set(db.session.scalars(db.select(ArchivedRecording.key).where(ArchivedRecording.key.in_(keys))))
+    storage = get_storage()
+    for key in (keys - referenced) & archived:
+        storage.delete(key)
+
+
+def archive_submissions(older_than=None, batch_size=None, limit=None):
+    """older_than(기본 ARCHIVE_AFTER_DAYS 일)보다 오래된 처리완료 제출을 보관한다.
+
+    limit 이 있으면 그 건수까지만 옮긴다. 옮긴 제출·녹취 수와 녹취 바이트 수를 돌려준다.
+    """
+    config = current_app.config
+    if older_than is None:
+        older_than = timedelta(days=config['ARCHIVE_AFTER_DAYS'])
+    batch_size = batch_size or config['ARCHIVE_BATCH_SIZE']
+    cutoff = datetime.utcnow() - older_than
+
+    refresh()
+    upper_id = _archive_upper_id()
+    stats = {'submissions': 0, 'recordings': 0, 'recording_bytes': 0, 'packed_bytes': 0}
+    after_id = 0
+    while limit is None or stats['submissions'] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - stats['submissions'])
+        submissions = _candidates(cutoff, after_id, upper_id, size)
+        if not submissions:
+            break
+        ids = [s.id for s in submissions]
+        final_statuses = [s.final_status for s in submissions]
+        keys = {s.recording_file for s in submissions if s.recording_file}
+        after_id = ids[-1]
+
+        existing = set(db.session.scalars(db.select(ArchivedSubmission.id).where(ArchivedSubmission.id.in_(ids))))
+        db.session.add_all(_pack_recordings(submissions, stats))
+        db.session.add_all(_archived(s) for s in submissions if s.id not in existing)
+        db.session.commit()
+
+        db.session.expunge_all()
+        run_in_transaction(lambda: _remove_hot(ids, final_statuses))
+        _release_recordings(keys)
+        stats['submissions'] += len(ids)
+    db.session.commit()
+    return stats
+
+
+def archive_stats():
+    """보관 DB 건수와 묶음 파일별 크기."""
+    packs = dict(db.session.execute(
+        db.select(ArchivedRecording.pack, func.max(ArchivedRecording.offset + ArchivedRecording.length))
+        .group_by(ArchivedRecording.pack)
+        .order_by(ArchivedRecording.pack)).all())
+    recordings = db.session.execute(db.select(
+        func.count(ArchivedRecording.key), func.coalesce(func.sum(ArchivedRecording.size), 0),
+        func.coalesce(func.sum(ArchivedRecording.length), 0))).one()
+    return {
+        'submissions': db.session.scalar(db.select(func.count(ArchivedSubmission.id))),
+        'oldest': db.session.scalar(db.select(func.min(ArchivedSubmission.created_at))),
+        'newest': db.session.scalar(db.select(func.max(ArchivedSubmission.created_at))),
+        'recordings': recordings[0],
+        'recording_bytes': recordings[1],
+        'packed_bytes': recordings[2],
+        'packs': packs,
+    }
@@ -0,0 +1,289 @@
+"""미리 빌드한 Tailwind CSS 와 HTML 응답 압축.
+
+`flask build-css` 는 Tailwind CLI 로 app/templates, DEFAULT_SCRIPT_HTML, DB 에 저장된
+스크립트에서 실제로 쓰인 클래스만 담은 압축 CSS 를 만들어 내용 해시를 붙인 이름
+(static/dist/app.<hash>.css)과 manifest.json 으로 저장한다. 같은 방식으로 쓰인 Font Awesome
+아이콘만 남긴 CSS 와 서브셋 글꼴(icons.<hash>.css, fa-solid.<hash>.woff2)도 만든다.
+빌드 결과는 저장소에 커밋해 배포에 그대로 실리며, 템플릿에 클래스나 아이콘을 추가하면
+다시 빌드해 커밋한다. 빌드 도구(tailwindcss-bin, fontawesomefree, fonttools, brotli)는
+빌드할 때만 필요하다. base.html 은 manifest 가 없으면 예전처럼 CDN 을 쓴다.
+/assets/ 아래 파일은 이름이 내용에 따라 바뀌므로 1년 immutable 캐시로 내보낸다.
+
+HTML/JSON 응답은 COMPRESS_MIN_BYTES 이상이면 Accept-Encoding 에 따라 brotli(설치된
+경우) 또는 gzip 으로 압축한다. 스트리밍 응답과 파일 전송은 건드리지 않는다.
+압축한 응답의 ETag 는 값은 그대로 두고 약한 ETag(W/)로 표시한다.
+"""
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shlex
+import subprocess
+import tempfile
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(APP_ROOT, 'static', 'dist')
+MANIFEST = os.path.join(DIST_DIR, 'manifest.json')
+CONTENT_GLOBS = [os.path.join(APP_ROOT, 'templates', '**', '*.html'),
+                 os.path.join(APP_ROOT, 'default_script.py')]
+PRECOMPRESSED = {'br': '.br', 'gzip': '.gz'}
+ASSET_MIMETYPES = {'.css': 'text/css', '.woff2': 'font/woff2'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/plain', 'text/csv',
+                          'application/json', 'application/javascript'}
+
+# base.html 의 CDN 설정과 빌드 설정이 함께 쓰는 테마
+TAILWIND_THEME = {
+    'extend': {
+        'fontFamily': {'sans': ['Pretendard', 'system-ui', 'sans-serif']},
+        'colors': {
+            'brand': {'50': '#eef2ff', '100': '#e0e7ff', '200': '#c7d2fe', '300': '#a5b4fc', '400': '#818cf8',
+                      '500': '#6366f1', '600': '#4f46e5', '700': '#4338ca', '800': '#3730a3', '900': '#312e81'},
+            'surface': {'50': '#f8fafc', '100': '#f1f5f9', '200': '#e2e8f0', '300': '#cbd5e1'},
+        },
+    },
+}
+
+TAILWIND_INPUT = os.path.join(APP_ROOT, 'tailwind.css')
+
+# Font Awesome solid 만 쓴다 (fas). 아이콘 규칙은 fontawesome.css 에서 골라 온다
+ICON_RULE = re.compile(r'((?:\.fa-[\w-]+::before,?\s*)+)\{\s*content:\s*"\\([0-9a-f]+)";\s*\}')
+ICON_CLASS = re.compile(r'\bfa-[a-z0-9-]+')
+ICON_CORE_CSS = (
+    '@font-face{{font-family:"Font Awesome 6 Free";font-style:normal;font-weight:900;font-display:block;'
+    'src:url({font}) format("woff2")}}'
+    '.fa,.fas,.fa-solid{{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+    'display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;line-height:1;'
+    'text-rendering:auto;font-family:"Font Awesome 6 Free";font-weight:900}}'
+)
+
+
+def _write_variants(path, data):
+    """원본과 함께 .gz / .br(설치된 경우) 사전 압축본을 쓴다."""
+    with open(path, 'wb') as out:
+        out.write(data)
+    with open(path + '.gz', 'wb') as out:
+        out.write(gzip.compress(data, 9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as out:
+            out.write(brotli.compress(data, quality=11))
+
+
+def build_css(command=None, extra_content=()):
+    """Tailwind CLI 로 CSS 를 빌드해 static/dist 에 저장하고 파일명을 돌려준다.
+
+    extra_content 는 템플릿 외에 클래스를 찾을 HTML 문자열(DB 의 스크립트 등)이다.
+    """
+    command = shlex.split(command or current_app.config['TAILWIND_COMMAND'])
+    with tempfile.TemporaryDirectory() as workdir:
+        content = list(CONTENT_GLOBS)
+        for i, html in enumerate(extra_content):
+            path = os.path.join(workdir, f'content-{i}.html')
+            with open(path, 'w', encoding='utf-8') as out:
+                out.write(html)
+            content.append(path)
+
+        config_path = os.path.join(workdir, 'tailwind.config.js')
+        with open(config_path, 'w', encoding='utf-8') as out:
+            out.write('module.exports = ' + json.dumps({'theme': TAILWIND_THEME}, ensure_ascii=False, indent=2) + ';\n')
+        input_path = os.path.join(workdir, 'input.css')
+        with open(TAILWIND_INPUT, encoding='utf-8') as f, open(input_path, 'w', encoding='utf-8') as out:
+            out.write(f.read())
+            out.write(f'\n@config {json.dumps(config_path)};\n')
+            out.writelines(f'@source {json.dumps(path)};\n' for path in content)
+        output_path = os.path.join(workdir, 'app.css')
+
+        subprocess.run(command + ['-i', input_path, '-o', output_path, '--minify'], check=True, cwd=workdir)
+        with open(output_path, 'rb') as f:
+            css = f.read()
+
+    filename = _hashed_name('app', '.css', css)
+    _remove_stale('app.*.css*', filename)
+    _write_variants(os.path.join(DIST_DIR, filename), css)
+    _update_manifest({'app.css': filename})
+    return filename
+
+
+def _hashed_name(stem, suffix, data):
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}'
+
+
+def _remove_stale(pattern, keep):
+    os.makedirs(DIST_DIR, exist_ok=True)
+    for old in glob.glob(os.path.join(DIST_DIR, pattern)):
+        if not os.path.basename(old).startswith(keep):
+            os.remove(old)
+
+
+def _update_manifest(entries):
+    manifest = Assets._load_manifest()
+    manifest.update(entries)
+    with open(MANIFEST, 'w', encoding='utf-8') as out:
+        json.dump(manifest, out, indent=2, sort_keys=True)
+        out.write('\n')
+
+
+def _fontawesome_dir():
+    try:
+        import fontawesomefree
+    except ImportError:
+        raise RuntimeError('아이콘 빌드에는 fontawesomefree 패키지가 필요합니다 (pip install fontawesomefree)')
+    return os.path.join(os.path.dirname(fontawesomefree.__file__), 'static', 'fontawesomefree')
+
+
+def build_icons(source_dir=None, extra_content=()):
+    """쓰인 Font Awesome 아이콘만 담은 CSS 와 서브셋 woff2 를 static/dist 에 저장하고 CSS 파일명을 돌려준다.
+
+    source_dir 는 Font Awesome Free 배포본(css/, webfonts/)이 있는 디렉터리 (기본: fontawesomefree 패키지).
+    """
+    from fontTools import subset
+
+    source_dir = source_dir or _fontawesome_dir()
+    with open(os.path.join(source_dir, 'css', 'fontawesome.css'), encoding='utf-8') as f:
+        codepoints = {}
+        for selectors, codepoint in ICON_RULE.findall(f.read()):
+            for name in re.findall(r'\.(fa-[\w-]+)::before', selectors):
+                codepoints[name] = int(codepoint, 16)
+
+    used = set()
+    sources = [path for pattern in CONTENT_GLOBS for path in glob.glob(pattern, recursive=True)]
+    for path in sources:
+        with open(path, encoding='utf-8') as f:
+            used.update(ICON_CLASS.findall(f.read()))
+    for html in extra_content:
+        used.update(ICON_CLASS.findall(html or ''))
+    icons = sorted(name for name in used if name in codepoints)
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = []
+    options.name_IDs = ['*']
+    font = subset.load_font(os.path.join(source_dir, 'webfonts', 'fa-solid-900.ttf'), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes={codepoints[name] for name in icons})
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    font_data = buffer.getvalue()
+    font_name = _hashed_name('fa-solid', '.woff2', font_data)
+
+    by_codepoint = {}
+    for name in icons:
+        by_codepoint.setdefault(codepoints[name], []).append(name)
+    css = ICON_CORE_CSS.format(font=font_name) + ''.join(
+        ','.join(f'.{name}::before' for name in names) + f'{{content:"\\{codepoint:x}"}}'
+        for codepoint, names in sorted(by_codepoint.items())
+    )
+    css = css.encode()
+    filename = _hashed_name('icons', '.css', css)
+
+    _remove_stale('fa-solid.*.woff2', font_name)
+    _remove_stale('icons.*.css*', filename)
+    with open(os.path.join(DIST_DIR, font_name), 'wb') as out:
+        out.write(font_data)
+    _write_variants(os.path.join(DIST_DIR, filename), css)
+    _update_manifest({'icons.css': filename, 'icons.woff2': font_name})
+    return filename
+
+
+def _accepted_encoding(header, available):
+    """Accept-Encoding 에서 available 중 쓸 인코딩 (br 우선). 없으면 None."""
+    accepted = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+class Assets:
+    def __init__(self):
+        self.manifest = {}
+        self.compress_enabled = True
+        self.compress_min_bytes = 1024
+        self.compress_level = 6
+
+    def init_app(self, app):
+        self.compress_enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.compress_min_bytes = app.config.get('COMPRESS_MIN_BYTES', self.compress_min_bytes)
+        self.compress_level = app.config.get('COMPRESS_LEVEL', self.compress_level)
+        self.manifest = self._load_manifest() if app.config.get('USE_BUILT_CSS', True) else {}
+        app.extensions['assets'] = self
+        app.add_url_rule('/assets/<path:filename>', 'assets', self.serve)
+        app.jinja_env.globals.update(asset_url=self.url, tailwind_config={'theme': TAILWIND_THEME})
+        if self.compress_enabled:
+            app.after_request(self.compress)
+
+    @staticmethod
+    def _load_manifest():
+        try:
+            with open(MANIFEST, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def url(self, name):
+        """빌드된 자산의 URL. 빌드 결과가 없으면 None."""
+        filename = self.manifest.get(name)
+        return url_for('assets', filename=filename) if filename else None
+
+    def serve(self, filename):
+        if filename not in self.manifest.values():
+            abort(404)
+        variants = [name for name, suffix in PRECOMPRESSED.items()
+                    if os.path.exists(os.path.join(DIST_DIR, filename + suffix))]
+        encoding = _accepted_encoding(request.headers.get('Accept-Encoding'), variants)
+        suffix = PRECOMPRESSED.get(encoding, '')
+        mimetype = ASSET_MIMETYPES.get(os.path.splitext(filename)[1], 'application/octet-stream')
+        response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype,
+                                       max_age=31536000, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = IMMUTABLE
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < self.compress_min_bytes:
+            return response
+        encoding = _accepted_encoding(request.headers.get('Accept-Encoding'),
+                                      ['br', 'gzip'] if brotli is not None else ['gzip'])
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=min(self.compress_level, 11)))
+        elif encoding == 'gzip':
+            response.set_data(gzip.compress(data, self.compress_level))
+        else:
+            return response
+        response.headers['Content-Encoding'] = encoding
+        # 라우트의 ETag 값은 그대로 두고 약한 ETag 로만 바꾼다. If-None-Match 는 약한 비교라
+        # 라우트의 make_conditional 이 다음 요청에서도 304 를 돌려줄 수 있다
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+assets = Assets()
@@ -0,0 +1,93 @@
+"""프리랜서 공용 통화 큐.
+
+customers.next_call_at 이 통화 가능 시각이다. 통화가 끝난(해피콜완료/통화거부)
+고객은 NULL 로 두어 큐에서 빠지므로, (assigned_agent_id, next_call_at) 인덱스의
+범위 조회만으로 다음 고객을 찾는다.
+
+다음 고객은 (1) 내게 배정되어 재통화 시각이 지난 고객, (2) 미배정이면서 통화
+가능한 고객 순으로 고른다. 미배정 고객은 assigned_agent_id IS NULL 일 때만
+배정하는 조건부 UPDATE 로 점유하므로 두 사람이 같은 고객을 가져가지 않으며,
+PostgreSQL 에서는 후보 조회에 FOR UPDATE SKIP LOCKED 를 붙여 경합을 피한다.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from app.events import emit
+from app.extensions import db
+from app.models import Customer, User
+
+CLAIM_CANDIDATES = 5
+CLAIM_ROUNDS = 3
+MISSED_CALL_STATUSES = ('1차부재', '2차부재', '3차부재')
+
+
+def next_call_time(status, now=None):
+    """상태 변경 후의 다음 통화 시각. 큐에서 빠져야 하면 None."""
+    now = now or datetime.utcnow()
+    if status == '대기':
+        return now
+    if status in MISSED_CALL_STATUSES:
+        minutes = current_app.config['CALL_RETRY_BACKOFF_MINUTES']
+        index = MISSED_CALL_STATUSES.index(status)
+        return now + timedelta(minutes=minutes[min(index, len(minutes) - 1)])
+    return None
+
+
+def _own_due(agent_id, now):
+    return db.session.scalars(
+        db.select(Customer)
+        .where(Customer.assigned_agent_id == agent_id, Customer.next_call_at <= now)
+        .order_by(Customer.next_call_at, Customer.id)
+        .limit(1)
+    ).first()
+
+
+def _pool_candidates(now):
+    return db.session.scalars(
+        db.select(Customer.id)
+        .where(Customer.assigned_agent_id.is_(None), Customer.next_call_at <= now)
+        .order_by(Customer.next_call_at, Customer.id)
+        .limit(CLAIM_CANDIDATES)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def claim_next_customer(agent_id, now=None):
+    """agent_id 가 다음에 통화할 고객을 점유해 돌려준다. 없으면 None."""
+    now = now or datetime.utcnow()
+    customer = _own_due(agent_id, now)
+    if customer is not None:
+        return customer
+
+    for _ in range(CLAIM_ROUNDS):
+        candidates = _pool_candidates(now)
+        if not candidates:
+            db.session.rollback()
+            return None
+        for customer_id in candidates:
+            claimed = db.session.execute(
+                update(Customer)
+                .where(Customer.id == customer_id,
+                       Customer.assigned_agent_id.is_(None),
+                       Customer.next_call_at <= now)
+                .values(assigned_agent_id=agent_id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if claimed:
+                agent = db.session.get(User, agent_id)
+                emit('customer.assigned', customer_id, agent_id=agent_id,
+                     agent=agent.username if agent else None)
+                db.session.commit()
+                return db.session.get(Customer, customer_id, populate_existing=True)
+        # 후보를 모두 다른 상담원이 먼저 가져갔다: 새 후보로 다시 시도
+        db.session.rollback()
+    return None
+
+
+def queue_depth(agent_id, now=None):
+    """(내 재통화 대기 건수, 공용 큐 대기 건수)."""
+    now = now or datetime.utcnow()
+    due = Customer.next_call_at <= now
+    own = Customer.query.filter(Customer.assigned_agent_id == agent_id, due).count()
+    pool = Customer.query.filter(Customer.assigned_agent_id.is_(None), due).count()
+    return own, pool
@@ -0,0 +1,186 @@
+import click
+from flask.cli import AppGroup
+
+jobs_cli = AppGroup('jobs', help='백그라운드 작업 큐')
+rollups_cli = AppGroup('rollups', help='QC 집계')
+archive_cli = AppGroup('archive', help='오래된 제출 보관')
+
+
+@jobs_cli.command('work')
+@click.option('--processes', default=1, show_default=True, help='워커 프로세스 수')
+@click.option('--poll-interval', default=1.0, show_default=True)
+@click.option('--burst', is_flag=True, help='큐가 비면 종료')
+def jobs_work(processes, poll_interval, burst):
+    """작업 워커를 실행합니다."""
+    from app.jobs import work, run_workers
+    if processes <= 1:
+        processed = work(poll_interval=poll_interval, burst=burst)
+        click.echo(f'processed {processed} jobs')
+    else:
+        run_workers(processes, poll_interval=poll_interval, burst=burst)
+
+
+@jobs_cli.command('stats')
+def jobs_stats():
+    """큐 깊이와 대기/실행 지연을 출력합니다."""
+    from app.jobs import queue_stats
+    stats = queue_stats()
+    for status, count in sorted(stats['counts'].items()):
+        click.echo(f'{status}\t{count}')
+    click.echo(f"depth\t{stats['depth']}")
+    click.echo(f"oldest_queued_age\t{stats['oldest_queued_age']}")
+    click.echo(f"avg_wait_seconds\t{stats['avg_wait_seconds']}")
+    click.echo(f"avg_run_seconds\t{stats['avg_run_seconds']}")
+
+
+@rollups_cli.command('refresh')
+def rollups_refresh():
+    """새 제출을 QC 집계에 반영합니다."""
+    from app.rollups import refresh
+    click.echo(f'added {refresh()} submissions')
+
+
+@rollups_cli.command('rebuild')
+@click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']), default=None)
+@click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']), default=None, help='이 날짜까지 포함')
+def rollups_rebuild(date_from, date_to):
+    """기간의 QC 집계를 지우고 다시 계산합니다 (기본: 전체)."""
+    from app.rollups import refresh, rebuild
+    refresh()
+    rows = rebuild(date_from.date() if date_from else None, date_to.date() if date_to else None)
+    click.echo(f'rebuilt {rows} rollup rows')
+
+
+@archive_cli.command('run')
+@click.option('--older-than-days', type=int, default=None, help='기본: ARCHIVE_AFTER_DAYS')
+@click.option('--batch-size', type=int, default=None, help='기본: ARCHIVE_BATCH_SIZE')
+@click.option('--limit', type=int, default=None, help='이 건수까지만 옮긴다')
+def archive_run(older_than_days, batch_size, limit):
+    """처리완료 후 오래된 제출과 녹취를 보관 DB·월별 묶음 파일로 옮깁니다."""
+    from datetime import timedelta
+    from app.archive import archive_submissions
+    older_than = timedelta(days=older_than_days) if older_than_days is not None else None
+    stats = archive_submissions(older_than=older_than, batch_size=batch_size, limit=limit)
+    click.echo(f"archived {stats['submissions']} submissions, {stats['recordings']} recordings "
+               f"({stats['recording_bytes']} -> {stats['packed_bytes']} bytes)")
+
+
+@archive_cli.command('stats')
+def archive_stats():
+    """보관된 제출 수와 묶음 파일 크기를 출력합니다."""
+    from app.archive import archive_stats as read_stats
+    stats = read_stats()
+    for name in ('submissions', 'oldest', 'newest', 'recordings', 'recording_bytes', 'packed_bytes'):
+        click.echo(f'{name}\t{stats[name]}')
+    for pack, size in stats['packs'].items():
+        click.echo(f'{pack}\t{size}')
+
+
+def register_commands(app):
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(archive_cli)
+
+    @app.cli.command('seed')
+    def seed():
+        """스키마를 최신으로 맞추고 테스트 계정과 기본 스크립트를 시드합니다."""
+        from app.services import init_db, seed_db
+        init_db()
+        seed_db()
+        click.echo('seeded')
+
+    @app.cli.command('build-css')
+    @click.option('--command', default=None, help='Tailwind CLI 실행 명령 (기본: TAILWIND_COMMAND)')
+    @click.option('--icons-from', default=None, type=click.Path(exists=True, file_okay=False),
+                  help='Font Awesome Free 배포본 디렉터리 (기본: fontawesomefree 패키지)')
+    def build_css(command, icons_from):
+        """템플릿·기본 스크립트·저장된 스크립트에서 쓰인 클래스와 아이콘만으로 CSS 를 빌드합니다."""
+        from app.assets import build_css as run_build, build_icons
+        from app.models import Script
+        scripts = [content for (content,) in Script.query.with_entities(Script.content)]
+        click.echo(f'static/dist/{run_build(command, extra_content=scripts)}')
+        click.echo(f'static/dist/{build_icons(icons_from, extra_content=scripts)}')
+
+    @app.cli.command('startup-report')
+    @click.option('--imports', is_flag=True, help='-X importtime 으로 느린 import 도 출력')
+    def startup_report(imports):
+        """새 인터프리터에서 import → create_app → 첫 응답 시간을 측정합니다."""
+        from app.startup import main
+        main(['--imports'] if imports else [])
+
+    @app.cli.command('reconcile-counters')
+    def reconcile_counters():
+        """기준 테이블에서 상태 카운터를 다시 계산합니다."""
+        from app.counters import reconcile
+        counters = reconcile()
+        for name in sorted(counters):
+            click.echo(f'{name}\t{counters[name]}')
+
+    @app.cli.command('import-customers')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['auto', 'csv', 'tsv', 'agency']), default='auto')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def import_customers(path, fmt, batch_size):
+        """CSV/TSV/대리점 개통 데이터 파일에서 고객을 일괄 등록합니다."""
+        from app.imports import iter_customer_rows, import_customers as run_import
+        with open(path, 'rb') as stream:
+            report = run_import(iter_customer_rows(stream, fmt), batch_size=batch_size)
+        click.echo(f'inserted={report.inserted} duplicates={report.duplicates} errors={report.error_count}')
+        for line_no, reason, value in report.errors:
+            click.echo(f'{line_no}\t{reason}\t{value}')
+
+    @app.cli.command('provision-freelancers')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--output', '-o', type=click.Path(dir_okay=False), default=None,
+                  help='생성된 아이디/비밀번호 CSV 저장 경로 (기본: 표준 출력)')
+    @click.option('--workers', type=int, default=None, help='해시 프로세스 풀 크기 (기본: CPU 수)')
+    def provision_freelancers(path, output, workers):
+        """CSV(아이디[,비밀번호])로 프리랜서 계정을 일괄 생성합니다."""
+        from app.provisioning import iter_freelancer_rows, provision_freelancers as run_provision
+        with open(path, 'rb') as stream:
+            report = run_provision(iter_freelancer_rows(stream), workers=workers)
+        click.echo(f'created={len(report.created)} existing={len(report.existing)} '
+                   f'errors={len(report.errors)}', err=True)
+        if output:
+            with open(output, 'w', encoding='utf-8', newline='') as f:
+                f.write(report.credentials_csv())
+        else:
+            click.echo(report.credentials_csv().lstrip('\ufeff'), nl=False)
+
+    @app.cli.command('backfill-details')
+    @click.option('--batch-size', default=500, show_default=True)
+    @click.option('--workers', type=int, default=None, help='프로세스 풀 크기 (기본: CPU 수)')
+    def backfill_details(batch_size, workers):
+        """기존 제출 건의 개통 데이터를 파싱해 submission_details 를 채웁니다."""
+        from app.services import backfill_submission_details
+        done = backfill_submission_details(batch_size=batch_size, workers=workers)
+        click.echo(f'parsed {done} submissions')
+
+    from app.exports import FILTERS as EXPORT_FILTERS, FORMATS as EXPORT_FORMATS
+
+    @app.cli.command('export-submissions')
+    @click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='csv', show_default=True)
+    @click.option('--filter', 'filter_type', type=click.Choice(EXPORT_FILTERS), default='all', show_default=True)
+    @click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']), default=None)
+    @click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']), default=None, help='이 날짜까지 포함')
+    @click.option('--gzip', is_flag=True)
+    @click.option('--output', '-o', type=click.File('wb'), default='-', show_default=True)
+    @click.option('--batch-size', default=2000, show_default=True)
+    def export_submissions(fmt, filter_type, date_from, date_to, gzip, output, batch_size):
+        """제출 건을 고객/상담원 정보와 함께 CSV 또는 NDJSON 으로 내보냅니다."""
+        from app.exports import export_submissions as run_export
+        if date_from and date_to and date_from > date_to:
+            raise click.BadParameter('시작 날짜가 종료 날짜보다 늦습니다.', param_hint="'--from'")
+        for chunk in run_export(fmt, filter_type,
+                                date_from.date() if date_from else None,
+                                date_to.date() if date_to else None,
+                                gzip=gzip, batch_size=batch_size):
+            output.write(chunk)
+
+    @app.cli.command('migrate')
+    def migrate():
+        """미적용 스키마 마이그레이션을 실행합니다."""
+        from app.migrations import run_migrations, latest_version
+        for version, description in run_migrations():
+            click.echo(f'applied {version}: {description}')
+        click.echo(f'schema version {latest_version()}')
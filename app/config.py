@@ -17,7 +17,73 @@ class Config:
         UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads')
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # DB 엔진 프로파일 (app/database.py)
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_WRITE_RETRIES = int(os.environ.get('DB_WRITE_RETRIES', 5))
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE', 50))
+
+    # 1차/2차/3차부재 후 재통화까지 대기 시간(분)
+    CALL_RETRY_BACKOFF_MINUTES = [
+        int(m) for m in os.environ.get('CALL_RETRY_BACKOFF_MINUTES', '60,240,1440').split(',')
+    ]
+
+    # 관리자 화면 실시간 갱신 (SSE): 폴링 주기(초), 하트비트(초), 스트림 최대 유지 시간(초)
+    EVENTS_POLL_INTERVAL = float(os.environ.get('EVENTS_POLL_INTERVAL', 1.0))
+    EVENTS_HEARTBEAT = int(os.environ.get('EVENTS_HEARTBEAT', 15))
+    EVENTS_STREAM_SECONDS = int(os.environ.get('EVENTS_STREAM_SECONDS', 55 if IS_VERCEL else 300))
+    EVENTS_RETENTION_HOURS = int(os.environ.get('EVENTS_RETENTION_HOURS', 24))
+
+    # 워커 프로세스를 띄울 수 없는 환경(Vercel)에서는 제출 직후 작업을 요청 안에서 실행
+    JOBS_EAGER = os.environ.get('JOBS_EAGER', '1' if IS_VERCEL else '0') == '1'
+    # 작업 워커가 QC 집계(rollups.refresh)를 반영하는 주기
+    ROLLUP_REFRESH_SECONDS = float(os.environ.get('ROLLUP_REFRESH_SECONDS', 60))
+
+    # user_loader 신원 캐시 (0 이면 비활성). 다른 워커의 계정 변경은 VERSION_CHECK 초 안에 반영
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE', 1024))
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 30))
+    IDENTITY_VERSION_CHECK_SECONDS = float(os.environ.get('IDENTITY_VERSION_CHECK_SECONDS', 2))
+
+    # 요청 계측 (app/instrumentation.py): Server-Timing 헤더, 느린 쿼리 로그 기준(ms), /metrics 토큰
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '1') == '1'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '1') == '1'
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # 정적 자산 (app/assets.py): flask build-css 가 쓰는 Tailwind v4 CLI (pip install tailwindcss-bin), HTML 응답 압축
+    TAILWIND_COMMAND = os.environ.get('TAILWIND_COMMAND', 'tailwindcss')
+    USE_BUILT_CSS = os.environ.get('USE_BUILT_CSS', '1') == '1'
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+    # 녹취 저장소 (app/storage.py): local 은 UPLOAD_FOLDER, s3 는 S3 호환 버킷 (boto3 필요).
+    # S3_ENDPOINT_URL 은 MinIO 같은 호환 서버 주소, 비우면 AWS. 자격 증명을 비우면 boto3 기본 체인을 쓴다.
+    RECORDING_STORAGE = os.environ.get('RECORDING_STORAGE', 'local')
+    S3_BUCKET = os.environ.get('S3_BUCKET')
+    S3_PREFIX = os.environ.get('S3_PREFIX', '')
+    S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')
+    S3_REGION = os.environ.get('S3_REGION')
+    S3_ACCESS_KEY_ID = os.environ.get('S3_ACCESS_KEY_ID')
+    S3_SECRET_ACCESS_KEY = os.environ.get('S3_SECRET_ACCESS_KEY')
+    S3_ADDRESSING_STYLE = os.environ.get('S3_ADDRESSING_STYLE')  # path | virtual, 비우면 엔드포인트가 있을 때 path
+    S3_PRESIGN_EXPIRES = int(os.environ.get('S3_PRESIGN_EXPIRES', 300))
+    S3_MULTIPART_CHUNK_MB = int(os.environ.get('S3_MULTIPART_CHUNK_MB', 8))
+    S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS', 10))
+
+    # 보관 (app/archive.py): 처리완료 후 이 일수가 지난 제출을 보관 DB 와 녹취 저장소의 archive/ 묶음으로 옮긴다.
+    # ARCHIVE_DATABASE_URL 이 없으면 SQLite 는 운영 DB 옆 <이름>_archive.db, 그 외에는 운영 DB 를 쓴다.
+    ARCHIVE_DATABASE_URL = os.environ.get('ARCHIVE_DATABASE_URL')
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 200))
+
+    # 스키마를 새로 만들 때 테스트 계정/기본 스크립트도 함께 시드 (그 외에는 flask seed)
+    SEED_ON_BOOTSTRAP = os.environ.get('SEED_ON_BOOTSTRAP', '1' if IS_VERCEL else '0') == '1'
 
     TEST_ADMIN_USERNAME = os.environ.get('TEST_ADMIN_USERNAME', '1')
     TEST_ADMIN_PASSWORD = os.environ.get('TEST_ADMIN_PASSWORD', '1')
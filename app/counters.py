@@ -0,0 +1,147 @@
+"""대시보드 배지용 상태 카운터.
+
+stat_counters 테이블에 키별 건수를 유지한다. 증감은 호출한 라우트의 세션에서
+상대 UPDATE(value = value + delta)로 실행되므로 본 작업과 같은 트랜잭션으로
+커밋/롤백되고, 동시 요청끼리도 값을 덮어쓰지 않는다. 처음 쓰는 키는
+INSERT ... ON CONFLICT DO UPDATE 로 넣어 두 요청이 동시에 만들어도 기본 키 충돌이 없다.
+"""
+from importlib import import_module
+from sqlalchemy import func, insert, update
+from app.extensions import db
+from app.models import StatCounter, Customer, Submission
+
+CALL_STATUSES = ['대기', '1차부재', '2차부재', '3차부재', '통화거부', '해피콜완료']
+
+
+def _submission_keys(final_status, admin_status):
+    return ['submission:total',
+            f'submission:final:{final_status}',
+            f'submission:admin:{admin_status}']
+
+
+def _customer_keys(call_status):
+    return ['customer:total', f'customer:call:{call_status}']
+
+
+# ON CONFLICT DO UPDATE 를 지원하는 방언. 쓰는 방언만 import 한다 (콜드 스타트)
+UPSERT_DIALECTS = ('sqlite', 'postgresql')
+
+
+def _upsert(dialect_name, name, delta):
+    if dialect_name not in UPSERT_DIALECTS:
+        return None
+    stmt = import_module(f'sqlalchemy.dialects.{dialect_name}').insert(StatCounter).values(name=name, value=delta)
+    return stmt.on_conflict_do_update(index_elements=[StatCounter.name],
+                                      set_={'value': StatCounter.value + stmt.excluded.value})
+
+
+def _execute_delta(execute, dialect_name, name, delta):
+    stmt = _upsert(dialect_name, name, delta)
+    if stmt is not None:
+        execute(stmt)
+        return
+    result = execute(
+        update(StatCounter)
+        .where(StatCounter.name == name)
+        .values(value=StatCounter.value + delta)
+    )
+    if result.rowcount == 0:
+        execute(insert(StatCounter).values(name=name, value=delta))
+
+
+def adjust(deltas):
+    dialect_name = db.session.get_bind(mapper=StatCounter).dialect.name
+    for name, delta in deltas.items():
+        if delta:
+            _execute_delta(db.session.execute, dialect_name, name, delta)
+
+
+def increment(connection, name, delta=1):
+    """세션 flush 중(매퍼 이벤트)처럼 connection 만 있을 때 카운터 하나를 올린다."""
+    _execute_delta(connection.execute, connection.dialect.name, name, delta)
+
+
+def _deltas(old_keys, new_keys, count=1, deltas=None):
+    deltas = {} if deltas is None else deltas
+    for key in old_keys:
+        deltas[key] = deltas.get(key, 0) - count
+    for key in new_keys:
+        deltas[key] = deltas.get(key, 0) + count
+    return deltas
+
+
+def _transition(old_keys, new_keys, count=1):
+    adjust(_deltas(old_keys, new_keys, count))
+
+
+def record_submission(old=None, new=None, count=1):
+    """제출 건 상태 변화를 반영. old/new는 (final_status, admin_status), 생성은 old=None."""
+    _transition(_submission_keys(*old) if old else [],
+                _submission_keys(*new) if new else [], count)
+
+
+def record_submissions(changes):
+    """record_submission 여러 건을 합쳐 카운터마다 UPDATE 한 번으로. changes 는 (old, new, count)."""
+    deltas = {}
+    for old, new, count in changes:
+        _deltas(_submission_keys(*old) if old else [],
+                _submission_keys(*new) if new else [], count, deltas)
+    adjust(deltas)
+
+
+def record_customer(old=None, new=None, count=1):
+    """고객 콜 상태 변화를 반영. 생성은 old=None, 삭제는 new=None."""
+    if old == new:
+        return
+    _transition(_customer_keys(old) if old else [],
+                _customer_keys(new) if new else [], count)
+
+
+def read_counters():
+    return dict(db.session.query(StatCounter.name, StatCounter.value).all())
+
+
+def submission_stats(counters=None):
+    counters = read_counters() if counters is None else counters
+    return {
+        'total': counters.get('submission:total', 0),
+        'normal': counters.get('submission:final:정상', 0),
+        'abnormal': counters.get('submission:final:비정상', 0),
+        'pending': counters.get('submission:admin:대기중', 0),
+        'resolved': counters.get('submission:admin:처리완료', 0),
+    }
+
+
+def customer_status_counts(counters=None):
+    counters = read_counters() if counters is None else counters
+    status_counts = {'all': counters.get('customer:total', 0)}
+    for status in CALL_STATUSES:
+        status_counts[status] = counters.get(f'customer:call:{status}', 0)
+    return status_counts
+
+
+def reconcile():
+    """기준 테이블을 GROUP BY로 다시 집계해 제출/고객 카운터를 재작성한다."""
+    counters = {}
+
+    def add(name, value):
+        counters[name] = counters.get(name, 0) + value
+
+    for final_status, admin_status, count in db.session.query(
+            Submission.final_status, Submission.admin_status, func.count(Submission.id)
+    ).group_by(Submission.final_status, Submission.admin_status):
+        for key in _submission_keys(final_status, admin_status):
+            add(key, count)
+
+    for call_status, count in db.session.query(
+            Customer.call_status, func.count(Customer.id)
+    ).group_by(Customer.call_status):
+        for key in _customer_keys(call_status):
+            add(key, count)
+
+    # identity:version 같은 집계가 아닌 키는 그대로 둔다
+    StatCounter.query.filter(StatCounter.name.like('submission:%')
+                             | StatCounter.name.like('customer:%')).delete(synchronize_session=False)
+    db.session.add_all(StatCounter(name=name, value=value) for name, value in counters.items())
+    db.session.commit()
+    return counters
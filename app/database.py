@@ -0,0 +1,100 @@
+"""DB 엔진 프로파일과 쓰기 트랜잭션 재시도.
+
+SQLite 는 연결마다 WAL / synchronous=NORMAL / busy_timeout / 페이지 캐시를 설정하고,
+PostgreSQL 은 커넥션 풀 크기·오버플로·pre-ping·recycle 을 설정한다.
+"""
+import os
+import random
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from app.extensions import db
+
+RETRYABLE_SQLSTATES = {'40001', '40P01'}  # serialization_failure, deadlock_detected
+
+
+def engine_options(config, uri=None):
+    """uri (기본: SQLALCHEMY_DATABASE_URI) 의 드라이버에 맞는 create_engine 옵션."""
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    backend = make_url(uri or config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+
+    if backend == 'sqlite':
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('timeout', config['DB_BUSY_TIMEOUT_MS'] / 1000)
+        options['connect_args'] = connect_args
+    elif backend == 'postgresql':
+        options.setdefault('pool_size', config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_pre_ping', True)
+        options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    return options
+
+
+def archive_database_uri(config):
+    """보관 DB 주소. 지정이 없으면 SQLite 는 운영 DB 파일 옆 <이름>_archive.db, 그 외에는 운영 DB."""
+    if config.get('ARCHIVE_DATABASE_URL'):
+        return config['ARCHIVE_DATABASE_URL']
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return config['SQLALCHEMY_DATABASE_URI']
+    root, ext = os.path.splitext(url.database)
+    return url.set(database=f'{root}_archive{ext or ".db"}').render_as_string(hide_password=False)
+
+
+def database_binds(config):
+    """SQLALCHEMY_BINDS. 바인드에는 SQLALCHEMY_ENGINE_OPTIONS 가 적용되지 않으므로 옵션을 함께 넣는다."""
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    if 'archive' not in binds:
+        uri = archive_database_uri(config)
+        binds['archive'] = {'url': uri, **engine_options(config, uri)}
+    return binds
+
+
+def init_engine(app):
+    """db.init_app 이후 호출. SQLite 연결(보관 DB 포함)에 PRAGMA 를 건다."""
+    busy_timeout = app.config['DB_BUSY_TIMEOUT_MS']
+    cache_size = app.config['SQLITE_CACHE_SIZE_KB']
+
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+        cursor.execute(f'PRAGMA cache_size=-{int(cache_size)}')
+        cursor.close()
+
+    for engine in db.engines.values():
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', _sqlite_pragmas)
+
+
+def is_retryable(exc):
+    if isinstance(exc, IntegrityError):
+        return False
+    orig = getattr(exc, 'orig', None)
+    message = str(orig or exc).lower()
+    if 'database is locked' in message or 'database table is locked' in message:
+        return True
+    sqlstate = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    return sqlstate in RETRYABLE_SQLSTATES
+
+
+def run_in_transaction(work, attempts=None):
+    """work() 를 실행하고 커밋한다. 잠금/직렬화 오류면 롤백 후 지수 백오프로 재시도.
+
+    work 는 재실행될 수 있으므로 세션에 대한 변경만 하고, flash 같은 부수효과는
+    커밋 이후에 둔다.
+    """
+    attempts = attempts or current_app.config['DB_WRITE_RETRIES']
+    for attempt in range(1, attempts + 1):
+        try:
+            result = work()
+            db.session.commit()
+            return result
+        except DBAPIError as exc:
+            db.session.rollback()
+            if attempt == attempts or not is_retryable(exc):
+                raise
+            time.sleep(0.05 * 2 ** (attempt - 1) * (0.5 + random.random()))
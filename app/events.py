@@ -0,0 +1,177 @@
+"""관리자 화면 실시간 갱신 (Server-Sent Events).
+
+라우트는 emit() 으로 변경 이벤트를 본 작업과 같은 트랜잭션에 change_events 에
+기록한다. 프로세스마다 폴러 스레드 하나가 새 이벤트만 읽어 메모리 버퍼에 쌓고
+Condition 으로 대기 중인 스트림을 깨우므로, 열린 탭 수와 무관하게 DB 조회는
+poll_interval 마다 한 번이며 유휴 스트림은 대기 중인 스레드 하나일 뿐이다.
+스트림은 stream_seconds 후 닫히고, 브라우저 EventSource 가 Last-Event-ID 로
+이어 받는다.
+"""
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.counters import read_counters
+from app.extensions import db
+from app.models import ChangeEvent
+
+BUFFER_SIZE = 2000
+CATCH_UP_LIMIT = 500
+PRUNE_EVERY = 3600
+
+
+def emit(kind, entity_id=None, counters=False, **payload):
+    """이벤트를 현재 세션에 추가한다. counters=True 면 카운터 스냅샷을 함께 싣는다."""
+    if counters:
+        payload['counters'] = read_counters()
+    event = ChangeEvent(kind=kind, entity_id=entity_id,
+                        payload=json.dumps(payload, ensure_ascii=False, default=str))
+    db.session.add(event)
+    return event
+
+
+def format_event(event_id, kind, entity_id, payload):
+    data = json.loads(payload or '{}')
+    data['id'] = entity_id
+    return f'id: {event_id}\nevent: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+class EventBroadcaster:
+    def __init__(self, poll_interval=1.0, heartbeat=15, stream_seconds=300, retention_hours=24):
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.stream_seconds = stream_seconds
+        self.retention = timedelta(hours=retention_hours)
+        self._events = deque(maxlen=BUFFER_SIZE)   # (id, kind, entity_id, payload)
+        self._floor = None      # 버퍼가 이 id 이후의 이벤트를 (밀려나기 전까지) 모두 담는다
+        self._last_id = None
+        self._cond = threading.Condition()
+        self._subscribers = 0
+        self._thread = None
+        self._app = None
+        self._pruned_at = 0.0
+
+    def init_app(self, app):
+        self.poll_interval = app.config.get('EVENTS_POLL_INTERVAL', self.poll_interval)
+        self.heartbeat = app.config.get('EVENTS_HEARTBEAT', self.heartbeat)
+        self.stream_seconds = app.config.get('EVENTS_STREAM_SECONDS', self.stream_seconds)
+        self.retention = timedelta(hours=app.config.get('EVENTS_RETENTION_HOURS', 24))
+        app.extensions['event_broadcaster'] = self
+
+    # === 폴러 ===
+
+    def _ensure_started(self, app):
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._app = app
+            with app.app_context():
+                try:
+                    self._last_id = db.session.query(func.max(ChangeEvent.id)).scalar() or 0
+                finally:
+                    db.session.remove()
+            self._floor = self._last_id
+            self._thread = threading.Thread(target=self._run, name='change-event-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                if self._subscribers:
+                    self._poll()
+                if time.monotonic() - self._pruned_at > PRUNE_EVERY:
+                    self._prune()
+            except Exception:
+                self._app.logger.exception('change event poller failed')
+            time.sleep(self.poll_interval)
+
+    def _poll(self):
+        while True:
+            with self._app.app_context():
+                try:
+                    rows = (db.session.query(ChangeEvent.id, ChangeEvent.kind,
+                                             ChangeEvent.entity_id, ChangeEvent.payload)
+                            .filter(ChangeEvent.id > self._last_id)
+                            .order_by(ChangeEvent.id)
+                            .limit(CATCH_UP_LIMIT).all())
+                finally:
+                    db.session.remove()
+            if not rows:
+                return
+            with self._cond:
+                self._events.extend(tuple(row) for row in rows)
+                self._last_id = rows[-1][0]
+                self._cond.notify_all()
+            if len(rows) < CATCH_UP_LIMIT:
+                return
+
+    def _prune(self):
+        self._pruned_at = time.monotonic()
+        with self._app.app_context():
+            try:
+                ChangeEvent.query.filter(
+                    ChangeEvent.created_at < datetime.utcnow() - self.retention
+                ).delete(synchronize_session=False)
+                db.session.commit()
+            finally:
+                db.session.remove()
+
+    # === 스트림 ===
+
+    def _pending(self, cursor):
+        """cursor 이후 버퍼 이벤트. 버퍼로 이어 줄 수 없으면 None."""
+        if cursor < self._floor:
+            return None
+        if self._events and len(self._events) == self._events.maxlen and cursor < self._events[0][0] - 1:
+            return None
+        return [event for event in self._events if event[0] > cursor]
+
+    def _load(self, cursor):
+        """버퍼 이전 이벤트를 DB 에서 읽는다. 너무 많이 밀렸으면 None."""
+        with self._app.app_context():
+            try:
+                rows = (db.session.query(ChangeEvent.id, ChangeEvent.kind,
+                                         ChangeEvent.entity_id, ChangeEvent.payload)
+                        .filter(ChangeEvent.id > cursor, ChangeEvent.id <= self._last_id)
+                        .order_by(ChangeEvent.id)
+                        .limit(CATCH_UP_LIMIT + 1).all())
+            finally:
+                db.session.remove()
+        return [tuple(row) for row in rows] if len(rows) <= CATCH_UP_LIMIT else None
+
+    def stream(self, app, last_event_id=None):
+        """SSE 본문 제너레이터. 요청 컨텍스트 없이 동작하므로 app 을 넘겨받는다."""
+        self._ensure_started(app)
+        with self._cond:
+            self._subscribers += 1
+            cursor = self._last_id if last_event_id is None else last_event_id
+        try:
+            yield f'retry: 3000\nid: {cursor}\n\n'
+            deadline = time.monotonic() + self.stream_seconds
+            while time.monotonic() < deadline:
+                with self._cond:
+                    pending = self._pending(cursor)
+                    if pending == []:
+                        self._cond.wait(timeout=min(self.heartbeat, max(0.0, deadline - time.monotonic())))
+                        pending = self._pending(cursor)
+                if pending is None:
+                    pending = self._load(cursor)
+                if pending is None:
+                    # 따라잡을 수 없을 만큼 밀렸다: 화면을 다시 불러오게 한다
+                    cursor = self._last_id
+                    yield f'id: {cursor}\nevent: reload\ndata: {{}}\n\n'
+                    continue
+                if not pending:
+                    yield ': ping\n\n'
+                    continue
+                for event in pending:
+                    yield format_event(*event)
+                cursor = pending[-1][0]
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+
+
+broadcaster = EventBroadcaster()
@@ -0,0 +1,239 @@
+"""제출 건 감사용 내보내기 (CSV / NDJSON).
+
+고객·상담원·개통 정보를 조인한 컬럼 쿼리를 (created_at, id) 오름차순 키셋
+배치로 읽고, 행을 바로 문자열로 바꿔 내보낸다. ORM 객체나 전체 결과를 메모리에
+두지 않으므로 건수와 무관하게 메모리 사용량이 일정하며, gzip 은 zlib 스트림
+압축으로 배치마다 흘려보낸다.
+
+보관 DB 로 옮긴 제출(app/archive.py)도 같은 순서의 키셋 배치로 따로 읽어
+(다른 DB 일 수 있어 조인·UNION 불가) 고객·상담원은 배치마다 IN 조회로 채우고,
+운영 DB 행과 (created_at, id) 순으로 합친다. 보관 도중이라 양쪽에 있는 제출은
+운영 DB 행만 내보낸다.
+"""
+import csv
+import heapq
+import io
+import json
+import zlib
+from datetime import datetime, time, timedelta
+from sqlalchemy import and_, or_
+from app.extensions import db
+from app.models import ArchivedSubmission, Customer, Submission, SubmissionDetail, User
+from app.services import filter_submissions
+
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    ('id', Submission.id),
+    ('created_at', Submission.created_at),
+    ('customer_id', Customer.id),
+    ('customer_name', Customer.name),
+    ('customer_phone', Customer.phone),
+    ('call_status', Customer.call_status),
+    ('agent', User.username),
+    ('final_status', Submission.final_status),
+    ('admin_status', Submission.admin_status),
+    ('check_installment', Submission.check_installment),
+    ('check_penalty', Submission.check_penalty),
+    ('check_rate_plan', Submission.check_rate_plan),
+    ('check_retention', Submission.check_retention),
+    ('check_monthly_fee', Submission.check_monthly_fee),
+    ('check_used_phone', Submission.check_used_phone),
+    ('check_store_complaint', Submission.check_store_complaint),
+    ('memo_check_installment', Submission.memo_check_installment),
+    ('memo_check_penalty', Submission.memo_check_penalty),
+    ('memo_check_rate_plan', Submission.memo_check_rate_plan),
+    ('memo_check_retention', Submission.memo_check_retention),
+    ('memo_check_monthly_fee', Submission.memo_check_monthly_fee),
+    ('memo_check_used_phone', Submission.memo_check_used_phone),
+    ('store_complaint_memo', Submission.store_complaint_memo),
+    ('agent_opinion', Submission.agent_opinion),
+    ('store_name', SubmissionDetail.store_name),
+    ('device', SubmissionDetail.device),
+    ('plan_name', SubmissionDetail.plan_name),
+    ('recording_file', Submission.recording_file),
+]
+EXPORT_HEADERS = [name for name, _ in EXPORT_COLUMNS]
+CUSTOMER_HEADERS = ('customer_name', 'customer_phone', 'call_status')
+DETAIL_HEADERS = ('store_name', 'device', 'plan_name')
+# 보관된 제출에서 그대로 읽는 컬럼 (나머지는 고객·상담원 조회와 detail_data 로 채운다)
+ARCHIVED_HEADERS = [name for name in EXPORT_HEADERS
+                    if name not in CUSTOMER_HEADERS + DETAIL_HEADERS + ('agent',)]
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+FILTERS = ('all', 'abnormal', 'pending', 'resolved')
+
+
+def parse_date(value):
+    """'YYYY-MM-DD' → date. 비어 있거나 형식이 틀리면 None."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def parse_date_range(date_from, date_to):
+    """from/to 문자열 → (date|None, date|None). 형식이 틀리거나 from 이 to 보다 늦으면 ValueError."""
+    parsed = []
+    for value in (date_from, date_to):
+        day = parse_date(value)
+        if value and day is None:
+            raise ValueError(f'날짜 형식이 올바르지 않습니다: {value!r} (YYYY-MM-DD)')
+        parsed.append(day)
+    if parsed[0] and parsed[1] and parsed[0] > parsed[1]:
+        raise ValueError('시작 날짜가 종료 날짜보다 늦습니다.')
+    return tuple(parsed)
+
+
+def _date_criteria(model, date_from, date_to):
+    criteria = []
+    if date_from:
+        criteria.append(model.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        criteria.append(model.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    return criteria
+
+
+def export_query(filter_type='all', date_from=None, date_to=None):
+    query = (db.select(*[column for _, column in EXPORT_COLUMNS])
+             .select_from(Submission)
+             .join(Customer, Submission.customer_id == Customer.id)
+             .join(User, Submission.agent_id == User.id)
+             .outerjoin(SubmissionDetail, SubmissionDetail.submission_id == Submission.id))
+    query = filter_submissions(query, filter_type)
+    return query.where(*_date_criteria(Submission, date_from, date_to))
+
+
+def archived_export_query(filter_type='all', date_from=None, date_to=None):
+    """보관된 제출의 내보내기 쿼리 (보관 DB). 고객·상담원·개통 정보는 iter_archived_rows 가 채운다."""
+    columns = [getattr(ArchivedSubmission, name) for name in ARCHIVED_HEADERS]
+    query = db.select(*columns, ArchivedSubmission.agent_id, ArchivedSubmission.detail_data)
+    query = filter_submissions(query, filter_type, ArchivedSubmission)
+    return query.where(*_date_criteria(ArchivedSubmission, date_from, date_to))
+
+
+def iter_export_batches(query, batch_size=EXPORT_BATCH_SIZE, model=Submission):
+    """(created_at, id) 오름차순 키셋 배치(행 목록)를 하나씩 돌려준다.
+
+    배치 사이에 읽기 트랜잭션을 닫아, 긴 내보내기가 SQLite WAL 체크포인트나
+    PostgreSQL vacuum 을 붙잡지 않게 한다.
+    """
+    last = None
+    while True:
+        batch_query = query
+        if last is not None:
+            batch_query = batch_query.where(or_(
+                model.created_at > last[0],
+                and_(model.created_at == last[0], model.id > last[1]),
+            ))
+        rows = db.session.execute(
+            batch_query.order_by(model.created_at, model.id).limit(batch_size)
+        ).all()
+        db.session.rollback()
+        if not rows:
+            return
+        yield rows
+        last = (rows[-1].created_at, rows[-1].id)
+
+
+def iter_export_rows(query, batch_size=EXPORT_BATCH_SIZE):
+    for rows in iter_export_batches(query, batch_size):
+        yield from rows
+
+
+def iter_archived_rows(query, batch_size=EXPORT_BATCH_SIZE):
+    """보관된 제출 행을 EXPORT_HEADERS 순서의 튜플로 돌려준다. 고객·상담원은 운영 DB 에서 배치마다 조회한다."""
+    for rows in iter_export_batches(query, batch_size, model=ArchivedSubmission):
+        customers = {row.id: row for row in db.session.execute(
+            db.select(Customer.id, Customer.name, Customer.phone, Customer.call_status)
+            .where(Customer.id.in_({row.customer_id for row in rows}))
+        )}
+        agents = dict(db.session.execute(
+            db.select(User.id, User.username).where(User.id.in_({row.agent_id for row in rows}))
+        ).all())
+        db.session.rollback()
+        for row in rows:
+            customer = customers.get(row.customer_id)
+            detail = json.loads(row.detail_data) if row.detail_data else {}
+            values = dict(zip(ARCHIVED_HEADERS, row))
+            values.update(
+                customer_name=customer.name if customer else None,
+                customer_phone=customer.phone if customer else None,
+                call_status=customer.call_status if customer else None,
+                agent=agents.get(row.agent_id),
+                **{name: detail.get(name) for name in DETAIL_HEADERS},
+            )
+            yield tuple(values[name] for name in EXPORT_HEADERS)
+
+
+def merge_rows(hot_rows, archived_rows):
+    """두 (created_at, id) 오름차순 행 흐름을 합친다. 같은 id 는 운영 DB 행(먼저 온 쪽)만 남긴다."""
+    last_id = None
+    for row in heapq.merge(hot_rows, archived_rows, key=lambda r: (r[1], r[0])):
+        if row[0] != last_id:
+            yield row
+        last_id = row[0]
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def render_rows(rows, fmt='csv', lines_per_chunk=500):
+    """행을 CSV/NDJSON 텍스트 조각으로 바꾼다. CSV 는 엑셀용 BOM 과 헤더로 시작한다."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        buffer.write('\ufeff')
+        writer.writerow(EXPORT_HEADERS)
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps({k: _json_value(v) for k, v in zip(EXPORT_HEADERS, row)},
+                                    ensure_ascii=False))
+            buffer.write('\n')
+        pending += 1
+        if pending >= lines_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_chunks(chunks, gzip=False):
+    """텍스트 조각을 UTF-8 로 인코딩하고, gzip=True 면 스트림 압축한다."""
+    if not gzip:
+        for chunk in chunks:
+            yield chunk.encode('utf-8')
+        return
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip 헤더/트레일러
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_submissions(fmt='csv', filter_type='all', date_from=None, date_to=None, gzip=False,
+                       batch_size=EXPORT_BATCH_SIZE):
+    """내보내기 바이트 조각 제너레이터. 보관된 제출도 포함한다."""
+    rows = merge_rows(iter_export_rows(export_query(filter_type, date_from, date_to), batch_size),
+                      iter_archived_rows(archived_export_query(filter_type, date_from, date_to), batch_size))
+    return encode_chunks(render_rows(rows, fmt), gzip=gzip)
+
+
+def export_filename(fmt, filter_type='all', date_from=None, date_to=None, gzip=False):
+    parts = ['submissions', filter_type]
+    if date_from or date_to:
+        parts.append(f'{date_from or ""}_{date_to or ""}')
+    name = '_'.join(parts) + '.' + FORMATS[fmt][1]
+    return name + '.gz' if gzip else name
@@ -0,0 +1,144 @@
+"""flask_login user_loader 앞단의 신원 캐시.
+
+인증된 요청마다 users 를 조회하지 않도록 id/username/role 만 담은 경량 객체를
+TTL + LRU 로 보관한다. 캐시 적중이면 쿼리를 하나도 내지 않는다.
+
+계정이 바뀌거나 지워지면 같은 트랜잭션에서 stat_counters 의 identity:version 을
+올린다. 각 프로세스는 이 한 행을 IDENTITY_VERSION_CHECK_SECONDS 마다 한 번만 읽어
+버전이 바뀌었으면 전부 비우므로, 다른 워커 프로세스에는 그 주기 안에 삭제·역할 변경이
+반영된다. 변경한 프로세스에서는 커밋 직후 해당 항목을 지우므로 바로 반영되고,
+롤백된 변경은 캐시를 건드리지 않는다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.counters import increment
+from app.extensions import db
+from app.models import StatCounter, User
+
+VERSION_KEY = 'identity:version'
+
+
+class CachedIdentity(UserMixin):
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+
+class IdentityCache:
+    def __init__(self, maxsize=1024, ttl=30, version_check=2.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_check = version_check
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._version = None
+        self._version_checked_at = None
+
+    def init_app(self, app):
+        self.maxsize = app.config.get('IDENTITY_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self.version_check = app.config.get('IDENTITY_VERSION_CHECK_SECONDS', self.version_check)
+        self.clear()
+        app.extensions['identity_cache'] = self
+
+    def shared_version(self):
+        return db.session.scalar(db.select(StatCounter.value).where(StatCounter.name == VERSION_KEY)) or 0
+
+    def load(self, user_id, loader):
+        """캐시된 신원, 없거나 공유 버전이 바뀌었으면 loader(user_id) 로 읽어 넣는다."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            user = loader(user_id)
+            return CachedIdentity(user.id, user.username, user.role) if user is not None else None
+
+        now = time.monotonic()
+        checked_at = self._version_checked_at
+        if checked_at is None or now - checked_at >= self.version_check:
+            version = self.shared_version()
+        else:
+            version = None
+        with self._lock:
+            if version is None:
+                version = self._version
+            else:
+                self._version_checked_at = now
+                if version != self._version:
+                    self.invalidations += len(self._entries)
+                    self._entries.clear()
+                    self._version = version
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+
+        user = loader(user_id)
+        if user is None:
+            return None
+        identity = CachedIdentity(user.id, user.username, user.role)
+        with self._lock:
+            # 읽는 사이 다른 요청이 더 새 버전을 봤으면 넣지 않는다
+            if self._version == version:
+                self._entries[user.id] = (time.monotonic() + self.ttl, identity)
+                self._entries.move_to_end(user.id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = self._version_checked_at = None
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    increment(connection, VERSION_KEY)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('identity_changed', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for user_id in session.info.pop('identity_changed', ()):
+        identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('identity_changed', None)
@@ -0,0 +1,187 @@
+"""고객 일괄 등록 (CSV / TSV / 대리점 개통 데이터).
+
+업로드 파일을 한 줄씩 읽어 배치 단위로 중복 확인과 INSERT를 수행한다.
+파일 전체를 메모리에 올리지 않으며, 커밋은 commit_every 배치마다 한 번이다.
+"""
+import csv
+import io
+from itertools import chain
+from sqlalchemy import insert
+from app.counters import record_customer
+from app.extensions import db
+from app.models import Customer
+from app.services import normalize_phone
+
+NAME_HEADERS = {'고객명', '이름', '성명', 'name'}
+PHONE_HEADERS = {'연락처', '전화번호', '휴대폰번호', '개통번호', 'phone'}
+AGENCY_NAME_LABELS = ('고객명', '가입자명', '명의자')
+AGENCY_PHONE_LABELS = ('개통번호', '연락처', '휴대폰번호', '전화번호')
+# parse_raw_customer_data 가 읽는 개통 데이터 행 머리
+AGENCY_LABELS = frozenset(AGENCY_NAME_LABELS + AGENCY_PHONE_LABELS
+                          + ('매장명', '개통단말기', '할부원금', '개통요금제', '1차변경요금제', '중고폰반납'))
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_no, reason, value=''):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, reason, value))
+
+    @property
+    def processed(self):
+        return self.inserted + self.duplicates + self.error_count
+
+
+def _text_stream(stream):
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _iter_delimited(lines, delimiter):
+    reader = csv.reader(lines, delimiter=delimiter)
+    name_idx, phone_idx = 0, 1
+    for row in reader:
+        cells = [c.strip() for c in row]
+        if not any(cells):
+            continue
+        if reader.line_num == 1:
+            lowered = [c.lower() for c in cells]
+            if NAME_HEADERS & set(lowered) and PHONE_HEADERS & set(lowered):
+                name_idx = next(i for i, c in enumerate(lowered) if c in NAME_HEADERS)
+                phone_idx = next(i for i, c in enumerate(lowered) if c in PHONE_HEADERS)
+                continue
+        name = cells[name_idx] if len(cells) > name_idx else ''
+        phone = cells[phone_idx] if len(cells) > phone_idx else ''
+        yield reader.line_num, name, phone
+
+
+def _agency_label(cells, labels):
+    """라벨-값 쌍으로 된 행에서 labels 중 하나의 값. 라벨이 없으면 None."""
+    for i, cell in enumerate(cells[:-1]):
+        if cell in labels:
+            return cells[i + 1]
+    return None
+
+
+def _iter_agency(lines):
+    """개통 데이터 블록마다 고객명/연락처를 뽑는다.
+
+    parse_raw_customer_data 가 읽는 형식과 같이 블록은 '매장명' 행에서 시작해 빈 줄이나
+    다음 '매장명' 행에서 끝난다. 빈 줄 다음 '매장명' 앞에 놓인 행(고객 정보 머리글 등)은
+    그 블록에 붙인다. 고객명·연락처는 블록 안 어느 행의 라벨-값 쌍에서든 읽으며, 없으면
+    그 블록은 오류로 보고된다.
+    """
+    record = None
+    pending = None  # 빈 줄 뒤 '매장명' 전까지 읽은 행: [시작 줄, 고객명, 연락처]
+    for line_no, line in enumerate(lines, 1):
+        cells = [c.strip() for c in line.rstrip('\r\n').split('\t')]
+        if not any(cells):
+            if record:
+                yield record
+            record = pending = None
+            continue
+        if cells[0] == '매장명':
+            if record:
+                yield record
+            record, pending = pending or [line_no, '', ''], None
+        target = record if record is not None else pending
+        if target is None:
+            target = pending = [line_no, '', '']
+        name = _agency_label(cells, AGENCY_NAME_LABELS)
+        phone = _agency_label(cells, AGENCY_PHONE_LABELS)
+        if name and not target[1]:
+            target[1] = name
+        if phone and not target[2]:
+            target[2] = phone
+    if record:
+        yield record
+
+
+def _is_agency_line(line):
+    """'매장명' 행이나 라벨-값 쌍으로 시작하는 행이면 개통 데이터. '고객명\t연락처' 같은 TSV 헤더와 구분한다."""
+    cells = [c.strip() for c in line.split('\t')]
+    if cells[0] == '매장명':
+        return True
+    if cells[0] not in AGENCY_LABELS:
+        return False
+    value = cells[1].lower() if len(cells) > 1 else ''
+    return value not in NAME_HEADERS and value not in PHONE_HEADERS
+
+
+def iter_customer_rows(stream, fmt='auto'):
+    """(줄 번호, 고객명, 연락처 원문)을 순서대로 내보낸다."""
+    lines = _text_stream(stream)
+    if fmt == 'auto':
+        head = []
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                break
+        first = head[-1] if head else ''
+        if _is_agency_line(first):
+            fmt = 'agency'
+        else:
+            fmt = 'tsv' if '\t' in first else 'csv'
+        lines = chain(head, lines)
+
+    if fmt == 'agency':
+        return _iter_agency(lines)
+    return _iter_delimited(lines, '\t' if fmt == 'tsv' else ',')
+
+
+def _flush_batch(batch, report):
+    phones = [row['phone'] for row in batch]
+    existing = set(db.session.scalars(
+        db.select(Customer.phone).where(Customer.phone.in_(phones))
+    ))
+    rows = []
+    for row in batch:
+        if row['phone'] in existing:
+            report.duplicates += 1
+            continue
+        rows.append({'name': row['name'], 'phone': row['phone'], 'call_status': '대기'})
+    if rows:
+        db.session.execute(insert(Customer), rows)
+        record_customer(new='대기', count=len(rows))
+        report.inserted += len(rows)
+
+
+def import_customers(rows, batch_size=1000, commit_every=10):
+    report = ImportReport()
+    seen = set()
+    batch = []
+    batches = 0
+
+    for line_no, name, raw_phone in rows:
+        phone = normalize_phone(raw_phone)
+        if not name:
+            report.add_error(line_no, '고객명 누락', raw_phone)
+            continue
+        if not phone:
+            report.add_error(line_no, '연락처 형식 오류', raw_phone)
+            continue
+        if phone in seen:
+            report.duplicates += 1
+            continue
+        seen.add(phone)
+        batch.append({'name': name[:100], 'phone': phone})
+
+        if len(batch) >= batch_size:
+            _flush_batch(batch, report)
+            batch = []
+            batches += 1
+            if batches % commit_every == 0:
+                db.session.commit()
+
+    if batch:
+        _flush_batch(batch, report)
+    db.session.commit()
+    return report
@@ -0,0 +1,241 @@
+"""요청 단위 SQL·지연 계측과 /metrics.
+
+SQLAlchemy 엔진 이벤트로 요청마다 쿼리 수와 SQL 시간을, 템플릿 신호로 렌더링
+시간을 모으고 after_request 에서 응답 크기와 함께 엔드포인트별 히스토그램에
+더한다. 응답에는 Server-Timing 헤더(db/tpl/app 과 timing() 으로 잰 구간)를 붙이고,
+SLOW_QUERY_MS 이상 걸린 쿼리는 엔드포인트와 함께 로그에 남긴다.
+
+/metrics 는 Prometheus 텍스트 형식이다. 값은 프로세스별이므로 워커가 여럿이면
+각 워커를 따로 수집한다. METRICS_TOKEN 이 있으면 Bearer 토큰으로, 없으면
+관리자 로그인으로만 열린다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from flask import (abort, before_render_template, current_app, g, has_request_context, request,
+                   template_rendered)
+from flask_login import current_user
+from sqlalchemy import event
+from app.extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.render_seconds = 0.0
+        self.spans = []     # (name, seconds)
+        self._render_started = []
+
+
+class Histogram:
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}   # label values -> [bucket counts..., sum, count]
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for label_values, series in sorted(self._series.items()):
+            labels = _labels(self.labels, label_values)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, label_values, amount=1):
+        self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self._series.items()):
+            lines.append(f'{self.name}{{{_labels(self.labels, label_values)}}} {value}')
+        return lines
+
+
+def _labels(names, values):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+def _stats():
+    return g.get('_request_stats') if has_request_context() else None
+
+
+@contextmanager
+def timing(name):
+    """요청 안의 구간을 재서 Server-Timing 과 happycall_span_seconds 에 남긴다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _stats()
+        if stats is not None:
+            stats.spans.append((name, time.perf_counter() - started))
+
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = True
+        self.server_timing = True
+        self.slow_query_seconds = 0.2
+        self._lock = threading.Lock()
+        self._engines = set()
+        self._app = None
+
+        endpoint = ('endpoint',)
+        self.requests = Counter('happycall_http_requests_total', '요청 수',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram('happycall_http_request_duration_seconds', '요청 처리 시간',
+                                 endpoint, LATENCY_BUCKETS)
+        self.queries = Histogram('happycall_db_queries_per_request', '요청당 SQL 쿼리 수',
+                                 endpoint, QUERY_BUCKETS)
+        self.sql_time = Histogram('happycall_db_time_seconds', '요청당 SQL 실행 시간 합',
+                                  endpoint, LATENCY_BUCKETS)
+        self.render_time = Histogram('happycall_template_render_seconds', '요청당 템플릿 렌더링 시간',
+                                     endpoint, LATENCY_BUCKETS)
+        self.response_size = Histogram('happycall_http_response_bytes', '응답 본문 크기 (스트리밍 제외)',
+                                       endpoint, SIZE_BUCKETS)
+        self.spans = Histogram('happycall_span_seconds', 'timing() 으로 잰 구간',
+                               ('endpoint', 'span'), LATENCY_BUCKETS)
+        self.slow_queries = Counter('happycall_db_slow_queries_total', 'SLOW_QUERY_MS 이상 걸린 쿼리 수',
+                                    endpoint)
+        self._metrics = [self.requests, self.latency, self.queries, self.sql_time,
+                         self.render_time, self.response_size, self.spans, self.slow_queries]
+
+    def init_app(self, app):
+        """db.init_app 이후 호출한다."""
+        self.enabled = app.config.get('INSTRUMENTATION_ENABLED', True)
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+        self.slow_query_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+        self._app = app
+        app.extensions['instrumentation'] = self
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        if not self.enabled:
+            return
+
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            if engine not in self._engines:
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+                self._engines.add(engine)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+
+    # === SQL ===
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._instrumentation_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_instrumentation_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = _stats()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+        if elapsed >= self.slow_query_seconds:
+            endpoint = request.endpoint if has_request_context() else None
+            with self._lock:
+                self.slow_queries.inc((endpoint or '-',))
+            self._app.logger.warning('slow query %.1f ms [%s]: %s', elapsed * 1000, endpoint or '-',
+                                     ' '.join(statement.split())[:1000])
+
+    # === 템플릿 ===
+
+    def _before_render(self, sender, template, context, **extra):
+        stats = _stats()
+        if stats is not None:
+            stats._render_started.append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        stats = _stats()
+        if stats is not None and stats._render_started:
+            stats.render_seconds += time.perf_counter() - stats._render_started.pop()
+
+    # === 요청 ===
+
+    def _before_request(self):
+        g._request_stats = RequestStats()
+
+    def _after_request(self, response):
+        stats = g.pop('_request_stats', None)
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.started
+        endpoint = request.endpoint or 'unmatched'
+        size = None if response.is_streamed else response.calculate_content_length()
+
+        with self._lock:
+            self.requests.inc((endpoint, request.method, response.status_code))
+            self.latency.observe((endpoint,), elapsed)
+            self.queries.observe((endpoint,), stats.queries)
+            self.sql_time.observe((endpoint,), stats.sql_seconds)
+            self.render_time.observe((endpoint,), stats.render_seconds)
+            if size is not None:
+                self.response_size.observe((endpoint,), size)
+            for name, seconds in stats.spans:
+                self.spans.observe((endpoint, name), seconds)
+
+        if self.server_timing:
+            entries = [f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.queries} queries"',
+                       f'tpl;dur={stats.render_seconds * 1000:.1f}']
+            entries += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in stats.spans]
+            entries.append(f'app;dur={elapsed * 1000:.1f}')
+            response.headers.add('Server-Timing', ', '.join(entries))
+        return response
+
+    # === /metrics ===
+
+    def render(self):
+        with self._lock:
+            lines = [line for metric in self._metrics for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        token = current_app.config.get('METRICS_TOKEN')
+        if token:
+            if request.headers.get('Authorization') != f'Bearer {token}':
+                abort(401)
+        elif not current_user.is_authenticated or current_user.role != 'admin':
+            abort(403)
+        return current_app.response_class(self.render(),
+                                          content_type='text/plain; version=0.0.4; charset=utf-8',
+                                          headers={'Cache-Control': 'no-store'})
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,268 @@
+"""DB 기반 백그라운드 작업 큐.
+
+외부 브로커 없이 jobs 테이블을 큐로 쓴다. 라우트는 enqueue() 로 작업을 같은
+트랜잭션에 넣고 바로 응답하며, 'flask jobs work' 워커 프로세스가 조건부 UPDATE
+(status='queued' 일 때만 running 으로 변경)로 작업을 하나씩 가져가 실행한다.
+실패한 작업은 지수 백오프로 max_attempts 까지 재시도한다.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+import wave
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, update
+from app.extensions import db
+from app.models import Job, Submission, SubmissionDetail
+from app.recordings import CHUNK_SIZE, recording_etag
+from app.rollups import refresh as refresh_rollups
+from app.services import parse_submission_detail
+from app.storage import get_storage
+
+HANDLERS = {}
+RETRY_BASE_SECONDS = 10
+STALE_AFTER = timedelta(minutes=10)
+CLAIM_CANDIDATES = 10
+
+
+def handler(kind):
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, submission=None, payload=None, max_attempts=3):
+    """작업을 현재 세션에 추가한다. 커밋은 호출한 쪽의 트랜잭션을 따른다."""
+    job = Job(kind=kind, submission=submission, payload=json.dumps(payload or {}),
+              max_attempts=max_attempts, status='queued')
+    db.session.add(job)
+    return job
+
+
+def _claim(job_id, worker_id):
+    """queued 상태일 때만 running 으로 바꾼다. 다른 워커가 먼저 가져갔으면 None."""
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == 'queued')
+        .values(status='running', locked_by=worker_id, locked_at=now,
+                started_at=now, attempts=Job.attempts + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return db.session.get(Job, job_id) if claimed else None
+
+
+def _due_job_ids(limit, submission_id=None):
+    query = (db.select(Job.id)
+             .where(Job.status == 'queued', Job.run_after <= datetime.utcnow())
+             .order_by(Job.run_after, Job.id)
+             .limit(limit))
+    if submission_id is not None:
+        query = query.where(Job.submission_id == submission_id)
+    return db.session.scalars(query).all()
+
+
+def claim_next(worker_id):
+    """실행 가능한 작업 하나를 원자적으로 점유해 돌려준다. 없으면 None."""
+    for job_id in _due_job_ids(CLAIM_CANDIDATES):
+        job = _claim(job_id, worker_id)
+        if job is not None:
+            return job
+    return None
+
+
+def run_job(job):
+    func = HANDLERS.get(job.kind)
+    try:
+        if func is None:
+            raise LookupError(f'unknown job kind: {job.kind}')
+        result = func(job, json.loads(job.payload or '{}'))
+        job.status = 'done'
+        job.result = json.dumps(result or {}, ensure_ascii=False)
+        job.last_error = None
+    except Exception:
+        db.session.rollback()
+        job = db.session.get(Job, job.id)
+        job.last_error = traceback.format_exc(limit=5)
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_after = datetime.utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+        else:
+            job.status = 'failed'
+    job.finished_at = datetime.utcnow()
+    job.locked_by = None
+    db.session.commit()
+    return job
+
+
+def requeue_stale(older_than=STALE_AFTER):
+    """워커가 죽어 running 으로 남은 작업을 다시 큐에 넣는다."""
+    cutoff = datetime.utcnow() - older_than
+    count = Job.query.filter(Job.status == 'running', Job.locked_at < cutoff).update(
+        {'status': 'queued', 'locked_by': None}, synchronize_session=False)
+    db.session.commit()
+    return count
+
+
+def run_pending(submission_id=None, limit=100):
+    """현재 프로세스에서 대기 작업을 바로 실행한다 (JOBS_EAGER 용)."""
+    done = 0
+    for job_id in _due_job_ids(limit, submission_id):
+        job = _claim(job_id, 'inline')
+        if job is not None:
+            run_job(job)
+            done += 1
+    return done
+
+
+def work(worker_id=None, poll_interval=1.0, burst=False):
+    """작업 루프. burst=True 면 큐가 비는 즉시 종료한다.
+
+    ROLLUP_REFRESH_SECONDS 마다 QC 집계도 반영한다 (리포트 화면은 집계를 읽기만 한다).
+    """
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    refresh_interval = current_app.config['ROLLUP_REFRESH_SECONDS']
+    requeue_stale()
+    processed = 0
+    refreshed = None
+    while True:
+        if refreshed is None or time.monotonic() - refreshed >= refresh_interval:
+            try:
+                refresh_rollups()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception('QC 집계 반영 실패')
+            refreshed = time.monotonic()
+        job = claim_next(worker_id)
+        if job is None:
+            db.session.remove()
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+
+
+def _worker_main(index, poll_interval, burst):
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        work(f'{socket.gethostname()}:{os.getpid()}:{index}', poll_interval, burst)
+
+
+def run_workers(processes, poll_interval=1.0, burst=False):
+    """워커 프로세스 풀을 띄우고 모두 끝날 때까지 기다린다."""
+    ctx = multiprocessing.get_context('spawn')
+    workers = [ctx.Process(target=_worker_main, args=(i, poll_interval, burst), daemon=False)
+               for i in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
+
+def queue_stats(sample=1000):
+    """상태별 건수, 가장 오래된 대기 작업 나이, 최근 완료 작업의 대기/실행 시간."""
+    counts = dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status))
+    oldest = db.session.query(func.min(Job.created_at)).filter(Job.status == 'queued').scalar()
+    recent = (db.session.query(Job.created_at, Job.started_at, Job.finished_at)
+              .filter(Job.status == 'done')
+              .order_by(Job.finished_at.desc()).limit(sample).all())
+
+    def average(values):
+        return round(sum(values) / len(values), 3) if values else None
+
+    return {
+        'counts': counts,
+        'depth': counts.get('queued', 0),
+        'oldest_queued_age': (datetime.utcnow() - oldest).total_seconds() if oldest else None,
+        'avg_wait_seconds': average([(r.started_at - r.created_at).total_seconds() for r in recent]),
+        'avg_run_seconds': average([(r.finished_at - r.started_at).total_seconds() for r in recent]),
+    }
+
+
+def enqueue_submission_jobs(submission):
+    enqueue('hash_recording', submission)
+    enqueue('recording_metadata', submission)
+    enqueue('parse_raw_data', submission)
+
+
+# === 작업 핸들러 ===
+
+def _submission_recording(job):
+    submission = db.session.get(Submission, job.submission_id)
+    key = submission.recording_file if submission else None
+    if not key:
+        raise FileNotFoundError(f'recording missing for submission {job.submission_id}')
+    return submission, key
+
+
+@handler('hash_recording')
+def _hash_recording(job, payload):
+    """저장된 녹취 파일의 SHA-256 을 다시 계산해 키(파일명)와 대조한다."""
+    submission, key = _submission_recording(job)
+    digest = hashlib.sha256()
+    size = 0
+    with get_storage().open(key) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    expected = recording_etag(key)
+    sha256 = digest.hexdigest()
+    if expected and expected != sha256:
+        raise ValueError(f'checksum mismatch: {sha256} != {expected}')
+    return {'sha256': sha256, 'size': size, 'verified': bool(expected)}
+
+
+@handler('recording_metadata')
+def _recording_metadata(job, payload):
+    _, key = _submission_recording(job)
+    # wave/mutagen 은 파일 경로가 필요하다. 원격 저장소면 임시 파일로 내려받는다.
+    with get_storage().local_copy(key) as path:
+        return _audio_metadata(path)
+
+
+def _audio_metadata(path):
+    meta = {'size': os.path.getsize(path)}
+    if path.lower().endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as w:
+                meta.update(channels=w.getnchannels(), sample_rate=w.getframerate(),
+                            duration=round(w.getnframes() / float(w.getframerate()), 2))
+        except (wave.Error, EOFError):
+            meta['error'] = 'unreadable wav header'
+    else:
+        try:
+            import mutagen  # 선택 의존성: mp3/m4a/ogg 재생 시간 추출
+        except ImportError:
+            return meta
+        audio = mutagen.File(path)
+        if audio is not None and audio.info:
+            meta['duration'] = round(audio.info.length, 2)
+    return meta
+
+
+@handler('parse_raw_data')
+def _parse_raw_data(job, payload):
+    submission = db.session.get(Submission, job.submission_id)
+    if submission is None:
+        return {'skipped': 'submission deleted'}
+    fields = parse_submission_detail(submission.raw_customer_data)
+    detail = submission.detail or SubmissionDetail(submission_id=submission.id)
+    for column in SubmissionDetail.__table__.columns:
+        if column.key not in ('submission_id', 'parsed_at'):
+            setattr(detail, column.key, fields.get(column.key))
+    detail.parsed_at = datetime.utcnow()
+    db.session.add(detail)
+    return {'fields': len(fields)}
@@ -0,0 +1,238 @@
+"""버전 기반 스키마 마이그레이션.
+
+db.create_all()은 없는 테이블만 만들 뿐 기존 테이블에 인덱스/컬럼을 추가하지 않는다.
+기존 DB에 필요한 변경은 여기에 번호순으로 등록하고, 적용 여부는 schema_migrations에
+기록한다. 새 DB에서는 create_all이 이미 만든 객체와 겹칠 수 있으므로 각 마이그레이션은
+IF NOT EXISTS 등으로 재실행에 안전하게 작성한다.
+"""
+import zlib
+from datetime import datetime
+from sqlalchemy import inspect, text
+from app.extensions import db
+from app.models import SchemaMigration
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def applied_versions():
+    return {row.version for row in SchemaMigration.query.all()}
+
+
+def run_migrations():
+    """미적용 마이그레이션을 버전순으로 각각 하나의 트랜잭션에서 실행한다."""
+    applied = applied_versions()
+    ran = []
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with db.engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                SchemaMigration.__table__.insert().values(
+                    version=version, description=description, applied_at=datetime.utcnow()
+                )
+            )
+        ran.append((version, description))
+    return ran
+
+
+@migration(1, 'hot-path indexes on customers/submissions')
+def _hot_path_indexes(conn):
+    duplicates = conn.execute(text(
+        'SELECT customer_id FROM submissions GROUP BY customer_id HAVING COUNT(*) > 1 LIMIT 5'
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f'submissions.customer_id 중복 데이터가 있어 고유 인덱스를 만들 수 없습니다: {duplicates}'
+        )
+
+    for statement in (
+        'CREATE INDEX IF NOT EXISTS ix_customers_agent_status ON customers (assigned_agent_id, call_status)',
+        'CREATE INDEX IF NOT EXISTS ix_customers_status_created ON customers (call_status, created_at, id)',
+        'CREATE INDEX IF NOT EXISTS ix_customers_created ON customers (created_at, id)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_submissions_customer_id ON submissions (customer_id)',
+        'CREATE INDEX IF NOT EXISTS ix_submissions_final_created ON submissions (final_status, created_at, id)',
+        'CREATE INDEX IF NOT EXISTS ix_submissions_admin_created ON submissions (admin_status, created_at, id)',
+        'CREATE INDEX IF NOT EXISTS ix_submissions_created ON submissions (created_at, id)',
+    ):
+        conn.execute(text(statement))
+
+
+@migration(2, 'customers.phone index for import dedupe')
+def _customer_phone_index(conn):
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_customers_phone ON customers (phone)'))
+
+
+@migration(3, 'customers.next_call_at for the shared call queue')
+def _customer_next_call_at(conn):
+    columns = {c['name'] for c in inspect(conn).get_columns('customers')}
+    if 'next_call_at' not in columns:
+        conn.execute(text('ALTER TABLE customers ADD COLUMN next_call_at TIMESTAMP'))
+        conn.execute(text(
+            "UPDATE customers SET next_call_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
+            "WHERE call_status IS NULL OR call_status IN ('대기', '1차부재', '2차부재', '3차부재')"
+        ))
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_customers_agent_next_call '
+        'ON customers (assigned_agent_id, next_call_at, id)'
+    ))
+
+
+@migration(4, 'QC daily rollup tables')
+def _qc_rollup_tables(conn):
+    from app.models import QcDailyRollup, RollupState
+    QcDailyRollup.__table__.create(conn, checkfirst=True)
+    RollupState.__table__.create(conn, checkfirst=True)
+
+
+@migration(5, 'compress submissions.raw_customer_data')
+def _compress_raw_customer_data(conn, batch_size=500):
+    """기존 TEXT 값을 CompressedText 형식(zlib)으로 배치 변환한다.
+
+    SQLite 는 컬럼 선언을 바꾸지 않고 값만 BLOB 로 바꾼다 (파일 크기는 VACUUM 후 줄어든다).
+    """
+    from sqlalchemy import LargeBinary, bindparam
+    from app.models import decompress_text
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text(
+            "ALTER TABLE submissions ALTER COLUMN raw_customer_data TYPE bytea "
+            "USING convert_to(raw_customer_data, 'UTF8')"
+        ))
+
+    statement = text('UPDATE submissions SET raw_customer_data = :data WHERE id = :id').bindparams(
+        bindparam('data', type_=LargeBinary))
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            'SELECT id, raw_customer_data FROM submissions WHERE id > :last ORDER BY id LIMIT :limit'
+        ), {'last': last_id, 'limit': batch_size}).all()
+        if not rows:
+            break
+        updates = []
+        for row_id, value in rows:
+            if isinstance(value, memoryview):
+                value = bytes(value)
+            if not value or (isinstance(value, bytes) and _is_zlib(value)):
+                continue
+            updates.append({'id': row_id, 'data': zlib.compress(decompress_text(value).encode('utf-8'))})
+        if updates:
+            conn.execute(statement, updates)
+        last_id = rows[-1][0]
+
+
+def _is_zlib(value):
+    try:
+        zlib.decompress(value)
+        return True
+    except zlib.error:
+        return False
+
+
+SUBMISSION_FTS_COLUMNS = (
+    'memo_check_installment, memo_check_penalty, memo_check_rate_plan, memo_check_retention, '
+    'memo_check_monthly_fee, memo_check_used_phone, store_complaint_memo, agent_opinion'
+)
+
+
+@migration(6, 'customers.phone_rev and FTS5 search indexes')
+def _search_indexes(conn, batch_size=1000):
+    from sqlalchemy import bindparam
+    from app.models import reversed_digits
+    columns = {c['name'] for c in inspect(conn).get_columns('customers')}
+    if 'phone_rev' not in columns:
+        conn.execute(text('ALTER TABLE customers ADD COLUMN phone_rev VARCHAR(20)'))
+
+    statement = text('UPDATE customers SET phone_rev = :rev WHERE id = :cid')
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            'SELECT id, phone FROM customers WHERE id > :last AND phone_rev IS NULL ORDER BY id LIMIT :limit'
+        ), {'last': last_id, 'limit': batch_size}).all()
+        if not rows:
+            break
+        conn.execute(statement, [{'cid': row_id, 'rev': reversed_digits(phone)} for row_id, phone in rows])
+        last_id = rows[-1][0]
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_customers_phone_rev ON customers (phone_rev)'))
+
+    if conn.dialect.name != 'sqlite':
+        return  # 다른 DB 는 app.search 의 LIKE 검색을 쓴다
+
+    indexes = [
+        ('customers_fts', 'customers', 'name, phone', 'name, phone'),
+        ('submissions_fts', 'submissions', SUBMISSION_FTS_COLUMNS, SUBMISSION_FTS_COLUMNS),
+    ]
+    for fts, table, fts_columns, watched in indexes:
+        new_values = ', '.join(f'new.{c.strip()}' for c in fts_columns.split(','))
+        old_values = ', '.join(f'old.{c.strip()}' for c in fts_columns.split(','))
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{fts_columns}, content='{table}', content_rowid='id', tokenize='unicode61')"
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN '
+            f'INSERT INTO {fts}(rowid, {fts_columns}) VALUES (new.id, {new_values}); END'
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, {fts_columns}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {watched} ON {table} BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, {fts_columns}) VALUES ('delete', old.id, {old_values}); "
+            f'INSERT INTO {fts}(rowid, {fts_columns}) VALUES (new.id, {new_values}); END'
+        ))
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+@migration(7, 'change_events feed for live dashboards')
+def _change_events_table(conn):
+    from app.models import ChangeEvent
+    ChangeEvent.__table__.create(conn, checkfirst=True)
+
+
+@migration(8, 'archive database tables and submissions.recording_file index')
+def _archive_tables(conn):
+    """보관 테이블은 별도 바인드(SQLALCHEMY_BINDS['archive'])에 만든다."""
+    from app.models import ArchivedRecording, ArchivedSubmission
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_submissions_recording ON submissions (recording_file)'))
+    engine = db.engines['archive']
+    ArchivedSubmission.__table__.create(engine, checkfirst=True)
+    ArchivedRecording.__table__.create(engine, checkfirst=True)
+
+
+@migration(9, 'normalize customers.phone for import dedupe')
+def _normalize_customer_phones(conn, batch_size=1000):
+    """일괄 등록은 정규화한 번호(010-1234-5678)로 중복을 찾으므로 기존 번호도 같은 형태로 맞춘다.
+
+    정규화할 수 없는 번호는 그대로 둔다.
+    """
+    from app.models import reversed_digits
+    from app.services import normalize_phone
+    statement = text('UPDATE customers SET phone = :phone, phone_rev = :rev WHERE id = :cid')
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            'SELECT id, phone FROM customers WHERE id > :last ORDER BY id LIMIT :limit'
+        ), {'last': last_id, 'limit': batch_size}).all()
+        if not rows:
+            break
+        changes = []
+        for row_id, phone in rows:
+            normalized = normalize_phone(phone)
+            if normalized and normalized != phone:
+                changes.append({'cid': row_id, 'phone': normalized, 'rev': reversed_digits(normalized)})
+        if changes:
+            conn.execute(statement, changes)
+        last_id = rows[-1][0]
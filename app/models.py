@@ -1,9 +1,55 @@
+import zlib
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy.types import LargeBinary, TypeDecorator
 from werkzeug.security import check_password_hash
 from app.extensions import db
 
 
+class CompressedText(TypeDecorator):
+    """zlib 으로 압축해 BLOB/bytea 로 저장하는 텍스트.
+
+    압축 전에 TEXT 로 저장된 행(문자열 또는 압축되지 않은 UTF-8 바이트)도 그대로 읽는다.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, level=6):
+        super().__init__()
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value == '':
+            return b''
+        return zlib.compress(value.encode('utf-8'), self.level)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+
+def decompress_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not value:
+        return ''
+    try:
+        return zlib.decompress(value).decode('utf-8')
+    except zlib.error:
+        return value.decode('utf-8')
+
+
+def reversed_digits(phone):
+    """전화번호 숫자만 뒤집은 값. 끝자리 검색을 이 컬럼의 접두사 범위 조회로 바꾼다."""
+    return ''.join(c for c in reversed(phone or '') if c.isdigit())
+
+
+def _phone_rev_default(context):
+    return reversed_digits(context.get_current_parameters().get('phone'))
+
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -17,13 +63,29 @@ class User(UserMixin, db.Model):
 
 class Customer(db.Model):
     __tablename__ = 'customers'
+    __table_args__ = (
+        # 프리랜서 대시보드, 계정 삭제 시 배정 해제
+        db.Index('ix_customers_agent_status', 'assigned_agent_id', 'call_status'),
+        # 고객 관리 목록 (상태 필터 + 최신순 키셋)
+        db.Index('ix_customers_status_created', 'call_status', 'created_at', 'id'),
+        db.Index('ix_customers_created', 'created_at', 'id'),
+        # 일괄 등록 중복 확인
+        db.Index('ix_customers_phone', 'phone'),
+        # 공용 통화 큐: 미배정/내 고객 중 통화 가능 시각이 지난 순
+        db.Index('ix_customers_agent_next_call', 'assigned_agent_id', 'next_call_at', 'id'),
+        # 전화번호 끝자리 검색
+        db.Index('ix_customers_phone_rev', 'phone_rev'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20), nullable=False)
+    phone_rev = db.Column(db.String(20), default=_phone_rev_default)
     document_status = db.Column(db.String(50), default='접수완료')
     call_status = db.Column(db.String(20), default='대기')
     assigned_agent_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # 다음 통화 가능 시각 (NULL 이면 통화 종료로 큐에서 제외)
+    next_call_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     submissions = db.relationship('Submission', backref='customer', lazy=True)
     assigned_agent = db.relationship('User', backref='assigned_customers')
@@ -42,6 +104,16 @@ class Script(db.Model):
 
 class Submission(db.Model):
     __tablename__ = 'submissions'
+    __table_args__ = (
+        # 고객당 1건 제출 보장 + 중복 제출 확인
+        db.Index('uq_submissions_customer_id', 'customer_id', unique=True),
+        # 제출 현황 필터 + 최신순 키셋
+        db.Index('ix_submissions_final_created', 'final_status', 'created_at', 'id'),
+        db.Index('ix_submissions_admin_created', 'admin_status', 'created_at', 'id'),
+        db.Index('ix_submissions_created', 'created_at', 'id'),
+        # 보관 후 같은 녹취(내용 주소 키)를 아직 참조하는 제출 확인
+        db.Index('ix_submissions_recording', 'recording_file'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customers.id'), nullable=False)
     agent_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -61,9 +133,198 @@ class Submission(db.Model):
     memo_check_used_phone = db.Column(db.String(500), default='')
     store_complaint_memo = db.Column(db.String(500), default='')
     agent_opinion = db.Column(db.String(500), default='')
-    raw_customer_data = db.Column(db.Text, default='')
+    # 목록 화면에서는 읽지 않는 큰 컬럼: 접근할 때 로드
+    raw_customer_data = db.deferred(db.Column(CompressedText(), default=''))
     final_status = db.Column(db.String(20), default='정상')
     admin_status = db.Column(db.String(20), default='대기중')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     agent = db.relationship('User', backref='submissions')
+    detail = db.relationship('SubmissionDetail', uselist=False, backref='submission')
+
+
+class SubmissionDetail(db.Model):
+    """raw_customer_data 를 제출 시점에 파싱해 둔 개통 정보 (금액은 원 단위 정수)."""
+    __tablename__ = 'submission_details'
+    __table_args__ = (
+        db.Index('ix_submission_details_device', 'device'),
+        db.Index('ix_submission_details_plan', 'plan_name'),
+        db.Index('ix_submission_details_store', 'store_name'),
+        db.Index('ix_submission_details_penalty', 'penalty_amount'),
+    )
+    submission_id = db.Column(db.Integer, db.ForeignKey('submissions.id'), primary_key=True)
+    store_name = db.Column(db.String(100))
+    agent_name = db.Column(db.String(50))
+    agent_phone = db.Column(db.String(20))
+    device = db.Column(db.String(100))
+    installment_price = db.Column(db.Integer)
+    installment_months = db.Column(db.Integer)
+    installment_rate = db.Column(db.String(20))
+    monthly_installment = db.Column(db.Integer)
+    contract_months = db.Column(db.Integer)
+    plan_name = db.Column(db.String(100))
+    monthly_bill = db.Column(db.Integer)
+    plan2_name = db.Column(db.String(100))
+    plan2_date = db.Column(db.String(20))
+    monthly_bill_after = db.Column(db.Integer)
+    addon1 = db.Column(db.String(100))
+    addon2 = db.Column(db.String(100))
+    insurance = db.Column(db.String(100))
+    addon_keep_days = db.Column(db.Integer)
+    new_keep_days = db.Column(db.Integer)
+    change_keep_days = db.Column(db.Integer)
+    used_phone_return = db.Column(db.String(20))
+    used_phone_model = db.Column(db.String(100))
+    used_phone_amount = db.Column(db.Integer)
+    used_phone_method = db.Column(db.String(100))
+    old_installment_price = db.Column(db.Integer)
+    old_installment_months = db.Column(db.Integer)
+    old_payment_method = db.Column(db.String(100))
+    penalty = db.Column(db.String(20))
+    penalty_amount = db.Column(db.Integer)
+    bundle_discount = db.Column(db.String(100))
+    bundle_amount = db.Column(db.Integer)
+    parsed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class StatCounter(db.Model):
+    __tablename__ = 'stat_counters'
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Job(db.Model):
+    """DB 기반 작업 큐 항목. status: queued → running → done / failed."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after', 'id'),
+        db.Index('ix_jobs_submission', 'submission_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    submission_id = db.Column(db.Integer, db.ForeignKey('submissions.id'), nullable=True)
+    payload = db.Column(db.Text, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    result = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    submission = db.relationship('Submission', backref=db.backref('jobs', order_by='Job.id'))
+
+
+class QcDailyRollup(db.Model):
+    """(일자, 상담원)별 제출 집계. fail_* 는 해당 체크 항목이 비정상인 건수."""
+    __tablename__ = 'qc_daily_rollups'
+    __table_args__ = (
+        db.Index('ix_qc_daily_rollups_agent_day', 'agent_id', 'day'),
+    )
+    day = db.Column(db.Date, primary_key=True)
+    agent_id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    abnormal = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    resolved = db.Column(db.Integer, nullable=False, default=0)
+    fail_installment = db.Column(db.Integer, nullable=False, default=0)
+    fail_penalty = db.Column(db.Integer, nullable=False, default=0)
+    fail_rate_plan = db.Column(db.Integer, nullable=False, default=0)
+    fail_retention = db.Column(db.Integer, nullable=False, default=0)
+    fail_monthly_fee = db.Column(db.Integer, nullable=False, default=0)
+    fail_used_phone = db.Column(db.Integer, nullable=False, default=0)
+    fail_store_complaint = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RollupState(db.Model):
+    """집계 테이블별 반영 위치 (submissions.id 상한)."""
+    __tablename__ = 'rollup_state'
+    name = db.Column(db.String(64), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    refreshed_at = db.Column(db.DateTime)
+
+
+class ChangeEvent(db.Model):
+    """대시보드 실시간 갱신용 변경 로그. id 가 단조 증가하는 이벤트 번호다."""
+    __tablename__ = 'change_events'
+    __table_args__ = (
+        db.Index('ix_change_events_created', 'created_at'),
+        # 오래된 이벤트를 지운 뒤에도 번호를 재사용하지 않는다
+        {'sqlite_autoincrement': True},
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    entity_id = db.Column(db.Integer)
+    payload = db.Column(db.Text, default='{}')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# === 보관 DB (SQLALCHEMY_BINDS['archive'], app/archive.py) ===
+
+class ArchivedSubmission(db.Model):
+    """보관 DB 로 옮긴 처리완료 제출. 컬럼은 Submission 과 같고 id 도 그대로 쓴다.
+
+    고객·상담원은 운영 DB 에 남으므로 관계는 별도 조회로 읽는다 (조인 불가).
+    """
+    __bind_key__ = 'archive'
+    __tablename__ = 'archived_submissions'
+    __table_args__ = (
+        db.Index('ix_archived_submissions_customer', 'customer_id'),
+        db.Index('ix_archived_submissions_created', 'created_at', 'id'),
+    )
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    customer_id = db.Column(db.Integer, nullable=False)
+    agent_id = db.Column(db.Integer, nullable=False)
+    recording_file = db.Column(db.String(200))
+    check_installment = db.Column(db.Boolean, default=True)
+    check_penalty = db.Column(db.Boolean, default=True)
+    check_rate_plan = db.Column(db.Boolean, default=True)
+    check_retention = db.Column(db.Boolean, default=True)
+    check_monthly_fee = db.Column(db.Boolean, default=True)
+    check_used_phone = db.Column(db.Boolean, default=True)
+    check_store_complaint = db.Column(db.Boolean, default=True)
+    memo_check_installment = db.Column(db.String(500), default='')
+    memo_check_penalty = db.Column(db.String(500), default='')
+    memo_check_rate_plan = db.Column(db.String(500), default='')
+    memo_check_retention = db.Column(db.String(500), default='')
+    memo_check_monthly_fee = db.Column(db.String(500), default='')
+    memo_check_used_phone = db.Column(db.String(500), default='')
+    store_complaint_memo = db.Column(db.String(500), default='')
+    agent_opinion = db.Column(db.String(500), default='')
+    raw_customer_data = db.deferred(db.Column(CompressedText(), default=''))
+    # SubmissionDetail 컬럼을 JSON 으로
+    detail_data = db.deferred(db.Column(CompressedText(), default=''))
+    final_status = db.Column(db.String(20), default='정상')
+    admin_status = db.Column(db.String(20), default='처리완료')
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    customer = db.relationship('Customer', primaryjoin='foreign(ArchivedSubmission.customer_id) == Customer.id',
+                               viewonly=True)
+    agent = db.relationship('User', primaryjoin='foreign(ArchivedSubmission.agent_id) == User.id',
+                            viewonly=True)
+    jobs = ()  # 보관할 때 작업 이력은 지운다
+
+
+class ArchivedRecording(db.Model):
+    """월별 묶음 파일(YYYY-MM.pack)로 옮긴 녹취의 위치. key 는 Submission.recording_file 값."""
+    __bind_key__ = 'archive'
+    __tablename__ = 'archived_recordings'
+    key = db.Column(db.String(200), primary_key=True)
+    pack = db.Column(db.String(20), nullable=False)
+    offset = db.Column(db.BigInteger, nullable=False)
+    length = db.Column(db.Integer, nullable=False)      # 묶음 안에 저장된 바이트 수
+    size = db.Column(db.Integer, nullable=False)        # 원본 크기
+    compressed = db.Column(db.Boolean, nullable=False, default=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
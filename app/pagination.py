@@ -0,0 +1,58 @@
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+class KeysetPage:
+    def __init__(self, items, cursor, next_cursor):
+        self.items = items
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(created_at, row_id):
+    raw = f'{created_at.isoformat()}|{row_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def keyset_paginate(query, created_col, id_col, cursor=None, per_page=50):
+    """(created_at, id) 내림차순 키셋 페이지네이션.
+
+    OFFSET 대신 직전 페이지 마지막 행의 키를 커서로 받아 그 뒤부터 읽으므로,
+    몇 번째 페이지든 per_page + 1 행만 조회한다. 잘못된 커서는 첫 페이지로 취급한다.
+    """
+    key = decode_cursor(cursor)
+    if key:
+        created_at, row_id = key
+        query = query.filter(or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+        ))
+    else:
+        cursor = None
+
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+    return KeysetPage(rows, cursor, next_cursor)
@@ -0,0 +1,148 @@
+"""프리랜서 계정 일괄 생성.
+
+CSV(아이디[,비밀번호])를 읽어 기존 아이디를 IN 조회 한 번으로 걸러내고,
+비밀번호가 비어 있으면 새로 만든다. pbkdf2 해시는 일부러 느린 연산이므로
+건수가 pool_threshold 이상이고 코어가 둘 이상이면 프로세스 풀에서 나눠 계산하고,
+INSERT 는 배치 한 번으로 실행한다. 풀은 처음 필요할 때 한 번 만들어 재사용한다
+(요청마다 워커를 띄우면 몇 건짜리 파일도 프로세스 기동 비용을 치른다).
+
+결과 CSV 에는 새로 만든 비밀번호만 싣고, 관리자가 지정한 비밀번호는 되돌려주지 않는다.
+"""
+import atexit
+import csv
+import io
+import os
+import secrets
+import string
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app.extensions import db
+from app.models import User
+
+USERNAME_HEADERS = {'아이디', '계정', 'username', 'id'}
+PASSWORD_HEADERS = {'비밀번호', '패스워드', 'password'}
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+GENERATED_PASSWORD_LENGTH = 10
+USERNAME_MAX_LENGTH = User.__table__.c.username.type.length
+SUPPLIED_PASSWORD_MASK = '(지정됨)'
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ProvisionReport:
+    def __init__(self):
+        self.created = []   # (username, password, generated)
+        self.existing = []
+        self.errors = []    # (line_no, reason, value)
+
+    def credentials_csv(self):
+        """생성된 계정의 아이디/비밀번호를 담은 CSV 문자열 (엑셀용 BOM 포함).
+
+        비밀번호는 새로 만든 것만 적고, 지정된 비밀번호는 SUPPLIED_PASSWORD_MASK 로 가린다.
+        """
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['username', 'password', 'status'])
+        for username, password, generated in self.created:
+            if generated:
+                writer.writerow([username, password, 'generated'])
+            else:
+                writer.writerow([username, SUPPLIED_PASSWORD_MASK, 'created'])
+        for username in self.existing:
+            writer.writerow([username, '', 'exists'])
+        for line_no, reason, value in self.errors:
+            writer.writerow([value, '', f'error: {reason} (line {line_no})'])
+        return '\ufeff' + out.getvalue()
+
+
+def generate_password(length=GENERATED_PASSWORD_LENGTH):
+    return ''.join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def hash_password(password):
+    return generate_password_hash(password, method='pbkdf2:sha256')
+
+
+def _hash_pool(workers=None):
+    """workers 별 프로세스 풀을 처음 요청될 때 만들어 돌려준다 (프로세스 종료 시 정리)."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def iter_freelancer_rows(stream):
+    """(line_no, username, password) 를 하나씩 돌려준다. 첫 줄이 헤더면 건너뛴다."""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.reader(stream)
+    username_idx, password_idx = 0, 1
+    for row in reader:
+        cells = [c.strip() for c in row]
+        if not any(cells):
+            continue
+        if reader.line_num == 1:
+            lowered = [c.lower() for c in cells]
+            if USERNAME_HEADERS & set(lowered):
+                username_idx = next(i for i, c in enumerate(lowered) if c in USERNAME_HEADERS)
+                password_idx = next((i for i, c in enumerate(lowered) if c in PASSWORD_HEADERS), None)
+                continue
+        username = cells[username_idx] if len(cells) > username_idx else ''
+        password = cells[password_idx] if password_idx is not None and len(cells) > password_idx else ''
+        yield reader.line_num, username, password
+
+
+def provision_freelancers(rows, workers=None, pool_threshold=2):
+    """rows 의 계정을 만들고 ProvisionReport 를 돌려준다. 이미 있는 아이디는 건드리지 않는다."""
+    report = ProvisionReport()
+
+    pending = {}
+    for line_no, username, password in rows:
+        if not username:
+            report.errors.append((line_no, '아이디 누락', ''))
+        elif len(username) > USERNAME_MAX_LENGTH:
+            report.errors.append((line_no, '아이디가 너무 깁니다', username))
+        elif username in pending:
+            report.errors.append((line_no, '파일 내 중복', username))
+        else:
+            pending[username] = password
+    if not pending:
+        return report
+
+    existing = set(db.session.scalars(
+        db.select(User.username).where(User.username.in_(list(pending)))
+    ))
+    report.existing = [u for u in pending if u in existing]
+    accounts = [(u, p or generate_password(), not p) for u, p in pending.items() if u not in existing]
+    if not accounts:
+        return report
+
+    passwords = [password for _, password, _ in accounts]
+    if len(passwords) >= pool_threshold and (workers or os.cpu_count() or 1) > 1:
+        hashes = list(_hash_pool(workers).map(hash_password, passwords,
+                                              chunksize=max(1, len(passwords) // 32)))
+    else:
+        hashes = [hash_password(p) for p in passwords]
+
+    db.session.execute(insert(User), [
+        {'username': username, 'password': hashed, 'role': 'freelancer'}
+        for (username, _, _), hashed in zip(accounts, hashes)
+    ])
+    db.session.commit()
+    report.created = accounts
+    return report
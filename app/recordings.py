@@ -0,0 +1,66 @@
+"""녹취 파일 저장소.
+
+업로드는 청크 단위로 로컬 임시 파일에 쓰면서 SHA-256 을 계산하고, 완료되면
+저장소 드라이버(app/storage.py)에 ab/cd/<sha256>.<ext> 키로 넘긴다. 같은 내용은 한 번만
+저장된다. Submission.recording_file 에는 이 키를 기록하며, 예전 방식의 평면 파일명도
+같은 방식으로 찾는다.
+"""
+import hashlib
+import os
+import tempfile
+from app.storage import get_storage
+
+CHUNK_SIZE = 64 * 1024
+
+AUDIO_MIMETYPES = {
+    'mp3': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'm4a': 'audio/mp4',
+    'ogg': 'audio/ogg',
+}
+
+
+def store_recording(file_storage):
+    """업로드 파일을 내용 주소 방식으로 저장하고 키를 돌려준다."""
+    storage = get_storage()
+    ext = file_storage.filename.rsplit('.', 1)[1].lower()
+    if storage.temp_dir:
+        os.makedirs(storage.temp_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=storage.temp_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: file_storage.stream.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        key = f'{sha256[:2]}/{sha256[2:4]}/{sha256}.{ext}'
+        storage.put_file(key, tmp_path)
+        return key
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def recording_path(key):
+    """로컬 저장소에서 키에 해당하는 실제 경로. 저장소 밖을 가리키거나 없으면 (또는 원격 저장소면) None."""
+    return get_storage().local_path(key)
+
+
+def recording_url(key, download_name=None):
+    """원격 저장소의 서명된 재생 URL. 로컬 저장소면 None."""
+    return get_storage().presigned_url(key, download_name=download_name, mimetype=recording_mimetype(key))
+
+
+def recording_etag(key):
+    """내용 주소 키는 파일명 자체가 해시이므로 그대로 강한 ETag 로 쓴다."""
+    name = os.path.basename(key).rsplit('.', 1)[0]
+    return name if len(name) == 64 else None
+
+
+def recording_mimetype(key):
+    ext = key.rsplit('.', 1)[-1].lower() if '.' in key else ''
+    return AUDIO_MIMETYPES.get(ext, 'application/octet-stream')
@@ -0,0 +1,84 @@
+"""제출 건 일괄 처리완료.
+
+id 목록이나 조건(최종 결과, 제출일 기준, 대시보드 필터)에 맞는 '대기중' 제출을
+id 순으로 chunk_size 건씩 처리한다. 청크마다 대상 행을 읽고(PostgreSQL 은
+FOR UPDATE SKIP LOCKED) UPDATE 한 번으로 바꾼 뒤, 같은 트랜잭션에서 상태 카운터와
+QC 집계를 건수만큼 조정하고 변경 이벤트를 남긴 다음 커밋한다.
+SQLite 는 읽은 뒤 다른 쓰기가 끼어들면 UPDATE 가 잠금 오류로 실패하므로
+run_in_transaction 이 청크를 다시 읽어 재시도한다.
+"""
+from collections import Counter
+from datetime import datetime, time
+from sqlalchemy import false, update
+from app.counters import record_submissions
+from app.database import run_in_transaction
+from app.events import emit
+from app.extensions import db
+from app.models import Submission
+from app.rollups import record_admin_statuses
+
+RESOLVE_CHUNK_SIZE = 500
+
+
+def resolve_criteria(final_status=None, created_before=None, filter_type='all'):
+    """대시보드 조건을 where 조건 목록으로. created_before 는 날짜(그날 0시 이전) 또는 datetime."""
+    criteria = []
+    if final_status:
+        criteria.append(Submission.final_status == final_status)
+    if created_before is not None:
+        if not isinstance(created_before, datetime):
+            created_before = datetime.combine(created_before, time.min)
+        criteria.append(Submission.created_at < created_before)
+    if filter_type == 'abnormal':
+        criteria.append(Submission.final_status == '비정상')
+    elif filter_type == 'resolved':
+        criteria.append(false())  # 처리완료 목록에는 바꿀 건이 없다
+    return criteria
+
+
+def _resolve_chunk(criteria, limit):
+    rows = db.session.execute(
+        db.select(Submission.id, Submission.final_status, Submission.agent_id, Submission.created_at)
+        .where(Submission.admin_status == '대기중', *criteria)
+        .order_by(Submission.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return rows
+
+    ids = [row.id for row in rows]
+    db.session.execute(
+        update(Submission)
+        .where(Submission.id.in_(ids))
+        .values(admin_status='처리완료')
+        .execution_options(synchronize_session=False)
+    )
+    record_submissions(((final_status, '대기중'), (final_status, '처리완료'), count)
+                       for final_status, count in Counter(row.final_status for row in rows).items())
+    record_admin_statuses(rows, '대기중', '처리완료')
+    emit('submissions.resolved', None, counters=True, ids=ids, admin_status='처리완료')
+    return rows
+
+
+def bulk_resolve(ids=None, criteria=(), chunk_size=RESOLVE_CHUNK_SIZE):
+    """ids 가 있으면 그 제출만, 없으면 criteria 에 맞는 대기중 제출을 처리완료로 바꾼다.
+
+    청크마다 커밋하며 실제로 바뀐 건수를 돌려준다.
+    """
+    resolved = 0
+    if ids is not None:
+        ids = sorted(set(ids))
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            rows = run_in_transaction(lambda: _resolve_chunk([Submission.id.in_(chunk)], chunk_size))
+            resolved += len(rows)
+        return resolved
+
+    last_id = 0
+    while True:
+        rows = run_in_transaction(lambda: _resolve_chunk([Submission.id > last_id, *criteria], chunk_size))
+        if not rows:
+            return resolved
+        resolved += len(rows)
+        last_id = rows[-1].id
@@ -0,0 +1,248 @@
+"""상담원별·일자별 QC 집계.
+
+qc_daily_rollups 에 (일자, 상담원)별 제출 건수, 최종/관리 상태 건수, 체크 항목별
+비정상 건수를 누적한다. refresh() 는 rollup_state 의 submissions.id 상한 이후의 새
+제출만 GROUP BY 로 더하고 (작업 워커가 주기적으로 실행), 이미 반영된 제출의 관리 상태가 바뀌면
+record_admin_status() 가 같은 트랜잭션에서 해당 행을 조정한다.
+리포트 화면은 이 테이블만 읽는다. rebuild() 는 기간을 지정해 다시 계산하며,
+보관 DB 로 옮긴 제출(app/archive.py)도 함께 센다.
+"""
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import bindparam, case, func, insert, update
+from app.database import run_in_transaction
+from app.extensions import db
+from app.models import ArchivedSubmission, QcDailyRollup, RollupState, Submission
+
+STATE_NAME = 'qc_daily'
+REFRESH_BATCH_IDS = 5000
+# PostgreSQL 시퀀스는 id 순서와 커밋 순서가 다를 수 있으므로 막 들어온 제출은
+# 잠시 뒤에 반영한다 (SQLite 는 쓰기가 직렬화되어 필요 없음)
+REFRESH_SETTLE = timedelta(seconds=30)
+
+CHECK_ITEMS = [
+    ('installment', '할부금 안내'),
+    ('penalty', '위약금 안내'),
+    ('rate_plan', '요금제 안내'),
+    ('retention', '유지기간 안내'),
+    ('monthly_fee', '요금 안내'),
+    ('used_phone', '중고폰 반납'),
+    ('store_complaint', '매장 불만'),
+]
+COUNT_COLUMNS = (['total', 'abnormal', 'pending', 'resolved']
+                 + [f'fail_{item}' for item, _ in CHECK_ITEMS])
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _aggregate(*criteria, model=Submission):
+    """criteria 에 맞는 제출(model: Submission 또는 ArchivedSubmission)을 (일자, 상담원)별로 집계한 dict 목록."""
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    day = func.date(model.created_at)
+    columns = [
+        func.count(model.id).label('total'),
+        count_if(model.final_status == '비정상').label('abnormal'),
+        count_if(model.admin_status == '대기중').label('pending'),
+        count_if(model.admin_status == '처리완료').label('resolved'),
+    ] + [
+        count_if(getattr(model, f'check_{item}') == False).label(f'fail_{item}')  # noqa: E712
+        for item, _ in CHECK_ITEMS
+    ]
+    rows = db.session.execute(
+        db.select(day.label('day'), model.agent_id, *columns)
+        .where(*criteria)
+        .group_by(day, model.agent_id)
+    ).mappings().all()
+    return [dict(row, day=_as_date(row['day'])) for row in rows]
+
+
+def _add(day, agent_id, deltas):
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    result = db.session.execute(
+        update(QcDailyRollup)
+        .where(QcDailyRollup.day == day, QcDailyRollup.agent_id == agent_id)
+        .values({k: getattr(QcDailyRollup, k) + v for k, v in deltas.items()})
+    )
+    if result.rowcount == 0:
+        db.session.execute(insert(QcDailyRollup).values(day=day, agent_id=agent_id, **deltas))
+
+
+def _state():
+    state = db.session.get(RollupState, STATE_NAME)
+    if state is None:
+        state = RollupState(name=STATE_NAME, last_id=0)
+        db.session.add(state)
+        db.session.flush()
+    return state
+
+
+def refreshed_at():
+    """마지막 refresh 시각 (한 번도 안 했으면 None)."""
+    return db.session.scalar(db.select(RollupState.refreshed_at).where(RollupState.name == STATE_NAME))
+
+
+def _refresh_batch(target, batch_ids):
+    """상한 다음 batch_ids 개 구간을 점유해 집계에 더한다. 더할 게 없으면 None.
+
+    상한은 조건부 UPDATE(last_id 가 읽은 값일 때만)로 먼저 옮기므로, 여러 워커가
+    동시에 refresh 해도 같은 구간을 두 번 더하지 않는다. 다른 쪽이 먼저 옮겼으면 0.
+    """
+    state = _state()
+    last_id = state.last_id
+    if last_id >= target:
+        return None
+    upper = min(last_id + batch_ids, target)
+    claimed = db.session.execute(
+        update(RollupState)
+        .where(RollupState.name == STATE_NAME, RollupState.last_id == last_id)
+        .values(last_id=upper, refreshed_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        return 0
+    added = 0
+    for row in _aggregate(Submission.id > last_id, Submission.id <= upper):
+        _add(row.pop('day'), row.pop('agent_id'), row)
+        added += row['total']
+    return added
+
+
+def refresh(batch_ids=REFRESH_BATCH_IDS):
+    """상한 이후 새 제출을 집계에 더한다. 배치마다 커밋하며 반영한 건수를 돌려준다.
+
+    쓰기 작업이므로 조회 화면이 아니라 작업 워커('flask jobs work')나
+    'flask rollups refresh', 제출 직후(JOBS_EAGER)에서 부른다.
+    """
+    target = db.session.query(func.max(Submission.id))
+    if db.engine.dialect.name != 'sqlite':
+        target = target.filter(Submission.created_at < datetime.utcnow() - REFRESH_SETTLE)
+    target = target.scalar() or 0
+    added = 0
+    while True:
+        batch = run_in_transaction(lambda: _refresh_batch(target, batch_ids))
+        if batch is None:
+            return added
+        added += batch
+
+
+def rebuild(date_from=None, date_to=None):
+    """기간(양끝 포함) 집계를 지우고 반영 위치까지의 제출과 보관된 제출로 다시 계산한다."""
+    state = _state()
+    criteria = [Submission.id <= state.last_id]
+    archived_criteria = []
+    rollups = QcDailyRollup.query
+    if date_from:
+        start = datetime.combine(date_from, time.min)
+        criteria.append(Submission.created_at >= start)
+        archived_criteria.append(ArchivedSubmission.created_at >= start)
+        rollups = rollups.filter(QcDailyRollup.day >= date_from)
+    if date_to:
+        end = datetime.combine(date_to + timedelta(days=1), time.min)
+        criteria.append(Submission.created_at < end)
+        archived_criteria.append(ArchivedSubmission.created_at < end)
+        rollups = rollups.filter(QcDailyRollup.day <= date_to)
+
+    rollups.delete(synchronize_session=False)
+    # 보관 DB 는 다른 DB 일 수 있어 따로 집계해 (일자, 상담원)별로 더한다
+    merged = {}
+    for row in _aggregate(*criteria) + _aggregate(*archived_criteria, model=ArchivedSubmission):
+        key = (row['day'], row['agent_id'])
+        if key in merged:
+            for name in COUNT_COLUMNS:
+                merged[key][name] += row[name]
+        else:
+            merged[key] = row
+    rows = list(merged.values())
+    if rows:
+        db.session.execute(insert(QcDailyRollup), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _status_deltas(old, new, count=1):
+    deltas = {}
+    for status, delta in ((old, -count), (new, count)):
+        if status == '대기중':
+            deltas['pending'] = deltas.get('pending', 0) + delta
+        elif status == '처리완료':
+            deltas['resolved'] = deltas.get('resolved', 0) + delta
+    return deltas
+
+
+def record_admin_status(submission, old, new):
+    """이미 집계된 제출의 관리 상태 변경을 반영한다. 커밋은 호출한 쪽에서."""
+    if old == new or submission.created_at is None:
+        return
+    state = db.session.get(RollupState, STATE_NAME)
+    if state is None or submission.id > state.last_id:
+        return  # 다음 refresh 가 현재 상태로 집계한다
+    _add(submission.created_at.date(), submission.agent_id, _status_deltas(old, new))
+
+
+def record_admin_statuses(rows, old, new):
+    """record_admin_status 의 여러 건 버전. rows 는 id/agent_id/created_at 을 가진 행."""
+    if old == new:
+        return
+    state = db.session.get(RollupState, STATE_NAME)
+    if state is None:
+        return
+    groups = {}
+    for row in rows:
+        if row.id <= state.last_id and row.created_at is not None:
+            key = (row.created_at.date(), row.agent_id)
+            groups[key] = groups.get(key, 0) + 1
+    if not groups:
+        return
+    # 이미 집계된 제출이므로 (일자, 상담원) 행이 있다. 그룹마다 UPDATE 를 따로 내지 않고 executemany 한 번으로
+    table = QcDailyRollup.__table__
+    columns = sorted(_status_deltas(old, new))
+    db.session.execute(
+        update(table)
+        .where(table.c.day == bindparam('b_day'), table.c.agent_id == bindparam('b_agent_id'))
+        .values({name: table.c[name] + bindparam(f'b_{name}') for name in columns}),
+        [{'b_day': day, 'b_agent_id': agent_id,
+          **{f'b_{name}': delta for name, delta in _status_deltas(old, new, count).items()}}
+         for (day, agent_id), count in groups.items()],
+    )
+
+
+def _summed(group_column, date_from, date_to, agent_id=None):
+    query = (db.session.query(group_column,
+                              *[func.sum(getattr(QcDailyRollup, c)).label(c) for c in COUNT_COLUMNS])
+             .filter(QcDailyRollup.day >= date_from, QcDailyRollup.day <= date_to))
+    if agent_id is not None:
+        query = query.filter(QcDailyRollup.agent_id == agent_id)
+    return query.group_by(group_column).order_by(group_column).all()
+
+
+def _with_rates(counts, **extra):
+    total = counts['total']
+    return dict(
+        counts,
+        abnormal_rate=counts['abnormal'] / total if total else 0.0,
+        fail_rates={item: counts[f'fail_{item}'] / total if total else 0.0 for item, _ in CHECK_ITEMS},
+        **extra,
+    )
+
+
+def _counts(row):
+    return {c: getattr(row, c) or 0 for c in COUNT_COLUMNS}
+
+
+def report_by_agent(date_from, date_to):
+    return [_with_rates(_counts(row), key=row.agent_id)
+            for row in _summed(QcDailyRollup.agent_id, date_from, date_to)]
+
+
+def report_by_day(date_from, date_to, agent_id=None):
+    return [_with_rates(_counts(row), key=_as_date(row.day))
+            for row in _summed(QcDailyRollup.day, date_from, date_to, agent_id)]
+
+
+def report_totals(rows):
+    return _with_rates({c: sum(r[c] for r in rows) for c in COUNT_COLUMNS})
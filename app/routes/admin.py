@@ -1,12 +1,27 @@
-from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+import io
+from datetime import datetime, timedelta
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, current_app, jsonify, abort,
+                   send_file, stream_with_context)
 from flask_login import login_required, current_user
+from sqlalchemy import func, update
+from sqlalchemy.orm import contains_eager, joinedload, load_only
 from werkzeug.security import generate_password_hash
 from app.extensions import db
+from app.identity import identity_cache
 from app.models import User, Customer, Submission, Script
+from app.events import broadcaster, emit
+from app.counters import record_submission, record_customer, submission_stats, customer_status_counts
+from app.pagination import keyset_paginate
+from app.rollups import record_admin_status
+from app.recordings import recording_path, recording_etag, recording_mimetype, recording_url
+from app.script_cache import invalidate_active_script
+from app.services import filter_submissions, normalize_phone, assign_customers, auto_distribute_customers
 
 admin_bp = Blueprint('admin', __name__)
 
+# 일괄 배정 이벤트에 실을 최대 고객 id 수 (넘으면 화면에 새로고침 안내)
+BULK_EVENT_IDS = 500
+
 
 @admin_bp.route('/admin')
 @login_required
@@ -16,26 +31,68 @@ def admin_dashboard():
         return redirect(url_for('auth.index'))
 
     filter_type = request.args.get('filter', 'all')
-    query = Submission.query.join(Customer)
+    # 목록에 표시하는 컬럼만 읽는다 (메모·원본 데이터는 상세 화면에서)
+    query = Submission.query.join(Customer).options(
+        load_only(Submission.id, Submission.customer_id, Submission.final_status,
+                  Submission.admin_status, Submission.created_at),
+        contains_eager(Submission.customer).load_only(Customer.id, Customer.name, Customer.phone),
+    )
+    query = filter_submissions(query, filter_type)
+
+    page = keyset_paginate(query, Submission.created_at, Submission.id,
+                           cursor=request.args.get('cursor'),
+                           per_page=current_app.config['ADMIN_PAGE_SIZE'])
 
-    if filter_type == 'abnormal':
-        query = query.filter(Submission.final_status == '비정상')
-    elif filter_type == 'pending':
-        query = query.filter(Submission.admin_status == '대기중')
-    elif filter_type == 'resolved':
-        query = query.filter(Submission.admin_status == '처리완료')
+    stats = submission_stats()
 
-    submissions = query.order_by(Submission.created_at.desc()).all()
+    return render_template('admin_dashboard.html', submissions=page.items, page=page, stats=stats, filter_type=filter_type)
 
-    stats = {
-        'total': Submission.query.count(),
-        'normal': Submission.query.filter_by(final_status='정상').count(),
-        'abnormal': Submission.query.filter_by(final_status='비정상').count(),
-        'pending': Submission.query.filter_by(admin_status='대기중').count(),
-        'resolved': Submission.query.filter_by(admin_status='처리완료').count()
-    }
 
-    return render_template('admin_dashboard.html', submissions=submissions, stats=stats, filter_type=filter_type)
+@admin_bp.route('/admin/export')
+@login_required
+def export_submissions():
+    """제출 건 스트리밍 내보내기. ?format=csv|ndjson&filter=&from=&to=&gzip=1"""
+    if current_user.role != 'admin':
+        abort(403)
+
+    from app.exports import FILTERS, FORMATS, export_filename, export_submissions as run_export, parse_date_range
+    fmt = request.args.get('format', 'csv')
+    filter_type = request.args.get('filter', 'all')
+    if fmt not in FORMATS or filter_type not in FILTERS:
+        abort(400)
+    try:
+        date_from, date_to = parse_date_range(request.args.get('from'), request.args.get('to'))
+    except ValueError:
+        abort(400)
+    gzip = request.args.get('gzip') == '1'
+
+    chunks = run_export(fmt, filter_type, date_from, date_to, gzip=gzip)
+    filename = export_filename(fmt, filter_type, date_from, date_to, gzip=gzip)
+    return current_app.response_class(
+        stream_with_context(chunks),
+        mimetype='application/gzip' if gzip else FORMATS[fmt][0],
+        headers={'Content-Disposition': f'attachment; filename={filename}',
+                 'Cache-Control': 'no-store',
+                 'X-Accel-Buffering': 'no'},
+    )
+
+
+@admin_bp.route('/admin/events')
+@login_required
+def events():
+    """변경 이벤트 SSE 스트림. Last-Event-ID (또는 ?last_id=) 이후 이벤트부터 보낸다."""
+    if current_user.role != 'admin':
+        abort(403)
+
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    app = current_app._get_current_object()
+    db.session.remove()  # 스트림이 열려 있는 동안 DB 연결을 붙잡지 않는다
+    return current_app.response_class(
+        broadcaster.stream(app, last_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @admin_bp.route('/admin/submission/<int:submission_id>')
@@ -45,10 +102,59 @@ def admin_submission_detail(submission_id):
         flash('관리자만 접근 가능합니다.', 'error')
         return redirect(url_for('auth.index'))
 
-    submission = Submission.query.get_or_404(submission_id)
+    from app.archive import find_submission
+    submission = find_submission(submission_id)
+    if submission is None:
+        abort(404)
     return render_template('admin_submission_detail.html', submission=submission)
 
 
+@admin_bp.route('/admin/submission/<int:submission_id>/recording')
+@login_required
+def submission_recording(submission_id):
+    """녹취 재생/다운로드. Range(206)와 If-None-Match/If-Modified-Since 를 지원한다.
+
+    원격 저장소(S3)는 서명된 URL 로 리다이렉트해 바이트가 워커를 거치지 않게 하고,
+    보관된 제출은 보관 묶음 파일에서 읽어 메모리에서 보낸다.
+    """
+    if current_user.role != 'admin':
+        abort(403)
+
+    from app.archive import find_submission, read_archived_recording
+    from app.models import ArchivedSubmission
+    submission = find_submission(submission_id)
+    if submission is None or not submission.recording_file:
+        abort(404)
+    key = submission.recording_file
+    download_name = f'{submission_id}_{key.rsplit("/", 1)[-1]}'
+
+    archived = isinstance(submission, ArchivedSubmission)
+    source = None if archived else recording_path(key)
+    if source is None and not archived:
+        url = recording_url(key, download_name)
+        if url is not None:
+            response = redirect(url)
+            response.cache_control.private = True
+            response.cache_control.no_store = True
+            return response
+    if source is None:
+        data = read_archived_recording(key)
+        if data is None:
+            abort(404)
+        source = io.BytesIO(data)
+
+    etag = recording_etag(key)
+    response = send_file(source,
+                         mimetype=recording_mimetype(key),
+                         conditional=True,
+                         etag=etag or True,
+                         max_age=31536000 if etag else None,
+                         download_name=download_name)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
 @admin_bp.route('/admin/submission/<int:submission_id>/resolve', methods=['POST'])
 @login_required
 def resolve_submission(submission_id):
@@ -57,13 +163,92 @@ def resolve_submission(submission_id):
         return redirect(url_for('auth.index'))
 
     submission = Submission.query.get_or_404(submission_id)
-    submission.admin_status = '처리완료'
+    old_status = submission.admin_status
+    if old_status != '처리완료':
+        # 읽은 상태일 때만 바꿔 동시 요청이 카운터를 두 번 조정하지 않게 한다
+        changed = db.session.execute(
+            update(Submission)
+            .where(Submission.id == submission_id, Submission.admin_status == old_status)
+            .values(admin_status='처리완료')
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if changed:
+            record_submission(old=(submission.final_status, old_status),
+                              new=(submission.final_status, '처리완료'))
+            record_admin_status(submission, old_status, '처리완료')
+            emit('submission.resolved', submission.id, counters=True,
+                 final_status=submission.final_status, admin_status='처리완료')
     db.session.commit()
 
     flash('처리완료로 변경되었습니다.', 'success')
     return redirect(url_for('admin.admin_submission_detail', submission_id=submission_id))
 
 
+@admin_bp.route('/admin/submissions/resolve', methods=['POST'])
+@login_required
+def bulk_resolve_submissions():
+    """대기중 제출 일괄 처리완료.
+
+    submission_ids(여러 값) 또는 조건 final_status / created_before(YYYY-MM-DD, 그날 이전) / filter 를
+    받는다. JSON 본문({"ids": [...]} 또는 {"final_status": ..., "created_before": ...})이면
+    {"resolved": 건수} 로, 폼이면 대시보드로 돌려보낸다.
+    """
+    from app.exports import parse_date
+    from app.resolutions import bulk_resolve, resolve_criteria
+
+    wants_json = request.is_json
+    if current_user.role != 'admin':
+        if wants_json:
+            abort(403)
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    params = request.form
+    if wants_json:
+        params = request.get_json(silent=True)
+        if not isinstance(params, dict):
+            return jsonify({'error': 'JSON 객체가 필요합니다.'}), 400
+    filter_type = params.get('filter') or 'all'
+    if wants_json:
+        ids = params.get('ids')
+    else:
+        ids = request.form.getlist('submission_ids') or None
+
+    error = None
+    if ids is not None:
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            ids, error = None, '제출 id 가 올바르지 않습니다.'
+        if not error and not ids:
+            error = '처리할 제출을 선택하세요.'
+    else:
+        final_status = params.get('final_status') or None
+        created_before = parse_date(params.get('created_before'))
+        if final_status not in (None, '정상', '비정상'):
+            error = '최종 결과가 올바르지 않습니다.'
+        elif params.get('created_before') and created_before is None:
+            error = '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'
+        elif final_status is None and created_before is None:
+            error = '최종 결과나 기준 날짜 중 하나는 지정해야 합니다.'
+
+    if error:
+        if wants_json:
+            return jsonify({'error': error}), 400
+        flash(error, 'error')
+        return redirect(url_for('admin.admin_dashboard', filter=filter_type))
+
+    if ids is not None:
+        resolved = bulk_resolve(ids=ids)
+    else:
+        resolved = bulk_resolve(criteria=resolve_criteria(final_status, created_before, filter_type))
+
+    if wants_json:
+        return jsonify({'resolved': resolved})
+    flash(f'{resolved}건을 처리완료로 변경했습니다.', 'success')
+    return redirect(url_for('admin.admin_dashboard', filter=filter_type))
+
+
 # === 프리랜서 계정 관리 ===
 
 @admin_bp.route('/admin/freelancers')
@@ -74,7 +259,13 @@ def manage_freelancers():
         return redirect(url_for('auth.index'))
 
     freelancers = User.query.filter_by(role='freelancer').all()
-    return render_template('admin_freelancers.html', freelancers=freelancers)
+    # 배정 고객 수는 GROUP BY 한 번으로 (계정마다 고객 목록을 읽지 않는다)
+    assigned_counts = dict(
+        db.session.query(Customer.assigned_agent_id, func.count(Customer.id))
+        .filter(Customer.assigned_agent_id.isnot(None))
+        .group_by(Customer.assigned_agent_id)
+    )
+    return render_template('admin_freelancers.html', freelancers=freelancers, assigned_counts=assigned_counts)
 
 
 @admin_bp.route('/admin/freelancers/create', methods=['POST'])
@@ -106,6 +297,29 @@ def create_freelancer():
     return redirect(url_for('admin.manage_freelancers'))
 
 
+@admin_bp.route('/admin/freelancers/import', methods=['POST'])
+@login_required
+def provision_freelancers():
+    if current_user.role != 'admin':
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    file = request.files.get('file')
+    if not file or not file.filename:
+        flash('등록할 파일을 선택해주세요.', 'error')
+        return redirect(url_for('admin.manage_freelancers'))
+
+    from app.provisioning import iter_freelancer_rows, provision_freelancers as run_provision
+    report = run_provision(iter_freelancer_rows(file.stream))
+    filename = f'freelancers_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return current_app.response_class(
+        report.credentials_csv(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}',
+                 'Cache-Control': 'no-store'},
+    )
+
+
 @admin_bp.route('/admin/freelancers/<int:user_id>/delete', methods=['POST'])
 @login_required
 def delete_freelancer(user_id):
@@ -122,10 +336,52 @@ def delete_freelancer(user_id):
     Customer.query.filter_by(assigned_agent_id=user_id).update({'assigned_agent_id': None})
     db.session.delete(user)
     db.session.commit()
+    identity_cache.invalidate(user_id)
     flash(f'프리랜서 계정 "{user.username}"이 삭제되었습니다.', 'success')
     return redirect(url_for('admin.manage_freelancers'))
 
 
+@admin_bp.route('/admin/identity-cache')
+@login_required
+def identity_cache_stats():
+    if current_user.role != 'admin':
+        return jsonify({'error': 'forbidden'}), 403
+    return jsonify(identity_cache.stats())
+
+
+# === QC 리포트 ===
+
+@admin_bp.route('/admin/reports')
+@login_required
+def qc_reports():
+    if current_user.role != 'admin':
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    from app.exports import parse_date_range
+    from app import rollups
+
+    try:
+        date_from, date_to = parse_date_range(request.args.get('from'), request.args.get('to'))
+    except ValueError:
+        abort(400)
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    agent_id = request.args.get('agent', type=int)
+
+    by_agent = rollups.report_by_agent(date_from, date_to)
+    by_day = rollups.report_by_day(date_from, date_to, agent_id)
+    agent_ids = [row['key'] for row in by_agent]
+    agent_names = dict(db.session.query(User.id, User.username).filter(User.id.in_(agent_ids))) if agent_ids else {}
+
+    return render_template('admin_reports.html',
+                           by_agent=by_agent, by_day=by_day,
+                           totals=rollups.report_totals(by_agent),
+                           check_items=rollups.CHECK_ITEMS, agent_names=agent_names,
+                           agent_id=agent_id, date_from=date_from, date_to=date_to,
+                           refreshed_at=rollups.refreshed_at())
+
+
 # === 스크립트 편집 ===
 
 @admin_bp.route('/admin/script')
@@ -178,6 +434,7 @@ def save_script():
         db.session.add(active_script)
 
     db.session.commit()
+    invalidate_active_script()
     flash('스크립트가 저장되었습니다.', 'success')
     return redirect(url_for('admin.edit_script'))
 
@@ -192,31 +449,41 @@ def manage_customers():
         return redirect(url_for('auth.index'))
 
     status_filter = request.args.get('status', 'all')
-    query = Customer.query
+    query = Customer.query.options(
+        joinedload(Customer.assigned_agent).load_only(User.id, User.username))
 
     if status_filter != 'all':
         query = query.filter(Customer.call_status == status_filter)
 
-    customers = query.order_by(Customer.created_at.desc()).all()
-    freelancers = User.query.filter_by(role='freelancer').all()
+    page = keyset_paginate(query, Customer.created_at, Customer.id,
+                           cursor=request.args.get('cursor'),
+                           per_page=current_app.config['ADMIN_PAGE_SIZE'])
+    freelancers = User.query.options(load_only(User.id, User.username)).filter_by(role='freelancer').all()
 
-    status_counts = {
-        'all': Customer.query.count(),
-        '대기': Customer.query.filter_by(call_status='대기').count(),
-        '1차부재': Customer.query.filter_by(call_status='1차부재').count(),
-        '2차부재': Customer.query.filter_by(call_status='2차부재').count(),
-        '3차부재': Customer.query.filter_by(call_status='3차부재').count(),
-        '통화거부': Customer.query.filter_by(call_status='통화거부').count(),
-        '해피콜완료': Customer.query.filter_by(call_status='해피콜완료').count(),
-    }
+    status_counts = customer_status_counts()
 
     return render_template('admin_customers.html',
-                         customers=customers,
+                         customers=page.items,
+                         page=page,
                          freelancers=freelancers,
                          status_filter=status_filter,
                          status_counts=status_counts)
 
 
+@admin_bp.route('/admin/search')
+@login_required
+def search():
+    if current_user.role != 'admin':
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    from app.search import search_customers
+    q = request.args.get('q', '').strip()
+    page = search_customers(q, cursor=request.args.get('cursor'),
+                            per_page=current_app.config['ADMIN_PAGE_SIZE'])
+    return render_template('admin_search.html', q=q, customers=page.items, page=page)
+
+
 @admin_bp.route('/admin/customers/assign', methods=['POST'])
 @login_required
 def assign_customer():
@@ -234,9 +501,12 @@ def assign_customer():
         agent = User.query.get(int(agent_id))
         flash(f'{customer.name} → {agent.username} 배정 완료', 'success')
     else:
+        agent = None
         customer.assigned_agent_id = None
         flash(f'{customer.name} 배정 해제', 'info')
 
+    emit('customer.assigned', customer.id, agent_id=customer.assigned_agent_id,
+         agent=agent.username if agent else None)
     db.session.commit()
     return redirect(url_for('admin.manage_customers'))
 
@@ -251,18 +521,43 @@ def bulk_assign_customers():
     customer_ids = request.form.getlist('customer_ids')
     agent_id = request.form.get('bulk_agent_id', '').strip()
 
-    if not customer_ids:
+    ids = [int(cid) for cid in customer_ids if cid.isdigit()]
+    if not ids:
         flash('고객을 선택해주세요.', 'error')
         return redirect(url_for('admin.manage_customers'))
 
-    for cid in customer_ids:
-        customer = Customer.query.get(int(cid))
-        if customer:
-            customer.assigned_agent_id = int(agent_id) if agent_id else None
+    agent = None
+    if agent_id:
+        agent = User.query.get(int(agent_id))
+        if not agent or agent.role != 'freelancer':
+            flash('프리랜서 계정에만 배정할 수 있습니다.', 'error')
+            return redirect(url_for('admin.manage_customers'))
 
+    updated = assign_customers(ids, int(agent_id) if agent_id else None)
+    emit('customers.assigned', None, ids=ids[:BULK_EVENT_IDS], truncated=len(ids) > BULK_EVENT_IDS,
+         agent_id=agent.id if agent else None, agent=agent.username if agent else None)
     db.session.commit()
     action = '배정' if agent_id else '배정 해제'
-    flash(f'{len(customer_ids)}건 {action} 완료', 'success')
+    flash(f'{updated}건 {action} 완료', 'success')
+    return redirect(url_for('admin.manage_customers'))
+
+
+@admin_bp.route('/admin/customers/auto-distribute', methods=['POST'])
+@login_required
+def auto_distribute():
+    if current_user.role != 'admin':
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    assigned = auto_distribute_customers()
+    total = sum(assigned.values())
+    if total:
+        emit('customers.assigned', None, ids=[], truncated=True, count=total)
+        db.session.commit()
+    if not total:
+        flash('분배할 미배정 대기 고객이 없습니다.', 'info')
+    else:
+        flash(f'미배정 대기 고객 {total}건을 프리랜서 {len(assigned)}명에게 분배했습니다.', 'success')
     return redirect(url_for('admin.manage_customers'))
 
 
@@ -281,8 +576,27 @@ def create_customer():
         flash('고객명과 연락처를 모두 입력해주세요.', 'error')
         return redirect(url_for('admin.manage_customers'))
 
-    customer = Customer(name=name, phone=phone)
+    customer = Customer(name=name, phone=normalize_phone(phone) or phone, call_status='대기')
     db.session.add(customer)
+    record_customer(new=customer.call_status)
     db.session.commit()
     flash(f'고객 "{name}"이 추가되었습니다.', 'success')
     return redirect(url_for('admin.manage_customers'))
+
+
+@admin_bp.route('/admin/customers/import', methods=['POST'])
+@login_required
+def import_customers():
+    if current_user.role != 'admin':
+        flash('관리자만 접근 가능합니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    file = request.files.get('file')
+    if not file or not file.filename:
+        flash('등록할 파일을 선택해주세요.', 'error')
+        return redirect(url_for('admin.manage_customers'))
+
+    from app.imports import iter_customer_rows, import_customers as run_import
+    fmt = request.form.get('format', 'auto')
+    report = run_import(iter_customer_rows(file.stream, fmt))
+    return render_template('admin_import_result.html', report=report, filename=file.filename)
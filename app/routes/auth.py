@@ -1,6 +1,8 @@
 from flask import Blueprint, redirect, url_for, flash, request, render_template
 from flask_login import login_user, logout_user, login_required, current_user
-from app.extensions import login_manager
+from app.extensions import db, login_manager
+from app.identity import identity_cache
+from app.instrumentation import timing
 from app.models import User
 
 auth_bp = Blueprint('auth', __name__)
@@ -8,7 +10,7 @@ auth_bp = Blueprint('auth', __name__)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return identity_cache.load(int(user_id), lambda user_id: db.session.get(User, user_id))
 
 
 @auth_bp.route('/')
@@ -30,7 +32,10 @@ def login():
         password = request.form.get('password')
         user = User.query.filter_by(username=username).first()
 
-        if user and user.check_password(password):
+        with timing('password'):
+            valid = user is not None and user.check_password(password)
+
+        if valid:
             login_user(user)
             flash('로그인 성공!', 'success')
             return redirect(url_for('auth.index'))
@@ -1,10 +1,18 @@
-import os
-from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, make_response, current_app
 from flask_login import login_required, current_user
-from werkzeug.utils import secure_filename
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.archive import find_customer_submission
+from app.call_queue import claim_next_customer, next_call_time, queue_depth
 from app.extensions import db
-from app.models import Customer, Submission, Script
+from app.jobs import enqueue_submission_jobs, run_pending
+from app.rollups import refresh as refresh_rollups
+from app.models import Customer, Submission
+from app.counters import record_submission, record_customer
+from app.database import run_in_transaction
+from app.events import emit
+from app.recordings import store_recording
+from app.script_cache import active_script_version, get_active_script
 from app.services import allowed_file
 
 freelancer_bp = Blueprint('freelancer', __name__)
@@ -17,7 +25,23 @@ def freelancer_dashboard():
         return redirect(url_for('admin.admin_dashboard'))
 
     customers = Customer.query.filter_by(assigned_agent_id=current_user.id).all()
-    return render_template('freelancer_dashboard.html', customers=customers)
+    own_due, pool_due = queue_depth(current_user.id)
+    return render_template('freelancer_dashboard.html', customers=customers,
+                           own_due=own_due, pool_due=pool_due)
+
+
+@freelancer_bp.route('/queue/next', methods=['POST'])
+@login_required
+def next_call():
+    if current_user.role != 'freelancer':
+        flash('접근 권한이 없습니다.', 'error')
+        return redirect(url_for('auth.index'))
+
+    customer = claim_next_customer(current_user.id)
+    if customer is None:
+        flash('지금 통화할 고객이 없습니다.', 'info')
+        return redirect(url_for('freelancer.freelancer_dashboard'))
+    return redirect(url_for('freelancer.customer_detail', customer_id=customer.id))
 
 
 @freelancer_bp.route('/customer/<int:customer_id>')
@@ -32,9 +56,31 @@ def customer_detail(customer_id):
         flash('접근 권한이 없습니다.', 'error')
         return redirect(url_for('freelancer.freelancer_dashboard'))
 
-    existing_submission = Submission.query.filter_by(customer_id=customer_id).first()
-    active_script = Script.query.filter_by(is_active=True).first()
-    return render_template('customer_detail.html', customer=customer, submission=existing_submission, script=active_script)
+    existing_submission = find_customer_submission(customer_id)
+    script_version = None if existing_submission else active_script_version()
+    return render_template('customer_detail.html', customer=customer, submission=existing_submission,
+                           script_version=script_version)
+
+
+@freelancer_bp.route('/script/active')
+@login_required
+def active_script():
+    """활성 스크립트 HTML 조각. ?v= 가 현재 버전과 같으면 브라우저가 무기한 캐시한다."""
+    script = get_active_script()
+    if script is None:
+        return '', 404
+
+    response = make_response(script.content)
+    response.content_type = 'text/html; charset=utf-8'
+    response.set_etag(script.version)
+    if request.args.get('v') == script.version:
+        response.cache_control.private = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @freelancer_bp.route('/customer/<int:customer_id>/status', methods=['POST'])
@@ -56,8 +102,24 @@ def update_call_status(customer_id):
         flash('유효하지 않은 상태입니다.', 'error')
         return redirect(url_for('freelancer.customer_detail', customer_id=customer_id))
 
-    customer.call_status = new_status
-    db.session.commit()
+    def write():
+        # 읽은 상태일 때만 바꾼다: 동시에 바뀌었으면 0행이고 카운터도 건드리지 않는다
+        old_status = customer.call_status
+        changed = db.session.execute(
+            update(Customer)
+            .where(Customer.id == customer_id, Customer.call_status == old_status,
+                   Customer.assigned_agent_id == current_user.id)
+            .values(call_status=new_status, next_call_at=next_call_time(new_status))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if changed:
+            record_customer(old=old_status, new=new_status)
+            emit('customer.status', customer_id, counters=True, call_status=new_status)
+        return changed
+
+    if not run_in_transaction(write):
+        flash('다른 곳에서 상태가 먼저 변경되었습니다. 다시 확인해 주세요.', 'error')
+        return redirect(url_for('freelancer.customer_detail', customer_id=customer_id))
     flash(f'상태가 "{new_status}"로 변경되었습니다.', 'success')
     return redirect(url_for('freelancer.customer_detail', customer_id=customer_id))
 
@@ -74,7 +136,7 @@ def submit_checklist(customer_id):
         flash('접근 권한이 없습니다.', 'error')
         return redirect(url_for('freelancer.freelancer_dashboard'))
 
-    existing = Submission.query.filter_by(customer_id=customer_id).first()
+    existing = find_customer_submission(customer_id)
     if existing:
         flash('이미 제출된 건입니다.', 'warning')
         return redirect(url_for('freelancer.customer_detail', customer_id=customer_id))
@@ -83,9 +145,7 @@ def submit_checklist(customer_id):
     if 'recording' in request.files:
         file = request.files['recording']
         if file and file.filename and allowed_file(file.filename):
-            filename = secure_filename(f"{customer_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{file.filename}")
-            file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], filename))
-            recording_file = filename
+            recording_file = store_recording(file)
 
     if not recording_file:
         flash('녹취 파일을 업로드해주세요.', 'error')
@@ -115,33 +175,57 @@ def submit_checklist(customer_id):
     ])
     final_status = '정상' if all_normal else '비정상'
 
-    submission = Submission(
-        customer_id=customer_id,
-        agent_id=current_user.id,
-        recording_file=recording_file,
-        check_installment=check_installment,
-        check_penalty=check_penalty,
-        check_rate_plan=check_rate_plan,
-        check_retention=check_retention,
-        check_monthly_fee=check_monthly_fee,
-        check_used_phone=check_used_phone,
-        check_store_complaint=check_store_complaint,
-        memo_check_installment=memo_check_installment,
-        memo_check_penalty=memo_check_penalty,
-        memo_check_rate_plan=memo_check_rate_plan,
-        memo_check_retention=memo_check_retention,
-        memo_check_monthly_fee=memo_check_monthly_fee,
-        memo_check_used_phone=memo_check_used_phone,
-        store_complaint_memo=store_complaint_memo,
-        agent_opinion=agent_opinion,
-        raw_customer_data=raw_customer_data,
-        final_status=final_status,
-        admin_status='대기중'
-    )
-
-    db.session.add(submission)
-    customer.call_status = '해피콜완료'
-    db.session.commit()
+    def write():
+        submission = Submission(
+            customer_id=customer_id,
+            agent_id=current_user.id,
+            recording_file=recording_file,
+            check_installment=check_installment,
+            check_penalty=check_penalty,
+            check_rate_plan=check_rate_plan,
+            check_retention=check_retention,
+            check_monthly_fee=check_monthly_fee,
+            check_used_phone=check_used_phone,
+            check_store_complaint=check_store_complaint,
+            memo_check_installment=memo_check_installment,
+            memo_check_penalty=memo_check_penalty,
+            memo_check_rate_plan=memo_check_rate_plan,
+            memo_check_retention=memo_check_retention,
+            memo_check_monthly_fee=memo_check_monthly_fee,
+            memo_check_used_phone=memo_check_used_phone,
+            store_complaint_memo=store_complaint_memo,
+            agent_opinion=agent_opinion,
+            raw_customer_data=raw_customer_data,
+            final_status=final_status,
+            admin_status='대기중'
+        )
+
+        db.session.add(submission)
+        enqueue_submission_jobs(submission)
+        record_submission(new=(final_status, '대기중'))
+        record_customer(old=customer.call_status, new='해피콜완료')
+        customer.call_status = '해피콜완료'
+        customer.next_call_at = None
+        db.session.flush()
+        emit('submission.created', submission.id, counters=True,
+             customer_name=customer.name, customer_phone=customer.phone,
+             final_status=final_status, admin_status='대기중',
+             created_at=submission.created_at.strftime('%Y-%m-%d %H:%M'))
+        emit('customer.status', customer.id, counters=True, call_status='해피콜완료')
+        return submission
+
+    try:
+        submission = run_in_transaction(write)
+    except IntegrityError:
+        # 동시 제출: uq_submissions_customer_id 가 두 번째 건을 거부
+        db.session.rollback()
+        flash('이미 제출된 건입니다.', 'warning')
+        return redirect(url_for('freelancer.customer_detail', customer_id=customer_id))
+
+    if current_app.config['JOBS_EAGER']:
+        # 워커가 없으므로 작업과 QC 집계 반영을 여기서 바로 한다
+        run_pending(submission_id=submission.id)
+        refresh_rollups()
 
     flash(f'체크리스트가 제출되었습니다. 결과: {final_status}', 'success')
     return redirect(url_for('freelancer.freelancer_dashboard'))
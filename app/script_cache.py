@@ -0,0 +1,60 @@
+"""활성 스크립트 캐시.
+
+스크립트 본문은 프로세스 메모리에 (id, updated_at) 버전과 함께 보관한다. 매 조회마다
+본문 없이 버전 컬럼만 읽어 비교하므로, 다른 워커에서 save_script 가 updated_at 을
+갱신해도 다음 요청에서 바로 새 본문을 읽는다.
+"""
+import threading
+from app.extensions import db
+from app.models import Script
+
+_lock = threading.Lock()
+_cached = None
+
+
+class CachedScript:
+    def __init__(self, script):
+        self.id = script.id
+        self.title = script.title
+        self.content = script.content
+        self.updated_at = script.updated_at
+        self.version = script_version_tag(script.id, script.updated_at)
+
+
+def script_version_tag(script_id, updated_at):
+    stamp = updated_at.strftime('%Y%m%d%H%M%S%f') if updated_at else '0'
+    return f'{script_id}-{stamp}'
+
+
+def active_script_version():
+    """활성 스크립트의 버전 태그. 없으면 None."""
+    row = (db.session.query(Script.id, Script.updated_at)
+           .filter_by(is_active=True).order_by(Script.id).first())
+    if row is None:
+        return None
+    return script_version_tag(row.id, row.updated_at)
+
+
+def get_active_script():
+    global _cached
+    version = active_script_version()
+    if version is None:
+        return None
+
+    cached = _cached
+    if cached is not None and cached.version == version:
+        return cached
+
+    with _lock:
+        if _cached is None or _cached.version != version:
+            script = (Script.query.filter_by(is_active=True).order_by(Script.id).first())
+            if script is None:
+                return None
+            _cached = CachedScript(script)
+        return _cached
+
+
+def invalidate_active_script():
+    global _cached
+    with _lock:
+        _cached = None
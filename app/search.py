@@ -0,0 +1,116 @@
+"""고객·제출 메모 검색.
+
+- 숫자만 입력하면 전화번호 끝자리 검색: customers.phone_rev(숫자를 뒤집은 값)의
+  접두사 범위 조건이므로 ix_customers_phone_rev 인덱스 탐색 한 번이다.
+- 그 외에는 SQLite FTS5 색인(customers_fts: 이름/연락처, submissions_fts: 메모/의견)을
+  단어 접두사로 검색한다. 색인은 트리거로 원본 테이블과 함께 갱신된다.
+- SQLite 가 아닌 DB 에서는 LIKE 로 대신한다.
+
+결과는 고객 id 내림차순이며, 직전 페이지 마지막 id 를 커서로 받는 키셋 방식이다.
+"""
+import re
+from sqlalchemy import or_, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.models import Customer, Submission, User, reversed_digits
+from app.pagination import KeysetPage
+
+MIN_PHONE_DIGITS = 3
+SUBMISSION_TEXT_COLUMNS = [
+    'memo_check_installment', 'memo_check_penalty', 'memo_check_rate_plan', 'memo_check_retention',
+    'memo_check_monthly_fee', 'memo_check_used_phone', 'store_complaint_memo', 'agent_opinion',
+]
+
+
+def is_phone_query(q):
+    digits = re.sub(r'[\s-]', '', q)
+    return digits.isdigit() and len(digits) >= MIN_PHONE_DIGITS
+
+
+def _prefix_range(column, prefix):
+    """column LIKE 'prefix%' 와 같은 결과를 인덱스 범위 조건으로."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return column >= prefix, column < upper
+
+
+def fts_query(q):
+    """사용자 입력을 FTS5 MATCH 식으로: 각 단어를 따옴표로 감싸 접두사 검색 후 AND."""
+    terms = [t.replace('"', '""') for t in q.split() if t.strip('"')]
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+def _phone_ids(q, before, limit):
+    query = (db.select(Customer.id)
+             .where(*_prefix_range(Customer.phone_rev, reversed_digits(q)))
+             .order_by(Customer.id.desc()).limit(limit))
+    if before:
+        query = query.where(Customer.id < before)
+    return db.session.scalars(query).all()
+
+
+def _fts_ids(q, before, limit):
+    match = fts_query(q)
+    if not match:
+        return []
+    params = {'match': match, 'before': before or 2 ** 62, 'limit': limit}
+    try:
+        customers = db.session.execute(text(
+            'SELECT rowid FROM customers_fts WHERE customers_fts MATCH :match AND rowid < :before '
+            'ORDER BY rowid DESC LIMIT :limit'
+        ), params).scalars().all()
+        from_submissions = db.session.execute(text(
+            'SELECT s.customer_id FROM submissions_fts f JOIN submissions s ON s.id = f.rowid '
+            'WHERE submissions_fts MATCH :match AND s.customer_id < :before '
+            'ORDER BY s.customer_id DESC LIMIT :limit'
+        ), params).scalars().all()
+    except OperationalError:
+        # 색인할 수 없는 입력 (기호만 있는 단어 등)
+        db.session.rollback()
+        return []
+    return sorted(set(customers) | set(from_submissions), reverse=True)[:limit]
+
+
+def _like_ids(q, before, limit):
+    pattern = f'%{q}%'
+    memo_match = db.select(Submission.customer_id).where(or_(
+        *[getattr(Submission, c).ilike(pattern) for c in SUBMISSION_TEXT_COLUMNS]))
+    query = (db.select(Customer.id)
+             .where(or_(Customer.name.ilike(pattern), Customer.phone.like(pattern),
+                        Customer.id.in_(memo_match)))
+             .order_by(Customer.id.desc()).limit(limit))
+    if before:
+        query = query.where(Customer.id < before)
+    return db.session.scalars(query).all()
+
+
+def search_customers(q, cursor=None, per_page=50):
+    """q 에 맞는 고객 페이지. items 는 배정 상담원과 제출 건을 함께 읽은 Customer 목록."""
+    q = (q or '').strip()
+    if not q:
+        return KeysetPage([], None, None)
+    before = int(cursor) if cursor and str(cursor).isdigit() else None
+
+    if is_phone_query(q):
+        ids = _phone_ids(re.sub(r'\D', '', q), before, per_page + 1)
+    elif db.engine.dialect.name == 'sqlite':
+        ids = _fts_ids(q, before, per_page + 1)
+    else:
+        ids = _like_ids(q, before, per_page + 1)
+
+    next_cursor = None
+    if len(ids) > per_page:
+        ids = ids[:per_page]
+        next_cursor = str(ids[-1])
+
+    customers = []
+    if ids:
+        customers = (Customer.query
+                     .options(joinedload(Customer.assigned_agent).load_only(User.id, User.username),
+                              joinedload(Customer.submissions).load_only(
+                                  Submission.id, Submission.customer_id, Submission.final_status,
+                                  Submission.admin_status, Submission.agent_opinion))
+                     .filter(Customer.id.in_(ids))
+                     .order_by(Customer.id.desc())
+                     .all())
+    return KeysetPage(customers, str(before) if before else None, next_cursor)
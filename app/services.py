@@ -1,7 +1,16 @@
+import heapq
+import re
+from concurrent.futures import ProcessPoolExecutor
 from flask import current_app
+from sqlalchemy import func, insert, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from werkzeug.security import generate_password_hash
 from app.extensions import db
-from app.models import User, Script
+from app.models import User, Customer, Script, Submission, SubmissionDetail, StatCounter
+
+# 아직 통화가 끝나지 않아 담당자 업무량으로 치는 콜 상태
+OPEN_CALL_STATUSES = ('대기', '1차부재', '2차부재', '3차부재')
+ASSIGN_CHUNK_SIZE = 500
 
 
 def allowed_file(filename):
@@ -9,122 +18,245 @@ def allowed_file(filename):
         filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
-DEFAULT_SCRIPT_HTML = """<!-- 인사말 -->
-<div class="bg-brand-50 rounded-lg px-4 py-3 border border-brand-100">
-    <p class="font-semibold text-brand-600 text-xs uppercase tracking-wider mb-2">개통 해피콜</p>
-    <p class="font-medium text-brand-700">"안녕하세요 고객님, 휴대폰 가입을 도와드린 LG유플러스 포피플 대리점입니다. 개통 이후 계약 내용이 정확하게 안내되었는지 확인드리기 위해 연락드렸는데 시간은 2~3분 정도 소요됩니다. 시간 괜찮으실까요?"</p>
-</div>
-
-<!-- YES/NO 분기 -->
-<div class="flex gap-2 text-xs">
-    <span class="inline-flex items-center gap-1 bg-emerald-100 text-emerald-700 px-2.5 py-1 rounded-full font-semibold">
-        <i class="fas fa-check text-[10px]"></i> YES
-    </span>
-    <span class="text-gray-500 leading-relaxed">아래 스크립트로 진행</span>
-</div>
-<div class="flex gap-2 text-xs">
-    <span class="inline-flex items-center gap-1 bg-red-100 text-red-700 px-2.5 py-1 rounded-full font-semibold">
-        <i class="fas fa-xmark text-[10px]"></i> NO
-    </span>
-    <span class="text-gray-500 leading-relaxed">"통화가능 하신 시간이 있다면 편하신 시간에 연락 드리겠습니다"</span>
-</div>
-
-<div class="border-t border-blue-100"></div>
-
-<!-- STEP 1: 단말기/약정 -->
-<div class="bg-white rounded-xl p-4 border border-surface-200">
-    <div class="flex items-center gap-2 mb-3">
-        <span class="w-6 h-6 rounded-md bg-brand-500 text-white text-xs font-bold flex items-center justify-center">1</span>
-        <span class="font-semibold text-gray-800 text-sm">단말기 / 약정 확인</span>
-    </div>
-    <div class="space-y-2 text-gray-600 text-[13px] leading-relaxed">
-        <p>"구입하신 단말기는 [단말기명]로 할부 [할부원금], [할부기간]로 개통되었습니다. 개통 당시 설명을 들으셨나요?"</p>
-        <p>"약정은 [약정기간]로, 약정 기간 내 해지나 번호이동, 기기변경 시 위약금이 발생할 수 있다는 점도 안내 받으셨을까요?"</p>
-    </div>
-    <div class="mt-3 pt-3 border-t border-surface-100 flex flex-col gap-1.5 text-xs">
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-emerald-100 text-emerald-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-check text-[9px]"></i> YES
-            </span>
-            <span class="text-gray-500">아래 스크립트로 진행</span>
-        </div>
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-red-100 text-red-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-xmark text-[9px]"></i> NO
-            </span>
-            <span class="text-gray-500">(이상 응답건 메모) "정확한 내용 재안내를 위해 담당자에게 전달하겠습니다"</span>
-        </div>
-    </div>
-</div>
-
-<!-- STEP 2: 요금제/부가서비스 -->
-<div class="bg-white rounded-xl p-4 border border-surface-200">
-    <div class="flex items-center gap-2 mb-3">
-        <span class="w-6 h-6 rounded-md bg-brand-500 text-white text-xs font-bold flex items-center justify-center">2</span>
-        <span class="font-semibold text-gray-800 text-sm">요금제 / 부가서비스 확인</span>
-    </div>
-    <div class="space-y-2 text-gray-600 text-[13px] leading-relaxed">
-        <p>"개통당시 가입하신 요금제는 [요금제명], 기본료는 [요금제기본료]입니다. 부가서비스는 [부가서비스1]와 [부가서비스2]가 등록되어있는데 정확히 안내 받으셨을까요?"</p>
-        <p>"요금제는 [요금제유지일수] 유지 후 변경 가능하며, 부가서비스는 [부가서비스유지일수] 후 언제든지 삭제 가능합니다. 의무 유지기간이 있다는 점에 대해서도 안내받으셨을까요?"</p>
-        <p>"매월 청구되는 요금은 [청구기간]동안 [청구예상금액], 이후 요금제 변경 시 [변경후청구금액] 청구되며 단말기 할부금이 포함된 요금으로 안내 받으신 내용과 다른 부분 있는지 확인 부탁드립니다."</p>
-        <p>"요금제 변경, 부가서비스 삭제는 자동으로 변경/삭제 되지 않으니 해당기간 이후 고객님께서 직접 내방 또는 전화주시면 변경 가능합니다."</p>
-    </div>
-    <div class="mt-3 pt-3 border-t border-surface-100 flex flex-col gap-1.5 text-xs">
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-emerald-100 text-emerald-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-check text-[9px]"></i> YES
-            </span>
-            <span class="text-gray-500">아래 스크립트로 진행</span>
-        </div>
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-red-100 text-red-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-xmark text-[9px]"></i> NO
-            </span>
-            <span class="text-gray-500">(이상 응답건 메모) "정확한 내용 재안내를 위해 담당자에게 전달하겠습니다"</span>
-        </div>
-    </div>
-</div>
-
-<!-- STEP 3: 중고폰/추가확인 -->
-<div class="bg-white rounded-xl p-4 border border-surface-200">
-    <div class="flex items-center gap-2 mb-3">
-        <span class="w-6 h-6 rounded-md bg-brand-500 text-white text-xs font-bold flex items-center justify-center">3</span>
-        <span class="font-semibold text-gray-800 text-sm">중고폰 반납 / 추가 확인</span>
-    </div>
-    <div class="space-y-2 text-gray-600 text-[13px] leading-relaxed">
-        <p>"중고폰 반납이 진행된 경우, 중고폰 반납 여부와 반납 후 처리 방식에 대해 안내를 받으셨는지 확인드리겠습니다." <span class="text-gray-400 text-xs">(중고폰 반납이 없는 경우 해당 없다고 말씀 주셔도 됩니다.)</span></p>
-        <p>"개통 당시 기존 단말기 할부금은 [기존할부잔여기간], [기존할부금] 남아있었고 위약금도 [위약금] 발생되는 부분 안내 받으셨나요? 잔여할부 or 위약금은 [처리방법]로 정확히 안내 받으셨는지 확인 부탁드립니다."</p>
-        <p>"추가로 고객님께 약속 드린 사항에 대해 이행되지 않은 부분이 있을까요?"</p>
-    </div>
-    <div class="mt-3 pt-3 border-t border-surface-100 flex flex-col gap-1.5 text-xs">
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-emerald-100 text-emerald-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-check text-[9px]"></i> YES
-            </span>
-            <span class="text-gray-500">아래 마무리 멘트로 진행</span>
-        </div>
-        <div class="flex gap-2">
-            <span class="inline-flex items-center gap-1 bg-red-100 text-red-700 px-2 py-0.5 rounded-full font-semibold flex-shrink-0">
-                <i class="fas fa-xmark text-[9px]"></i> NO
-            </span>
-            <span class="text-gray-500">(이상 응답건 메모) "정확한 내용 재안내를 위해 담당자에게 전달하겠습니다"</span>
-        </div>
-    </div>
-</div>
-
-<div class="border-t border-blue-100"></div>
-
-<!-- 마무리 -->
-<div class="bg-brand-50 rounded-lg px-4 py-3 border border-brand-100 space-y-2">
-    <p class="font-semibold text-brand-600 text-xs uppercase tracking-wider">마무리</p>
-    <p class="font-medium text-brand-700 text-[13px] leading-relaxed">"지금까지 확인드린 내용 중에서 안내받은 내용과 다르거나 확인이 필요한 건으로 담당자에게 전달하여 빠르게 재확인 할 수 있도록 하겠습니다. 추가로 궁금하신 점이나 불편하셨던 사항이 있을까요?"</p>
-    <p class="font-medium text-brand-700 text-[13px] leading-relaxed">"오늘 확인된 내용은 기록하여 관리될 예정이며, 추가 안내가 필요한 경우 개통 도와드린 담당자가 다시 연락드리겠습니다. 감사합니다."</p>
-</div>"""
+def normalize_phone(raw):
+    """전화번호를 010-1234-5678 형태로 정규화. 형식이 맞지 않으면 None."""
+    digits = re.sub(r'\D', '', raw or '')
+    if digits.startswith('82'):
+        digits = '0' + digits[2:]
+    if not digits.startswith('0') or len(digits) not in (10, 11):
+        return None
+    if digits.startswith('02'):
+        return f'{digits[:2]}-{digits[2:-4]}-{digits[-4:]}'
+    return f'{digits[:3]}-{digits[3:-4]}-{digits[-4:]}'
+
+
+def assign_customers(customer_ids, agent_id, only_unassigned=False):
+    """고객 배정을 청크 단위 UPDATE로 처리하고 변경된 행 수를 돌려준다."""
+    updated = 0
+    for start in range(0, len(customer_ids), ASSIGN_CHUNK_SIZE):
+        query = Customer.query.filter(Customer.id.in_(customer_ids[start:start + ASSIGN_CHUNK_SIZE]))
+        if only_unassigned:
+            query = query.filter(Customer.assigned_agent_id.is_(None))
+        updated += query.update({'assigned_agent_id': agent_id}, synchronize_session=False)
+    return updated
+
+
+def auto_distribute_customers():
+    """미배정 '대기' 고객을 현재 업무량이 적은 프리랜서부터 채워 나눠준다.
+
+    업무량은 OPEN_CALL_STATUSES 상태의 배정 고객 수이며 GROUP BY 한 번으로 구한다.
+    반환값은 {agent_id: 새로 배정된 수}.
+    """
+    freelancer_ids = [row.id for row in db.session.query(User.id).filter_by(role='freelancer')]
+    if not freelancer_ids:
+        return {}
+
+    workload = dict(
+        db.session.query(Customer.assigned_agent_id, func.count(Customer.id))
+        .filter(Customer.assigned_agent_id.in_(freelancer_ids),
+                Customer.call_status.in_(OPEN_CALL_STATUSES))
+        .group_by(Customer.assigned_agent_id)
+    )
+    pool = db.session.scalars(
+        db.select(Customer.id)
+        .where(Customer.assigned_agent_id.is_(None), Customer.call_status == '대기')
+        .order_by(Customer.created_at, Customer.id)
+    ).all()
+
+    heap = [(workload.get(agent_id, 0), agent_id) for agent_id in freelancer_ids]
+    heapq.heapify(heap)
+    plan = {agent_id: [] for agent_id in freelancer_ids}
+    for customer_id in pool:
+        load, agent_id = heapq.heappop(heap)
+        plan[agent_id].append(customer_id)
+        heapq.heappush(heap, (load + 1, agent_id))
+
+    assigned = {}
+    for agent_id, customer_ids in plan.items():
+        if customer_ids:
+            assigned[agent_id] = assign_customers(customer_ids, agent_id, only_unassigned=True)
+    db.session.commit()
+    return assigned
+
+
+def _value_after(cells, label):
+    value = None
+    for i, cell in enumerate(cells):
+        if cell == label:
+            value = cells[i + 1] if i + 1 < len(cells) else ''
+    return value
+
+
+def parse_raw_customer_data(text):
+    """대리점 개통 데이터(탭 구분) 파싱. customer_detail.html 의 parseRawData 와 같은 규칙."""
+    data = {}
+
+    def set_after(key, cells, label, transform=None):
+        value = _value_after(cells, label)
+        if value is not None:
+            data[key] = transform(value) if transform else value
+
+    for line in (text or '').split('\n'):
+        cells = [c.strip() for c in line.split('\t')]
+        head = cells[0]
+        first = cells[1] if len(cells) > 1 else ''
+        strip_months = lambda v: v.replace('개월', '')
+
+        if head == '매장명':
+            data['store_name'] = first
+            set_after('agent_name', cells, '담당자')
+            set_after('agent_phone', cells, '직원연락처')
+        if head == '개통단말기':
+            data['device'] = first
+        if head == '할부원금':
+            data['installment_price'] = first or '0'
+            set_after('installment_months', cells, '할부기간', strip_months)
+            set_after('installment_rate', cells, '할부이자')
+        if head == '월 청구 할부금':
+            data['monthly_installment'] = first or '0'
+        if '약정정보' in head:
+            for i, cell in enumerate(cells):
+                if cell in ('기간 :', '기간'):
+                    data['contract_months'] = cells[i + 1] if i + 1 < len(cells) else ''
+        if head == '개통요금제':
+            data['plan_name'] = first
+            set_after('monthly_bill', cells, '청구예상')
+        if head == '1차변경요금제':
+            data['plan2_name'] = first or '0'
+            set_after('plan2_date', cells, '변경일')
+            set_after('monthly_bill_after', cells, '청구예상')
+        if head == '부가서비스1':
+            data['addon1'] = first or '없음'
+        if head == '부가서비스2':
+            data['addon2'] = first or '없음'
+        if head == '보험':
+            data['insurance'] = first or '없음'
+        if '부가서비스&보험' in head:
+            match = re.search(r'유지기간\s*(\d+)일', head)
+            if match:
+                data['addon_keep_days'] = match.group(1)
+        if '개통유지기간' in head:
+            new_match = re.search(r'신규\((\d+)일\)', head)
+            change_match = re.search(r'기기변경/번호이동\((\d+)일\)', head)
+            if new_match:
+                data['new_keep_days'] = new_match.group(1)
+            if change_match:
+                data['change_keep_days'] = change_match.group(1)
+        if head == '중고폰반납':
+            data['used_phone_return'] = first
+            set_after('used_phone_model', cells, '반납모델')
+            set_after('used_phone_amount', cells, '처리예상금액')
+            set_after('used_phone_method', cells, '중고폰 처리방법')
+        if head == '▶기존할부금1':
+            data['old_installment_price'] = first or '0'
+            set_after('old_installment_months', cells, '잔여개월', strip_months)
+            set_after('old_payment_method', cells, '처리방법')
+        if head == '▶위약금':
+            data['penalty'] = first or '없음'
+            set_after('penalty_amount', cells, '금액', lambda v: v or '0')
+        if head == '결합할인':
+            data['bundle_discount'] = first
+            set_after('bundle_amount', cells, '할인금액')
+    return data
+
+
+def parse_submission_detail(text):
+    """parse_raw_customer_data 결과를 SubmissionDetail 컬럼 타입에 맞춰 변환한다."""
+    parsed = parse_raw_customer_data(text)
+    fields = {}
+    for column in SubmissionDetail.__table__.columns:
+        value = parsed.get(column.key)
+        if value is None:
+            continue
+        if isinstance(column.type, db.Integer):
+            digits = re.sub(r'[^0-9]', '', value)
+            fields[column.key] = int(digits) if digits else None
+        else:
+            fields[column.key] = value[:column.type.length] if column.type.length else value
+    return fields
+
+
+def backfill_submission_details(batch_size=500, workers=None, pool_threshold=5000):
+    """상세 정보가 없는 기존 제출 건을 id 순 배치로 파싱해 채운다.
+
+    남은 건수가 pool_threshold 이상이면 파싱을 프로세스 풀에 나눠 맡긴다.
+    """
+    missing = (Submission.query.with_entities(Submission.id, Submission.raw_customer_data)
+               .outerjoin(SubmissionDetail)
+               .filter(SubmissionDetail.submission_id.is_(None)))
+    pending = missing.with_entities(func.count(Submission.id)).scalar()
+    executor = ProcessPoolExecutor(max_workers=workers) if pending >= pool_threshold else None
+
+    last_id = 0
+    done = 0
+    try:
+        while True:
+            rows = missing.filter(Submission.id > last_id).order_by(Submission.id).limit(batch_size).all()
+            if not rows:
+                break
+            texts = [row.raw_customer_data or '' for row in rows]
+            if executor:
+                parsed = executor.map(parse_submission_detail, texts, chunksize=max(1, len(texts) // 16))
+            else:
+                parsed = map(parse_submission_detail, texts)
+            db.session.execute(insert(SubmissionDetail), [
+                dict(fields, submission_id=row.id) for row, fields in zip(rows, parsed)
+            ])
+            db.session.commit()
+            last_id = rows[-1].id
+            done += len(rows)
+    finally:
+        if executor:
+            executor.shutdown()
+    return done
+
+
+def filter_submissions(query, filter_type, model=Submission):
+    """model 은 Submission 또는 ArchivedSubmission."""
+    if filter_type == 'abnormal':
+        query = query.filter(model.final_status == '비정상')
+    elif filter_type == 'pending':
+        query = query.filter(model.admin_status == '대기중')
+    elif filter_type == 'resolved':
+        query = query.filter(model.admin_status == '처리완료')
+    return query
+
+
+def schema_version():
+    """적용된 최신 마이그레이션 버전. 테이블이 아직 없으면 0."""
+    try:
+        with db.engine.connect() as conn:
+            return conn.execute(text('SELECT MAX(version) FROM schema_migrations')).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0
+
+
+def bootstrap_db(seed=False):
+    """스키마가 최신이면 조회 한 번으로 끝내고, 아니면 init_db (+ seed_db) 를 실행한다."""
+    from app.migrations import latest_version
+    if schema_version() >= latest_version():
+        return False
+    init_db()
+    if seed:
+        seed_db()
+    return True
 
 
 def init_db():
     db.create_all()
 
+    from app.migrations import run_migrations
+    run_migrations()
+
+    if not StatCounter.query.first():
+        from app.counters import reconcile
+        reconcile()
+
+
+def seed_db():
+    """테스트 계정과 기본 스크립트를 없을 때만 만든다."""
+    from app.default_script import DEFAULT_SCRIPT_HTML
+
     admin_user = current_app.config['TEST_ADMIN_USERNAME']
     admin_pass = current_app.config['TEST_ADMIN_PASSWORD']
     freelancer_user = current_app.config['TEST_FREELANCER_USERNAME']
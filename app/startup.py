@@ -0,0 +1,104 @@
+"""콜드 스타트 시간 측정.
+
+create_app 의 단계별 소요 시간을 app.extensions['startup_timings'] 에 남기고,
+`python -m app.startup` (또는 flask startup-report) 는 새 인터프리터를 띄워
+인터프리터 기동 → import app → create_app → 첫 응답까지를 재서 출력한다.
+측정하는 프로세스는 이미 app 패키지와 Flask 를 import 했으므로 같은 프로세스에서
+재면 import 비용이 0 에 가깝게 나온다. --imports 를 주면 -X importtime 으로
+가장 오래 걸린 모듈도 보여준다.
+"""
+import json
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# 새 인터프리터에서 실행한다. 마지막 줄에 JSON 으로 결과를 남긴다.
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+app.test_client().get('/login')
+served = time.perf_counter()
+print(json.dumps({
+    'phases': [['import app', imported - started], ['create_app', created - imported],
+               ['first request', served - created]],
+    'create_app': app.extensions['startup_timings'].phases,
+}))
+"""
+
+
+class StartupTimer:
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    @property
+    def total(self):
+        return sum(seconds for _, seconds in self.phases)
+
+    def format(self):
+        lines = [f'{name:<20}{seconds * 1000:9.1f} ms' for name, seconds in self.phases]
+        lines.append(f'{"total":<20}{self.total * 1000:9.1f} ms')
+        return '\n'.join(lines)
+
+
+def _slowest_imports(stderr, limit):
+    """-X importtime 출력에서 누적 시간이 큰 모듈."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|', 2))
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def measure(importtime=False):
+    """새 인터프리터에서 콜드 스타트를 재서 (StartupTimer, create_app 단계, 느린 import) 를 돌려준다."""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', PROBE]
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    timer = StartupTimer()
+    in_process = sum(seconds for _, seconds in report['phases'])
+    timer.phases.append(('interpreter', max(wall - in_process, 0.0)))
+    timer.phases.extend((name, seconds) for name, seconds in report['phases'])
+    phases = StartupTimer()
+    phases.phases.extend((name, seconds) for name, seconds in report['create_app'])
+    imports = _slowest_imports(result.stderr, 15) if importtime else []
+    return timer, phases, imports
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    timer, phases, imports = measure(importtime='--imports' in argv)
+
+    print(timer.format())
+    print()
+    print('create_app phases:')
+    print(phases.format())
+    if imports:
+        print()
+        print('slowest imports (cumulative):')
+        for microseconds, name in imports:
+            print(f'{name:<40}{microseconds / 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
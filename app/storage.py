@@ -0,0 +1,223 @@
+"""녹취 저장소 드라이버.
+
+RECORDING_STORAGE 로 고른다.
+
+- local: UPLOAD_FOLDER 아래 파일. 재생은 Flask 가 send_file 로 보낸다 (Range/조건부 요청).
+- s3: S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등). boto3 가 필요하다 (선택 의존성).
+  업로드는 S3_MULTIPART_CHUNK_MB 단위 멀티파트로 스트리밍하고, 같은 키가 이미 있으면
+  건너뛴다 (키가 내용 해시). 클라이언트는 앱당 하나를 스레드 간에 공유하며 연결 풀은
+  S3_MAX_POOL_CONNECTIONS 개다. 재생은 S3_PRESIGN_EXPIRES 초 동안 유효한 presigned URL 로
+  리다이렉트하므로 녹취 바이트가 워커를 거치지 않는다. S3_ENDPOINT_URL 을 주면 MinIO 같은
+  호환 서버를 path-style 주소로 쓴다.
+
+키는 'ab/cd/<sha256>.<ext>' 같은 상대 경로다. 보관 묶음 파일은 'archive/' 아래에 둔다.
+"""
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from flask import current_app
+from werkzeug.security import safe_join
+
+
+class LocalStorage:
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+        self.temp_dir = os.path.join(root, 'tmp')  # 같은 파일시스템이라 put_file 이 rename 으로 끝난다
+
+    def local_path(self, key):
+        """키의 실제 경로. 루트 밖을 가리키거나 없으면 None."""
+        path = safe_join(self.root, key) if key else None
+        return path if path is not None and os.path.isfile(path) else None
+
+    def put_file(self, key, path):
+        """로컬 임시 파일 path 를 key 로 옮긴다 (이미 있으면 임시 파일만 지운다)."""
+        dest = safe_join(self.root, key)
+        if dest is None:
+            raise ValueError(f'invalid storage key: {key}')
+        if os.path.exists(dest):
+            os.remove(path)
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(path, dest)
+
+    def exists(self, key):
+        return self.local_path(key) is not None
+
+    def size(self, key):
+        return os.path.getsize(self.local_path(key))
+
+    def open(self, key):
+        path = self.local_path(key)
+        if path is None:
+            raise FileNotFoundError(key)
+        return open(path, 'rb')
+
+    def read_range(self, key, offset, length):
+        with self.open(key) as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def delete(self, key):
+        path = self.local_path(key)
+        if path is not None:
+            os.remove(path)
+
+    def presigned_url(self, key, download_name=None, mimetype=None):
+        return None  # 로컬 파일은 Flask 가 직접 보낸다
+
+    @contextmanager
+    def local_copy(self, key):
+        path = self.local_path(key)
+        if path is None:
+            raise FileNotFoundError(key)
+        yield path
+
+
+class S3Storage:
+    name = 's3'
+    temp_dir = None  # 시스템 임시 디렉터리
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, access_key_id=None,
+                 secret_access_key=None, presign_expires=300, multipart_chunk_mb=8,
+                 max_pool_connections=10, addressing_style=None):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config as BotoConfig
+        except ImportError as exc:  # 선택 의존성
+            raise RuntimeError('RECORDING_STORAGE=s3 를 쓰려면 boto3 를 설치하세요 (pip install boto3)') from exc
+        if not bucket:
+            raise RuntimeError('RECORDING_STORAGE=s3 에는 S3_BUCKET 이 필요합니다')
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix and prefix.strip('/') else ''
+        self.presign_expires = presign_expires
+        chunk = multipart_chunk_mb * 1024 * 1024
+        self.transfer = TransferConfig(multipart_threshold=chunk, multipart_chunksize=chunk,
+                                       max_concurrency=4, use_threads=True)
+        self.client = boto3.session.Session().client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            config=BotoConfig(
+                max_pool_connections=max_pool_connections,
+                retries={'max_attempts': 3, 'mode': 'standard'},
+                connect_timeout=5,
+                read_timeout=30,
+                signature_version='s3v4',
+                s3={'addressing_style': addressing_style or ('path' if endpoint_url else 'auto')},
+            ),
+        )
+
+    def _key(self, key):
+        return self.prefix + key
+
+    @staticmethod
+    def _not_found(exc):
+        return exc.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+    def local_path(self, key):
+        return None
+
+    def _head(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as exc:
+            if self._not_found(exc):
+                return None
+            raise
+
+    def put_file(self, key, path):
+        """로컬 임시 파일 path 를 멀티파트로 올리고 지운다 (같은 키가 있으면 올리지 않는다)."""
+        try:
+            if self._head(key) is None:
+                self.client.upload_file(path, self.bucket, self._key(key), Config=self.transfer)
+        finally:
+            os.remove(path)
+
+    def exists(self, key):
+        return bool(key) and self._head(key) is not None
+
+    def size(self, key):
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head['ContentLength']
+
+    def open(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))['Body']
+        except ClientError as exc:
+            if self._not_found(exc):
+                raise FileNotFoundError(key) from exc
+            raise
+
+    def read_range(self, key, offset, length):
+        from botocore.exceptions import ClientError
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key),
+                                              Range=f'bytes={offset}-{offset + length - 1}')
+        except ClientError as exc:
+            if self._not_found(exc):
+                raise FileNotFoundError(key) from exc
+            raise
+        with response['Body'] as body:
+            return body.read()
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def presigned_url(self, key, download_name=None, mimetype=None):
+        params = {'Bucket': self.bucket, 'Key': self._key(key)}
+        if download_name:
+            params['ResponseContentDisposition'] = f'inline; filename="{download_name}"'
+        if mimetype:
+            params['ResponseContentType'] = mimetype
+        return self.client.generate_presigned_url('get_object', Params=params, ExpiresIn=self.presign_expires)
+
+    @contextmanager
+    def local_copy(self, key):
+        """파일 경로가 필요한 처리(wav 헤더, mutagen)를 위해 임시 파일로 내려받는다."""
+        suffix = os.path.splitext(key)[1]
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as out, self.open(key) as body:
+                shutil.copyfileobj(body, out, 1024 * 1024)
+            yield path
+        finally:
+            os.remove(path)
+
+
+def create_storage(config):
+    backend = config.get('RECORDING_STORAGE', 'local')
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 's3':
+        return S3Storage(
+            bucket=config.get('S3_BUCKET'),
+            prefix=config.get('S3_PREFIX', ''),
+            endpoint_url=config.get('S3_ENDPOINT_URL'),
+            region=config.get('S3_REGION'),
+            access_key_id=config.get('S3_ACCESS_KEY_ID'),
+            secret_access_key=config.get('S3_SECRET_ACCESS_KEY'),
+            presign_expires=config.get('S3_PRESIGN_EXPIRES', 300),
+            multipart_chunk_mb=config.get('S3_MULTIPART_CHUNK_MB', 8),
+            max_pool_connections=config.get('S3_MAX_POOL_CONNECTIONS', 10),
+            addressing_style=config.get('S3_ADDRESSING_STYLE'),
+        )
+    raise RuntimeError(f'알 수 없는 RECORDING_STORAGE: {backend}')
+
+
+def init_app(app):
+    app.extensions['recording_storage'] = create_storage(app.config)
+
+
+def get_storage():
+    return current_app.extensions['recording_storage']
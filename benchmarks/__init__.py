@@ -0,0 +1,9 @@
+"""라우트 부하/성능 측정.
+
+    python -m benchmarks --customers 20000 --repeat 20
+
+임시 SQLite DB 에 합성 데이터를 넣고(seed), auth/freelancer/admin 블루프린트의
+모든 라우트를 로그인된 테스트 클라이언트로 반복 호출해 라우트별 p50/p95 지연,
+요청당 SQL 쿼리 수, 최대 메모리를 잰다(harness). 라우트별 예산(routes)을 넘거나
+큰 테이블을 인덱스 없이 훑는 쿼리가 나오면 실패로 끝난다.
+"""
@@ -0,0 +1,72 @@
+"""python -m benchmarks [--customers N] [--archive-days D] [--repeat R] [--only PREFIX] [--db PATH] [--slack X]"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def build_app(workdir, db_path=None):
+    from app import create_app
+    from app.config import Config
+
+    class BenchConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path or os.path.join(workdir, "bench.db")}'
+        UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        SEED_ON_BOOTSTRAP = True
+        JOBS_EAGER = False
+        EVENTS_STREAM_SECONDS = 0  # SSE 는 첫 응답(retry/id)까지만 잰다
+        IDENTITY_VERSION_CHECK_SECONDS = 3600  # 프로세스당 주기적인 1회 조회는 요청별 쿼리 수에서 뺀다
+
+    return create_app(BenchConfig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='라우트별 지연/쿼리 수/메모리 측정')
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--freelancers', type=int, default=50)
+    parser.add_argument('--archive-days', type=int, default=60, help='시드 후 이보다 오래된 처리완료 제출을 보관')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', help='이 접두사로 시작하는 라우트만 측정 (예: admin.)')
+    parser.add_argument('--db', help='기존 벤치 DB 파일 (비어 있으면 새로 시드)')
+    parser.add_argument('--slack', type=float, default=1.0, help='지연/메모리 예산 배율 (느린 장비용)')
+    args = parser.parse_args(argv)
+
+    from app.extensions import db
+    from app.models import Customer
+    from benchmarks.harness import Harness, check_budgets, format_results, uncovered_endpoints
+    from benchmarks.routes import ROUTES, BenchContext
+    from benchmarks.seed import seed
+
+    workdir = tempfile.mkdtemp(prefix='happycall-bench-')
+    app = build_app(workdir, args.db)
+    with app.app_context():
+        if not db.session.query(Customer.id).first():
+            started = time.perf_counter()
+            counts = seed(customers=args.customers, freelancers=args.freelancers,
+                          upload_folder=app.config['UPLOAD_FOLDER'], archive_days=args.archive_days)
+            print(f'seeded {counts} in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+        context = BenchContext(app)
+
+    routes = [r for r in ROUTES if not args.only or r.name.startswith(args.only)]
+    harness = Harness(app, context, repeat=args.repeat)
+    results = []
+    for route in routes:
+        results.append(harness.run(route))
+        print(f'{route.name} done', file=sys.stderr)
+    harness.close()
+
+    print(format_results(results))
+    uncovered = [] if args.only else uncovered_endpoints(app, ROUTES)
+    try:
+        check_budgets(results, uncovered, slack=args.slack)
+    except AssertionError as exc:
+        print('\nbudget failures:\n' + str(exc))
+        return 1
+    print('\nall budgets met')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""라우트 측정기.
+
+라우트마다 준비 요청 1회 후 repeat 회를 재서 지연(p50/p95)과 요청당 최대 쿼리
+수를 구하고, tracemalloc 을 켠 요청 1회로 최대 메모리를 잰다. 측정 중 실행된
+SELECT/UPDATE/DELETE 는 SQLite EXPLAIN QUERY PLAN 으로 다시 확인해, 큰 테이블을
+인덱스 없이 훑는(SCAN <table>) 쿼리를 찾아낸다.
+"""
+import math
+import re
+import time
+import tracemalloc
+from sqlalchemy import event
+from app.extensions import db
+
+# 데이터 양에 비례해 커지는 테이블: 여기서의 전체 스캔은 실패로 본다
+LARGE_TABLES = {'customers', 'submissions', 'submission_details', 'change_events', 'jobs',
+                'archived_submissions', 'archived_recordings'}
+PLANNED_STATEMENTS = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+SCAN_PATTERN = re.compile(r'^SCAN (\w+?)(?:_\d+)?(?: AS \w+)?$')
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class QueryRecorder:
+    """켜져 있는 동안 엔진들(운영·보관 DB)에서 실행된 (engine, statement, parameters) 를 모은다."""
+
+    def __init__(self, engines):
+        self.engines = list(engines)
+        self.active = False
+        self.statements = []
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append((conn.engine, statement, None if executemany else parameters))
+
+    def start(self):
+        self.statements = []
+        self.active = True
+
+    def stop(self):
+        self.active = False
+        return self.statements
+
+    def close(self):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._record)
+
+
+def full_scans(statements, tables=LARGE_TABLES):
+    """statements 중 tables 를 인덱스 없이 훑는 쿼리의 {table: statement}."""
+    scans = {}
+    seen = set()
+    for engine, statement, parameters in statements:
+        if (engine.dialect.name != 'sqlite' or parameters is None or (engine, statement) in seen
+                or not statement.lstrip().upper().startswith(PLANNED_STATEMENTS)):
+            continue
+        seen.add((engine, statement))
+        with engine.connect() as conn:
+            for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters):
+                match = SCAN_PATTERN.match(row[-1])
+                if match and match.group(1) in tables:
+                    scans.setdefault(match.group(1), statement)
+    return scans
+
+
+class RouteResult:
+    def __init__(self, route):
+        self.route = route
+        self.timings = []   # ms
+        self.statuses = set()
+        self.queries = 0
+        self.peak_kb = 0.0
+        self.scans = {}
+        self.error = None
+
+    @property
+    def p50(self):
+        return percentile(self.timings, 0.50)
+
+    @property
+    def p95(self):
+        return percentile(self.timings, 0.95)
+
+    def failures(self, slack=1.0):
+        """예산을 넘은 항목 설명 목록. slack 은 지연/메모리 예산에만 곱한다."""
+        route = self.route
+        if self.error:
+            return [f'{route.name}: {self.error}']
+        found = []
+        server_errors = sorted(s for s in self.statuses if s >= 500)
+        if server_errors:
+            found.append(f'{route.name}: HTTP {server_errors}')
+        if self.queries > route.max_queries:
+            found.append(f'{route.name}: {self.queries} queries > budget {route.max_queries}')
+        if self.p95 > route.p95_ms * slack:
+            found.append(f'{route.name}: p95 {self.p95:.1f} ms > budget {route.p95_ms * slack:.0f} ms')
+        if self.peak_kb > route.peak_kb * slack:
+            found.append(f'{route.name}: peak {self.peak_kb:.0f} KiB > budget {route.peak_kb * slack:.0f} KiB')
+        for table, statement in self.scans.items():
+            if table not in route.allow_scans:
+                found.append(f'{route.name}: full scan of {table}: {" ".join(statement.split())[:200]}')
+        return found
+
+
+class Harness:
+    """로그인된 테스트 클라이언트로 라우트를 반복 호출해 RouteResult 를 만든다."""
+
+    def __init__(self, app, context, repeat=20):
+        self.app = app
+        self.context = context
+        self.repeat = repeat
+        self._clients = {}
+        with app.app_context():
+            self.recorder = QueryRecorder(db.engines.values())
+
+    def client(self, role, fresh=False):
+        if not fresh and role in self._clients:
+            return self._clients[role]
+        client = self.app.test_client()
+        if role is not None:
+            user_id = self.context.user_ids[role]
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+        if not fresh:
+            self._clients[role] = client
+        return client
+
+    def _call(self, route):
+        client = self.client(route.role, fresh=route.fresh_client)
+        with self.app.app_context():
+            request = route.make_request(self.context)
+        self.recorder.start()
+        started = time.perf_counter()
+        try:
+            response = client.open(method=route.method, **request)
+            response.get_data()
+            response.close()
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            statements = self.recorder.stop()
+        return response.status_code, elapsed, statements
+
+    def run(self, route):
+        result = RouteResult(route)
+        try:
+            self._call(route)  # 준비 요청: 템플릿 컴파일, 캐시 적재
+            for _ in range(self.repeat):
+                status, elapsed, statements = self._call(route)
+                result.statuses.add(status)
+                result.timings.append(elapsed)
+                result.queries = max(result.queries, len(statements))
+
+            tracemalloc.start()
+            try:
+                tracemalloc.reset_peak()
+                status, _, statements = self._call(route)
+                result.peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+            result.statuses.add(status)
+            with self.app.app_context():
+                result.scans = full_scans(statements)
+        except Exception as exc:
+            result.error = f'{type(exc).__name__}: {exc}'
+        return result
+
+    def close(self):
+        self.recorder.close()
+
+
+def uncovered_endpoints(app, routes, blueprints=('auth', 'freelancer', 'admin')):
+    """blueprints 의 엔드포인트 중 routes 에 없는 것."""
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()
+                 if rule.endpoint.split('.', 1)[0] in blueprints}
+    return sorted(endpoints - {route.endpoint for route in routes})
+
+
+def format_results(results):
+    lines = [f'{"route":<44}{"status":>10}{"p50 ms":>9}{"p95 ms":>9}{"queries":>9}{"peak KiB":>10}']
+    for result in results:
+        statuses = ','.join(str(s) for s in sorted(result.statuses)) or '-'
+        lines.append(f'{result.route.name:<44}{statuses:>10}{result.p50:9.1f}{result.p95:9.1f}'
+                     f'{result.queries:9d}{result.peak_kb:10.0f}')
+    return '\n'.join(lines)
+
+
+def check_budgets(results, uncovered=(), slack=1.0):
+    """예산 위반이 있으면 AssertionError."""
+    failures = [f'{endpoint}: not benchmarked' for endpoint in uncovered]
+    for result in results:
+        failures.extend(result.failures(slack))
+    assert not failures, '\n'.join(failures)
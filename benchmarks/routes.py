@@ -0,0 +1,207 @@
+"""측정할 라우트와 예산.
+
+max_queries 는 데이터 양과 무관해야 한다: 목록 화면이 행마다 쿼리를 더 내면(N+1)
+바로 넘는다. p95_ms/peak_kb 는 기본 규모(고객 2만 명) 기준이며 --slack 으로 늘릴 수 있다.
+allow_scans 는 설계상 테이블을 훑는 라우트에만 둔다.
+"""
+import io
+import itertools
+import random
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models import ArchivedSubmission, Customer, Submission, User
+from benchmarks.seed import customer_name
+
+NAME_RNG = random.Random(7)
+WAV = b'RIFF' + (36).to_bytes(4, 'little') + b'WAVEfmt ' + bytes(24) + b'data' + bytes(4)
+
+
+class Route:
+    def __init__(self, endpoint, make_request, role='admin', method='GET', name=None,
+                 max_queries=10, p95_ms=100, peak_kb=2048, allow_scans=(), fresh_client=False):
+        self.endpoint = endpoint
+        self.make_request = make_request
+        self.role = role
+        self.method = method
+        self.name = name or endpoint
+        self.max_queries = max_queries
+        self.p95_ms = p95_ms
+        self.peak_kb = peak_kb
+        self.allow_scans = set(allow_scans)
+        self.fresh_client = fresh_client
+
+
+class BenchContext:
+    """시드 이후의 표본 id 와, 반복할 때마다 새 대상을 내주는 공급기."""
+
+    def __init__(self, app):
+        config = app.config
+        self._serial = itertools.count()
+        admin = User.query.filter_by(username=config['TEST_ADMIN_USERNAME']).one()
+        freelancer = User.query.filter_by(username=config['TEST_FREELANCER_USERNAME']).one()
+        self.user_ids = {'admin': admin.id, 'freelancer': freelancer.id}
+        self.freelancer_id = freelancer.id
+        self.agent_ids = db.session.scalars(
+            db.select(User.id).where(User.role == 'freelancer').order_by(User.id).limit(20)).all()
+
+        own = db.select(Customer.id).where(Customer.assigned_agent_id == freelancer.id)
+        self.own_customer_id = db.session.scalars(own.order_by(Customer.id.desc()).limit(1)).first()
+        self._open_customers = iter(db.session.scalars(
+            own.where(Customer.call_status != '해피콜완료').order_by(Customer.id.desc())).all())
+        self.sample_customer_ids = db.session.scalars(
+            db.select(Customer.id).order_by(Customer.id.desc()).limit(100)).all()
+        self.sample_submission_id = db.session.scalars(
+            db.select(Submission.id).where(Submission.recording_file.isnot(None))
+            .order_by(Submission.id.desc()).limit(1)).first()
+        self.archived_submission_id = db.session.scalars(
+            db.select(ArchivedSubmission.id).where(ArchivedSubmission.recording_file.isnot(None))
+            .order_by(ArchivedSubmission.id.desc()).limit(1)).first()
+        self._pending_submissions = iter(db.session.scalars(
+            db.select(Submission.id).where(Submission.admin_status == '대기중')
+            .order_by(Submission.id.desc()).limit(1000)).all())
+        self.since = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    def serial(self):
+        return next(self._serial)
+
+    def next_open_customer(self):
+        return next(self._open_customers)
+
+    def next_pending_submission(self):
+        return next(self._pending_submissions)
+
+    def next_pending_batch(self, size):
+        return list(itertools.islice(self._pending_submissions, size))
+
+    def new_freelancer(self):
+        """삭제 라우트용 계정 (배정 고객 없음)."""
+        user = User(username=f'bench-victim-{self.serial()}', password='x', role='freelancer')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+    def new_phone(self):
+        serial = self.serial()
+        return f'010-9{serial // 10000 % 1000:03d}-{serial % 10000:04d}'
+
+
+def _get(path, **query_string):
+    return lambda ctx: {'path': path, 'query_string': query_string}
+
+
+def _submit(ctx):
+    customer_id = ctx.next_open_customer()
+    return {
+        'path': f'/customer/{customer_id}/submit',
+        'data': {
+            'check_installment': 'normal', 'check_penalty': 'normal', 'check_rate_plan': 'normal',
+            'check_retention': 'normal', 'check_monthly_fee': 'normal', 'check_used_phone': 'normal',
+            'check_store_complaint': 'abnormal', 'store_complaint_memo': '대리점 재안내 필요',
+            'raw_customer_data': '개통단말기\t갤럭시 S24\n개통요금제\t5G 슬림\t청구예상\t55,000',
+            'recording': (io.BytesIO(WAV), 'bench.wav'),
+        },
+        'content_type': 'multipart/form-data',
+    }
+
+
+def _provision(ctx):
+    rows = '\n'.join(f'bench-import-{ctx.serial()},pw{n}' for n in range(5))
+    return {'path': '/admin/freelancers/import',
+            'data': {'file': (io.BytesIO(f'username,password\n{rows}\n'.encode()), 'freelancers.csv')},
+            'content_type': 'multipart/form-data'}
+
+
+def _import_customers(ctx):
+    rows = '\n'.join(f'{customer_name(NAME_RNG)},{ctx.new_phone()}' for _ in range(100))
+    return {'path': '/admin/customers/import',
+            'data': {'file': (io.BytesIO(f'고객명,연락처\n{rows}\n'.encode()), 'customers.csv')},
+            'content_type': 'multipart/form-data'}
+
+
+ROUTES = [
+    # === auth ===
+    Route('auth.index', _get('/'), max_queries=1, p95_ms=20),
+    Route('auth.login', _get('/login'), role=None, name='auth.login GET', max_queries=0, p95_ms=20),
+    Route('auth.login', lambda ctx: {'path': '/login', 'data': {'username': '1', 'password': '1'}},
+          role=None, method='POST', name='auth.login POST', fresh_client=True,
+          max_queries=2, p95_ms=1500),  # pbkdf2 검사가 일부러 느리다
+    Route('auth.logout', _get('/logout'), fresh_client=True, max_queries=1, p95_ms=20),
+
+    # === freelancer ===
+    # 배정 고객 전체를 한 화면에 그리므로 메모리는 담당 고객 수(고객 수 / 프리랜서 수)에 비례한다
+    Route('freelancer.freelancer_dashboard', _get('/dashboard'), role='freelancer', max_queries=4, peak_kb=4096),
+    Route('freelancer.next_call', lambda ctx: {'path': '/queue/next'}, role='freelancer', method='POST',
+          max_queries=6),
+    # 제출이 없는 고객은 보관 DB 도 한 번 더 찾는다
+    Route('freelancer.customer_detail', lambda ctx: {'path': f'/customer/{ctx.own_customer_id}'},
+          role='freelancer', max_queries=4),
+    Route('freelancer.active_script', _get('/script/active'), role='freelancer', max_queries=2),
+    Route('freelancer.update_call_status',
+          lambda ctx: {'path': f'/customer/{ctx.own_customer_id}/status', 'data': {'call_status': '1차부재'}},
+          role='freelancer', method='POST', max_queries=6),
+    Route('freelancer.submit_checklist', _submit, role='freelancer', method='POST', max_queries=18),
+
+    # === admin: 제출 ===
+    Route('admin.admin_dashboard', _get('/admin'), max_queries=3),
+    Route('admin.admin_dashboard', _get('/admin', filter='abnormal'), name='admin.admin_dashboard abnormal',
+          max_queries=3),
+    Route('admin.admin_dashboard', _get('/admin', filter='pending'), name='admin.admin_dashboard pending',
+          max_queries=3),
+    Route('admin.export_submissions', lambda ctx: {'path': '/admin/export', 'query_string': {
+        'format': 'csv', 'from': ctx.since, 'gzip': '1'}}, max_queries=4),
+    Route('admin.events', _get('/admin/events'), max_queries=2),
+    Route('admin.admin_submission_detail',
+          lambda ctx: {'path': f'/admin/submission/{ctx.sample_submission_id}'}, max_queries=5),
+    Route('admin.submission_recording',
+          lambda ctx: {'path': f'/admin/submission/{ctx.sample_submission_id}/recording'}, max_queries=2),
+    # 보관된 제출: 운영 DB 조회가 비고 보관 DB 에서 읽는다
+    Route('admin.admin_submission_detail',
+          lambda ctx: {'path': f'/admin/submission/{ctx.archived_submission_id}'},
+          name='admin.admin_submission_detail archived', max_queries=6),
+    Route('admin.submission_recording',
+          lambda ctx: {'path': f'/admin/submission/{ctx.archived_submission_id}/recording'},
+          name='admin.submission_recording archived', max_queries=4),
+    Route('admin.resolve_submission',
+          lambda ctx: {'path': f'/admin/submission/{ctx.next_pending_submission()}/resolve'},
+          method='POST', max_queries=10),
+    Route('admin.bulk_resolve_submissions', lambda ctx: {'path': '/admin/submissions/resolve', 'data': {
+        'submission_ids': [str(i) for i in ctx.next_pending_batch(20)]}}, method='POST', max_queries=10),
+    Route('admin.qc_reports', _get('/admin/reports'), max_queries=4, p95_ms=150),
+
+    # === admin: 계정 ===
+    Route('admin.manage_freelancers', _get('/admin/freelancers'), max_queries=3),
+    Route('admin.create_freelancer', lambda ctx: {'path': '/admin/freelancers/create', 'data': {
+        'username': f'bench-new-{ctx.serial()}', 'password': 'pw'}},
+          method='POST', max_queries=3, p95_ms=1500),
+    Route('admin.provision_freelancers', _provision, method='POST', max_queries=3, p95_ms=5000),
+    # 계정 삭제 시 User.submissions 백참조를 읽는 조회는 agent_id 인덱스가 없어 훑는다 (드문 관리 작업).
+    # 삭제는 같은 트랜잭션에서 신원 캐시 버전도 올린다
+    Route('admin.delete_freelancer', lambda ctx: {'path': f'/admin/freelancers/{ctx.new_freelancer()}/delete'},
+          method='POST', max_queries=6, allow_scans={'submissions'}),
+    Route('admin.identity_cache_stats', _get('/admin/identity-cache'), max_queries=1),
+
+    # === admin: 스크립트 ===
+    Route('admin.edit_script', _get('/admin/script'), max_queries=2),
+    Route('admin.save_script', lambda ctx: {'path': '/admin/script/save', 'data': {
+        'title': '기본 해피콜 스크립트', 'content': f'<p>벤치마크 {ctx.serial()}</p>'}},
+          method='POST', max_queries=3),
+
+    # === admin: 고객 (행마다 담당자 선택 목록을 그리므로 프리랜서 수에 비례해 무겁다) ===
+    Route('admin.manage_customers', _get('/admin/customers'), max_queries=4, p95_ms=250, peak_kb=6144),
+    Route('admin.manage_customers', _get('/admin/customers', status='대기'), name='admin.manage_customers 대기',
+          max_queries=4, p95_ms=250, peak_kb=6144),
+    Route('admin.search', _get('/admin/search', q='1234'), name='admin.search phone', max_queries=3),
+    Route('admin.search', _get('/admin/search', q='김민준'), name='admin.search name', max_queries=4),
+    Route('admin.search', _get('/admin/search', q='위약금'), name='admin.search memo', max_queries=4),
+    Route('admin.assign_customer', lambda ctx: {'path': '/admin/customers/assign', 'data': {
+        'customer_id': ctx.sample_customer_ids[ctx.serial() % len(ctx.sample_customer_ids)],
+        'agent_id': ctx.agent_ids[0]}}, method='POST', max_queries=5),
+    Route('admin.bulk_assign_customers', lambda ctx: {'path': '/admin/customers/bulk-assign', 'data': {
+        'customer_ids': [str(i) for i in ctx.sample_customer_ids],
+        'bulk_agent_id': ctx.agent_ids[ctx.serial() % len(ctx.agent_ids)]}}, method='POST', max_queries=4),
+    Route('admin.auto_distribute', lambda ctx: {'path': '/admin/customers/auto-distribute'},
+          method='POST', max_queries=6),
+    Route('admin.create_customer', lambda ctx: {'path': '/admin/customers/create', 'data': {
+        'name': customer_name(NAME_RNG), 'phone': ctx.new_phone()}}, method='POST', max_queries=4),
+    Route('admin.import_customers', _import_customers, method='POST', max_queries=6),
+]
@@ -0,0 +1,163 @@
+"""합성 데이터 일괄 생성.
+
+프리랜서·고객·제출(개통 데이터 원문과 파싱 결과 포함)을 배치 INSERT 로 넣는다.
+같은 seed 면 같은 데이터가 만들어진다. 끝나면 카운터와 QC 집계를 다시 맞추고,
+archive_days 가 있으면 그보다 오래된 처리완료 제출을 보관 DB 로 옮긴다.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app import counters, rollups
+from app.archive import archive_submissions
+from app.extensions import db
+from app.models import Customer, Submission, SubmissionDetail, User
+from app.provisioning import hash_password
+from app.services import parse_submission_detail
+
+BATCH_SIZE = 5000
+SAMPLE_RECORDING = 'bench/sample.wav'
+ARCHIVED_RECORDING = 'bench/archived.wav'  # 보관될 제출만 쓰므로 보관 후 묶음 파일에서만 읽힌다
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ['민준', '서연', '도윤', '하은', '시우', '지우', '주원', '서윤', '예준', '지민',
+               '하준', '수아', '건우', '지아', '현우', '채원', '우진', '다은', '선우', '유진']
+STORES = ['강남점', '홍대점', '신촌점', '잠실점', '분당점', '일산점', '수원점', '부평점', '해운대점', '동성로점']
+DEVICES = ['갤럭시 S24', '갤럭시 S24 울트라', '갤럭시 Z 플립5', '아이폰 15', '아이폰 15 프로', '갤럭시 A35']
+PLANS = [('5G 프리미어 에센셜', 85000), ('5G 스탠다드', 75000), ('5G 슬림', 55000),
+         ('LTE 데이터 33', 33000), ('5G 시그니처', 130000)]
+ADDONS = ['없음', '유튜브 프리미엄', '지니뮤직', '디즈니+', 'V컬러링']
+INSURANCES = ['없음', '폰케어 플러스', '분실파손 보험']
+OPINIONS = ['', '', '', '고객 응대 양호', '위약금 안내 누락 의심', '요금제 설명 재확인 필요', '재통화 요청']
+MEMOS = ['', '', '', '', '설명 들음', '기억 안 난다고 함', '대리점 재안내 필요']
+
+# 콜 상태 분포 (해피콜완료 비율은 submit_ratio 로 따로 정한다)
+OPEN_STATUS_WEIGHTS = [('대기', 60), ('1차부재', 15), ('2차부재', 8), ('3차부재', 5), ('통화거부', 12)]
+
+
+def customer_name(rng):
+    return rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES)
+
+
+def raw_customer_data(rng):
+    """대리점 개통 데이터(탭 구분) 원문. services.parse_raw_customer_data 가 읽는 형식."""
+    plan, bill = rng.choice(PLANS)
+    price = rng.randrange(300, 1900) * 1000
+    months = rng.choice([12, 24, 36])
+    penalty = rng.random() < 0.3
+    lines = [
+        f'매장명\t{rng.choice(STORES)}\t담당자\t{customer_name(rng)}\t직원연락처\t010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}',
+        f'개통단말기\t{rng.choice(DEVICES)}',
+        f'할부원금\t{price:,}\t할부기간\t{months}개월\t할부이자\t5.9%',
+        f'월 청구 할부금\t{price // months:,}',
+        f'약정정보\t기간 :\t{rng.choice([12, 24])}',
+        f'개통요금제\t{plan}\t청구예상\t{bill:,}',
+        f'1차변경요금제\t{"5G 슬림" if rng.random() < 0.4 else ""}\t변경일\t{"2024-06-01" if rng.random() < 0.4 else ""}\t청구예상\t55,000',
+        f'부가서비스1\t{rng.choice(ADDONS)}',
+        f'부가서비스2\t{rng.choice(ADDONS)}',
+        f'보험\t{rng.choice(INSURANCES)}',
+        '부가서비스&보험 유지기간 93일',
+        '개통유지기간 신규(183일) 기기변경/번호이동(93일)',
+        f'중고폰반납\t{"반납" if rng.random() < 0.3 else "미반납"}\t반납모델\t갤럭시 S21\t처리예상금액\t150,000\t중고폰 처리방법\t보상판매',
+        f'▶기존할부금1\t{rng.randrange(0, 500) * 1000:,}\t잔여개월\t{rng.randrange(0, 24)}개월\t처리방법\t완납',
+        f'▶위약금\t{"있음" if penalty else "없음"}\t금액\t{rng.randrange(50, 300) * 1000 if penalty else 0:,}',
+        f'결합할인\t{"인터넷 결합" if rng.random() < 0.5 else "없음"}\t할인금액\t{rng.choice([0, 5500, 11000]):,}',
+    ]
+    return '\n'.join(lines)
+
+
+def _weighted(rng, weights):
+    return rng.choices([v for v, _ in weights], [w for _, w in weights])[0]
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + BATCH_SIZE])
+    db.session.commit()
+
+
+def seed_freelancers(count, password='bench'):
+    """bench0000.. 프리랜서 계정. 해시는 한 번만 계산해 모두 같은 비밀번호로 만든다."""
+    hashed = hash_password(password)
+    existing = set(db.session.scalars(db.select(User.username).where(User.username.like('bench%'))))
+    rows = [{'username': f'bench{i:04d}', 'password': hashed, 'role': 'freelancer'}
+            for i in range(count) if f'bench{i:04d}' not in existing]
+    if rows:
+        _insert(User, rows)
+    return db.session.scalars(db.select(User.id).where(User.role == 'freelancer').order_by(User.id)).all()
+
+
+def _write_sample_recording(upload_folder, key=SAMPLE_RECORDING):
+    path = os.path.join(upload_folder, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        with open(path, 'wb') as out:
+            out.write(b'RIFF' + (36).to_bytes(4, 'little') + b'WAVEfmt ' + bytes(24) + b'data' + bytes(4))
+    return key
+
+
+def seed(customers=10000, freelancers=50, submit_ratio=0.4, unassigned_ratio=0.1, days=90,
+         seed=20240101, upload_folder=None, archive_days=None):
+    """합성 데이터를 넣고 만든 건수를 돌려준다. 앱 컨텍스트 안에서 호출한다."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    agent_ids = seed_freelancers(freelancers)
+    recording = archived_recording = _write_sample_recording(upload_folder) if upload_folder else None
+    if upload_folder and archive_days is not None:
+        archived_recording = _write_sample_recording(upload_folder, ARCHIVED_RECORDING)
+    archive_before = now - timedelta(days=archive_days) if archive_days is not None else None
+
+    first_id = (db.session.query(db.func.max(Customer.id)).scalar() or 0) + 1
+    customer_rows, submission_rows = [], []
+    for offset in range(customers):
+        customer_id = first_id + offset
+        name = customer_name(rng)
+        phone = f'010-{customer_id // 10000 % 10000:04d}-{customer_id % 10000:04d}'
+        created_at = now - timedelta(minutes=rng.randrange(days * 24 * 60))
+        agent_id = None if rng.random() < unassigned_ratio else rng.choice(agent_ids)
+        submitted = agent_id is not None and rng.random() < submit_ratio
+        status = '해피콜완료' if submitted else _weighted(rng, OPEN_STATUS_WEIGHTS)
+        next_call_at = None if status in ('해피콜완료', '통화거부') else created_at
+        customer_rows.append({
+            'id': customer_id, 'name': name, 'phone': phone, 'call_status': status,
+            'assigned_agent_id': agent_id, 'created_at': created_at, 'next_call_at': next_call_at,
+        })
+        if submitted:
+            checks = {column: rng.random() > 0.05 for column in (
+                'check_installment', 'check_penalty', 'check_rate_plan', 'check_retention',
+                'check_monthly_fee', 'check_used_phone', 'check_store_complaint')}
+            submitted_at = min(created_at + timedelta(hours=rng.randrange(1, 72)), now)
+            admin_status = '처리완료' if rng.random() < 0.5 else '대기중'
+            archived = archive_before is not None and admin_status == '처리완료' and submitted_at < archive_before
+            submission_rows.append({
+                'customer_id': customer_id, 'agent_id': agent_id,
+                'recording_file': archived_recording if archived else recording,
+                **checks,
+                'memo_check_installment': rng.choice(MEMOS), 'memo_check_penalty': rng.choice(MEMOS),
+                'memo_check_rate_plan': rng.choice(MEMOS), 'memo_check_retention': rng.choice(MEMOS),
+                'memo_check_monthly_fee': rng.choice(MEMOS), 'memo_check_used_phone': rng.choice(MEMOS),
+                'store_complaint_memo': rng.choice(MEMOS), 'agent_opinion': rng.choice(OPINIONS),
+                'raw_customer_data': raw_customer_data(rng),
+                'final_status': '정상' if all(checks.values()) else '비정상',
+                'admin_status': admin_status,
+                'created_at': submitted_at,
+            })
+
+    _insert(Customer, customer_rows)
+    submission_rows.sort(key=lambda row: row['created_at'])
+    _insert(Submission, submission_rows)
+
+    detail_rows = []
+    submitted = dict(db.session.execute(
+        db.select(Submission.customer_id, Submission.id).where(Submission.customer_id >= first_id)).all())
+    for row in submission_rows:
+        fields = parse_submission_detail(row['raw_customer_data'])
+        detail_rows.append({'submission_id': submitted[row['customer_id']], **fields})
+    _insert(SubmissionDetail, detail_rows)
+
+    counters.reconcile()
+    rollups.refresh()
+    counts = {'freelancers': len(agent_ids), 'customers': len(customer_rows), 'submissions': len(submission_rows)}
+    if archive_days is not None:
+        counts['archived'] = archive_submissions(older_than=timedelta(days=archive_days))['submissions']
+    return counts
@@ -0,0 +1,34 @@
+import pytest
+from app import create_app
+from app.config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/test.db'
+        ARCHIVE_DATABASE_URL = None
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        RECORDING_STORAGE = 'local'
+        TESTING = True
+        SEED_ON_BOOTSTRAP = True
+        TEST_ADMIN_USERNAME = 'admin'
+        TEST_ADMIN_PASSWORD = 'admin'
+        TEST_FREELANCER_USERNAME = 'agent'
+        TEST_FREELANCER_PASSWORD = 'agent'
+
+    app = create_app(TestConfig)
+    yield app
+    from app.extensions import db
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'admin'})
+    assert response.status_code == 302
+    return client
@@ -0,0 +1,60 @@
+import glob
+import os
+
+import pytest
+
+
+@pytest.fixture
+def agent_client(app):
+    client = app.test_client()
+    assert client.post('/login', data={'username': 'agent', 'password': 'agent'}).status_code == 302
+    return client
+
+
+@pytest.mark.parametrize('encoding', [None, 'gzip'])
+def test_active_script_revalidates(agent_client, encoding):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    first = agent_client.get('/script/active', headers=headers)
+    assert first.status_code == 200
+    assert first.headers.get('Content-Encoding') == encoding
+    etag = first.headers['ETag']
+
+    again = agent_client.get('/script/active', headers={**headers, 'If-None-Match': etag})
+    assert again.status_code == 304
+
+
+def test_compressed_etag_is_weak(agent_client):
+    response = agent_client.get('/script/active', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].startswith('W/')
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_pages_use_committed_assets(app):
+    html = app.test_client().get('/login').get_data(as_text=True)
+    assert 'cdn.tailwindcss.com' not in html
+    assert 'cdnjs.cloudflare.com' not in html
+    manifest = app.extensions['assets'].manifest
+    for name in ('app.css', 'icons.css', 'icons.woff2'):
+        assert f'/assets/{manifest[name]}' in html
+
+
+def test_font_is_served_immutable(app):
+    font = app.extensions['assets'].manifest['icons.woff2']
+    response = app.test_client().get(f'/assets/{font}')
+    assert response.status_code == 200
+    assert response.mimetype == 'font/woff2'
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+def test_built_icons_cover_templates(app):
+    # 템플릿에 아이콘을 추가하고 flask build-css 를 다시 돌리지 않으면 실패한다
+    from app.assets import CONTENT_GLOBS, DIST_DIR, ICON_CLASS
+    with open(os.path.join(DIST_DIR, app.extensions['assets'].manifest['icons.css']), encoding='utf-8') as f:
+        css = f.read()
+    used = set()
+    for path in [p for pattern in CONTENT_GLOBS for p in glob.glob(pattern, recursive=True)]:
+        with open(path, encoding='utf-8') as f:
+            used.update(ICON_CLASS.findall(f.read()))
+    assert used
+    assert sorted(name for name in used if f'.{name}::before' not in css) == []
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+from app.counters import read_counters, reconcile
+from app.extensions import db
+from app.models import Customer, User
+import app.routes.freelancer as freelancer_routes
+
+
+def assert_counters_consistent():
+    counters = {name: value for name, value in read_counters().items() if value}
+    assert counters == {**{k: v for k, v in counters.items() if k.startswith('identity:')}, **reconcile()}
+
+
+def agent_customer(app):
+    with app.app_context():
+        agent = User.query.filter_by(username='agent').one()
+        customer = Customer(name='홍길동', phone='010-1234-5678', call_status='대기', assigned_agent_id=agent.id)
+        db.session.add(customer)
+        db.session.commit()
+        reconcile()
+        return customer.id
+
+
+def login(app):
+    client = app.test_client()
+    assert client.post('/login', data={'username': 'agent', 'password': 'agent'}).status_code == 302
+    return client
+
+
+def test_status_change_adjusts_counters(app):
+    customer_id = agent_customer(app)
+    client = login(app)
+    client.post(f'/customer/{customer_id}/status', data={'call_status': '1차부재'})
+    with app.app_context():
+        assert read_counters()['customer:call:1차부재'] == 1
+        assert_counters_consistent()
+
+
+def test_concurrent_change_is_not_counted_twice(app, monkeypatch):
+    customer_id = agent_customer(app)
+    client = login(app)
+    next_call_time = freelancer_routes.next_call_time
+
+    def changed_elsewhere(status):
+        # 이 요청이 상태를 읽은 뒤 다른 요청이 먼저 바꾼 경우
+        db.session.execute(text("UPDATE customers SET call_status = '통화거부' WHERE id = :id"), {'id': customer_id})
+        freelancer_routes.record_customer(old='대기', new='통화거부')
+        return next_call_time(status)
+
+    monkeypatch.setattr(freelancer_routes, 'next_call_time', changed_elsewhere)
+    client.post(f'/customer/{customer_id}/status', data={'call_status': '1차부재'})
+    with app.app_context():
+        assert db.session.get(Customer, customer_id).call_status == '통화거부'
+        assert_counters_consistent()
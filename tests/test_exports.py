@@ -0,0 +1,94 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from app.archive import archive_submissions
+from app.extensions import db
+from app.models import ArchivedSubmission, Customer, Submission, SubmissionDetail, User
+
+
+@pytest.mark.parametrize('filter_type', ['all', 'abnormal', 'pending', 'resolved'])
+def test_export_filters(admin_client, filter_type):
+    response = admin_client.get(f'/admin/export?filter={filter_type}')
+    assert response.status_code == 200
+    assert f'submissions_{filter_type}' in response.headers['Content-Disposition']
+
+
+@pytest.mark.parametrize('query', ['filter=x%0d%0aSet-Cookie:a=b', 'filter=../etc', 'format=xml'])
+def test_export_rejects_unknown_values(admin_client, query):
+    assert admin_client.get(f'/admin/export?{query}').status_code == 400
+
+
+@pytest.mark.parametrize('query', ['from=2024-13-01', 'to=2024-02-30', 'from=yesterday',
+                                   'from=2024-03-02&to=2024-03-01'])
+def test_export_rejects_malformed_dates(admin_client, query):
+    assert admin_client.get(f'/admin/export?{query}').status_code == 400
+
+
+def test_export_accepts_date_range(admin_client):
+    response = admin_client.get('/admin/export?from=2024-03-01&to=2024-03-31')
+    assert response.status_code == 200
+    assert '2024-03-01_2024-03-31' in response.headers['Content-Disposition']
+
+
+@pytest.mark.parametrize('args', [['--from', '2024-13-01'], ['--from', '2024-03-02', '--to', '2024-03-01']])
+def test_export_cli_rejects_bad_dates(app, args):
+    result = app.test_cli_runner().invoke(args=['export-submissions', *args])
+    assert result.exit_code == 2
+    assert '--from' in result.output
+
+
+def add_submission(agent, created_at, name, store_name=None):
+    customer = Customer(name=name, phone=f'010-7000-{Customer.query.count():04d}', assigned_agent_id=agent.id)
+    db.session.add(customer)
+    db.session.flush()
+    submission = Submission(customer_id=customer.id, agent_id=agent.id, final_status='비정상',
+                            admin_status='처리완료', created_at=created_at)
+    db.session.add(submission)
+    db.session.flush()
+    if store_name:
+        db.session.add(SubmissionDetail(submission_id=submission.id, store_name=store_name, device='갤럭시'))
+    db.session.commit()
+    return submission.id
+
+
+def export_rows(client, query):
+    response = client.get(f'/admin/export?{query}')
+    assert response.status_code == 200
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True).lstrip('﻿'))))
+
+
+def test_export_includes_archived_month(app, admin_client):
+    with app.app_context():
+        agent = User.query.filter_by(username='agent').one()
+        archived_ids = [add_submission(agent, datetime(2024, 1, day, 9), f'보관{day}', store_name='강남점')
+                        for day in (3, 15, 28)]
+        outside = add_submission(agent, datetime(2024, 2, 1, 9), '보관밖')
+        add_submission(agent, datetime.utcnow(), '최근')
+        stats = archive_submissions(older_than=timedelta(days=30))
+        assert stats['submissions'] == 4
+        assert Submission.query.filter(Submission.id.in_(archived_ids)).count() == 0
+
+    rows = export_rows(admin_client, 'from=2024-01-01&to=2024-01-31')
+    assert [int(row['id']) for row in rows] == archived_ids
+    assert {row['customer_name'] for row in rows} == {'보관3', '보관15', '보관28'}
+    assert {(row['agent'], row['store_name'], row['device']) for row in rows} == {('agent', '강남점', '갤럭시')}
+
+    rows = export_rows(admin_client, 'filter=abnormal')
+    assert [int(row['id']) for row in rows][:4] == archived_ids + [outside]
+    assert len(rows) == 5
+
+
+def test_export_skips_archived_copy_of_hot_row(app, admin_client):
+    # 보관이 중간에 멈춰 같은 제출이 양쪽에 남은 경우
+    with app.app_context():
+        agent = User.query.filter_by(username='agent').one()
+        submission_id = add_submission(agent, datetime(2024, 1, 5, 9), '양쪽')
+        values = {column.key: getattr(db.session.get(Submission, submission_id), column.key)
+                  for column in Submission.__table__.columns}
+        db.session.add(ArchivedSubmission(**values))
+        db.session.commit()
+
+    rows = export_rows(admin_client, 'from=2024-01-01&to=2024-01-31')
+    assert [int(row['id']) for row in rows] == [submission_id]
@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extensions import db
+from app.identity import IdentityCache, identity_cache
+from app.models import User
+import app.identity as identity_module
+
+
+def load(user_id):
+    return db.session.get(User, user_id)
+
+
+def agent_id():
+    return db.session.scalar(db.select(User.id).where(User.username == 'agent'))
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def test_cache_hit_issues_no_queries(admin_client, app):
+    admin_client.get('/admin/identity-cache')
+    with app.app_context(), count_queries() as statements:
+        response = admin_client.get('/admin/identity-cache')
+    assert response.status_code == 200
+    assert response.json['hits'] >= 1
+    assert statements == []
+
+
+def test_shared_version_is_checked_periodically(app, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(identity_module.time, 'monotonic', lambda: clock[0])
+    other_worker = IdentityCache(ttl=3600, version_check=5)
+    with app.app_context():
+        user_id = agent_id()
+        other_worker.load(user_id, load)
+        db.session.get(User, user_id).role = 'admin'
+        db.session.commit()
+        db.session.remove()
+
+        clock[0] += 1
+        with count_queries() as statements:
+            assert other_worker.load(user_id, load).role == 'freelancer'
+        assert statements == []
+
+        clock[0] += 5
+        assert other_worker.load(user_id, load).role == 'admin'
+
+
+def test_change_in_other_process_is_seen_on_next_lookup(app):
+    other_worker = IdentityCache(ttl=3600, version_check=0)
+    with app.app_context():
+        user_id = agent_id()
+        assert other_worker.load(user_id, load).role == 'freelancer'
+        assert other_worker.load(user_id, load).role == 'freelancer'
+        assert other_worker.hits == 1
+
+        db.session.get(User, user_id).role = 'admin'
+        db.session.commit()
+        db.session.remove()
+
+        assert other_worker.load(user_id, load).role == 'admin'
+
+
+def test_deleted_user_is_not_served_from_other_process(app):
+    other_worker = IdentityCache(ttl=3600, version_check=0)
+    with app.app_context():
+        user_id = agent_id()
+        assert other_worker.load(user_id, load) is not None
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        db.session.remove()
+
+        assert other_worker.load(user_id, load) is None
+
+
+def test_rolled_back_change_keeps_entry(app):
+    with app.app_context():
+        user_id = agent_id()
+        identity_cache.load(user_id, load)
+        version = identity_cache.shared_version()
+
+        db.session.get(User, user_id).role = 'admin'
+        db.session.flush()
+        db.session.rollback()
+
+        assert identity_cache.shared_version() == version
+        assert identity_cache.stats()['invalidations'] == 0
+        assert identity_cache.load(user_id, load).role == 'freelancer'
+        assert identity_cache.hits == 1
+
+
+def test_deleted_user_is_logged_out(app):
+    client = app.test_client()
+    assert client.post('/login', data={'username': 'agent', 'password': 'agent'}).status_code == 302
+    assert client.get('/dashboard').status_code == 200
+    with app.app_context():
+        db.session.delete(db.session.get(User, agent_id()))
+        db.session.commit()
+    assert client.get('/dashboard').status_code == 302
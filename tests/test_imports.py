@@ -0,0 +1,65 @@
+import io
+import os
+from sqlalchemy import text
+from app.extensions import db
+from app.imports import import_customers, iter_customer_rows
+from app.migrations import MIGRATIONS
+from app.models import Customer
+from app.services import parse_raw_customer_data
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'agency_export.txt')
+
+
+def fixture_bytes():
+    with open(FIXTURE, 'rb') as f:
+        return f.read()
+
+
+def test_agency_blocks_start_at_store_row():
+    rows = list(iter_customer_rows(io.BytesIO(fixture_bytes()), fmt='agency'))
+    assert rows == [
+        [1, '', ''],
+        [18, '김서연', '010 4821 7730'],
+        [28, '정우진', '+82-10-9911-2345'],
+        [32, '', ''],
+    ]
+
+
+def test_fixture_is_the_pasted_export_format():
+    blocks = fixture_bytes().decode('utf-8').split('\n\n')
+    assert [parse_raw_customer_data(block)['store_name'] for block in blocks] == ['강남점', '신촌점', '잠실점']
+    assert parse_raw_customer_data(blocks[0])['plan_name'] == '5G 프리미어 에센셜'
+
+
+def test_auto_detects_agency_format():
+    rows = list(iter_customer_rows(io.BytesIO(fixture_bytes())))
+    assert [row[1] for row in rows] == ['', '김서연', '정우진', '']
+
+
+def test_auto_keeps_tsv_with_header():
+    rows = list(iter_customer_rows(io.StringIO('고객명\t연락처\n홍길동\t010-1234-5678\n')))
+    assert rows == [(2, '홍길동', '010-1234-5678')]
+
+
+def test_import_agency_file_reports_blocks_without_customer(app):
+    with app.app_context():
+        report = import_customers(iter_customer_rows(io.BytesIO(fixture_bytes())))
+        assert report.inserted == 2
+        assert [(line_no, reason) for line_no, reason, _ in report.errors] == [(1, '고객명 누락'), (32, '고객명 누락')]
+        assert dict(Customer.query.with_entities(Customer.name, Customer.phone)) == {
+            '김서연': '010-4821-7730', '정우진': '010-9911-2345'}
+
+
+def test_existing_phones_are_normalized_for_dedupe(app):
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO customers (name, phone, call_status) VALUES ('김서연', '01048217730', '대기')"))
+        db.session.commit()
+        normalize = dict((version, upgrade) for version, _, upgrade in MIGRATIONS)[9]
+        with db.engine.begin() as conn:
+            normalize(conn)
+
+        customer = Customer.query.one()
+        assert (customer.phone, customer.phone_rev) == ('010-4821-7730', '03771284010')
+        report = import_customers(iter_customer_rows(io.BytesIO(fixture_bytes())))
+        assert (report.inserted, report.duplicates) == (1, 1)
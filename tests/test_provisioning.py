@@ -0,0 +1,27 @@
+import csv
+import io
+
+from app.models import User
+from app.provisioning import SUPPLIED_PASSWORD_MASK
+
+
+def test_report_hides_supplied_passwords(app, admin_client):
+    upload = 'username,password\nnew-supplied,s3cret-pw\nnew-generated,\nagent,x\n'
+    response = admin_client.post('/admin/freelancers/import', data={
+        'file': (io.BytesIO(upload.encode()), 'freelancers.csv'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert 's3cret-pw' not in body
+
+    rows = {row['username']: row for row in csv.DictReader(io.StringIO(body.lstrip('﻿')))}
+    assert rows['new-supplied']['password'] == SUPPLIED_PASSWORD_MASK
+    assert rows['new-supplied']['status'] == 'created'
+    assert rows['new-generated']['status'] == 'generated'
+    assert rows['agent']['status'] == 'exists'
+
+    with app.app_context():
+        supplied = User.query.filter_by(username='new-supplied').one()
+        generated = User.query.filter_by(username='new-generated').one()
+        assert supplied.check_password('s3cret-pw')
+        assert generated.check_password(rows['new-generated']['password'])
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+from sqlalchemy import event
+from app import rollups
+from app.extensions import db
+from app.jobs import work
+from app.models import Customer, QcDailyRollup, Submission, User
+
+
+def add_submission(final_status='정상'):
+    agent = User.query.filter_by(username='agent').one()
+    customer = Customer(name='홍길동', phone=f'010-5555-{Customer.query.count():04d}', assigned_agent_id=agent.id)
+    db.session.add(customer)
+    db.session.flush()
+    db.session.add(Submission(customer_id=customer.id, agent_id=agent.id,
+                              final_status=final_status, admin_status='대기중'))
+    db.session.commit()
+
+
+def rollup_total():
+    return db.session.scalar(db.select(db.func.coalesce(db.func.sum(QcDailyRollup.total), 0)))
+
+
+def test_report_page_does_not_write(app, admin_client):
+    with app.app_context():
+        add_submission()
+        writes = []
+
+        def record(conn, cursor, statement, *args):
+            if not statement.lstrip().upper().startswith('SELECT'):
+                writes.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            assert admin_client.get('/admin/reports').status_code == 200
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        assert writes == []
+        assert rollup_total() == 0
+
+
+def test_worker_refreshes_rollups(app):
+    with app.app_context():
+        add_submission()
+        add_submission('비정상')
+        work('test', burst=True)
+        assert rollup_total() == 2
+        assert rollups.refreshed_at() is not None
+
+
+def test_refresh_skips_range_claimed_elsewhere(app, monkeypatch):
+    with app.app_context():
+        add_submission()
+        target = db.session.scalar(db.select(db.func.max(Submission.id)))
+        assert rollups.refresh() == 1
+        # 다른 워커가 점유하기 전의 상한을 읽은 상태에서 같은 구간을 다시 더하려는 경우
+        monkeypatch.setattr(rollups, '_state', lambda: SimpleNamespace(last_id=0))
+        assert rollups._refresh_batch(target, rollups.REFRESH_BATCH_IDS) == 0
+        db.session.commit()
+        assert rollup_total() == 1
@@ -0,0 +1,169 @@
+"""녹취 저장소 드라이버 계약 테스트.
+
+s3 는 S3_TEST_ENDPOINT_URL (MinIO 등, S3_TEST_BUCKET/S3_TEST_ACCESS_KEY_ID/
+S3_TEST_SECRET_ACCESS_KEY 와 함께) 이 있으면 그 서버를, 없으면 moto 서버를 띄워 쓴다.
+boto3 (와 moto) 가 없으면 건너뛴다.
+"""
+import os
+import socket
+import urllib.request
+import io
+import uuid
+import pytest
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Customer, Submission, User
+from app.storage import LocalStorage, create_storage
+
+KEY = 'ab/cd/recording.wav'
+DATA = b'RIFF' + os.urandom(64 * 1024)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def s3_endpoint():
+    boto3 = pytest.importorskip('boto3')
+    if os.environ.get('S3_TEST_ENDPOINT_URL'):
+        yield {
+            'S3_ENDPOINT_URL': os.environ['S3_TEST_ENDPOINT_URL'],
+            'S3_BUCKET': os.environ.get('S3_TEST_BUCKET', 'happycall-test'),
+            'S3_REGION': os.environ.get('S3_TEST_REGION', 'us-east-1'),
+            'S3_ACCESS_KEY_ID': os.environ.get('S3_TEST_ACCESS_KEY_ID'),
+            'S3_SECRET_ACCESS_KEY': os.environ.get('S3_TEST_SECRET_ACCESS_KEY'),
+        }
+        return
+
+    moto_server = pytest.importorskip('moto.server')
+    port = _free_port()
+    server = moto_server.ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+    config = {
+        'S3_ENDPOINT_URL': f'http://127.0.0.1:{port}',
+        'S3_BUCKET': 'happycall-test',
+        'S3_REGION': 'us-east-1',
+        'S3_ACCESS_KEY_ID': 'test',
+        'S3_SECRET_ACCESS_KEY': 'test',
+    }
+    boto3.client('s3', endpoint_url=config['S3_ENDPOINT_URL'], region_name='us-east-1',
+                 aws_access_key_id='test', aws_secret_access_key='test').create_bucket(Bucket=config['S3_BUCKET'])
+    yield config
+    server.stop()
+
+
+@pytest.fixture(params=['local', 's3'])
+def storage(request, tmp_path):
+    if request.param == 'local':
+        return LocalStorage(str(tmp_path))
+    config = dict(request.getfixturevalue('s3_endpoint'), RECORDING_STORAGE='s3',
+                  S3_PREFIX=f'test-{uuid.uuid4().hex}', S3_MULTIPART_CHUNK_MB=5)
+    return create_storage(config)
+
+
+def _temp_file(tmp_path, data):
+    path = tmp_path / f'{uuid.uuid4().hex}.part'
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_round_trip(storage, tmp_path):
+    path = _temp_file(tmp_path, DATA)
+    storage.put_file(KEY, path)
+    assert not os.path.exists(path)
+
+    assert storage.exists(KEY)
+    assert storage.size(KEY) == len(DATA)
+    with storage.open(KEY) as f:
+        assert f.read() == DATA
+    assert storage.read_range(KEY, 4, 16) == DATA[4:20]
+    with storage.local_copy(KEY) as copy:
+        with open(copy, 'rb') as f:
+            assert f.read() == DATA
+
+    storage.delete(KEY)
+    assert not storage.exists(KEY)
+    with pytest.raises(FileNotFoundError):
+        storage.open(KEY)
+
+
+def test_put_existing_key_keeps_first_copy(storage, tmp_path):
+    storage.put_file(KEY, _temp_file(tmp_path, DATA))
+    second = _temp_file(tmp_path, b'other')
+    storage.put_file(KEY, second)
+    assert not os.path.exists(second)
+    assert storage.size(KEY) == len(DATA)
+
+
+def test_multipart_upload(storage, tmp_path):
+    data = os.urandom(6 * 1024 * 1024)
+    storage.put_file(KEY, _temp_file(tmp_path, data))
+    assert storage.size(KEY) == len(data)
+    assert storage.read_range(KEY, 5 * 1024 * 1024, 1024) == data[5 * 1024 * 1024:5 * 1024 * 1024 + 1024]
+
+
+def test_presigned_url(storage, tmp_path):
+    storage.put_file(KEY, _temp_file(tmp_path, DATA))
+    url = storage.presigned_url(KEY, download_name='1_recording.wav', mimetype='audio/wav')
+    if storage.name == 'local':
+        assert url is None
+        return
+
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == DATA
+        assert response.headers['Content-Type'] == 'audio/wav'
+        assert '1_recording.wav' in response.headers['Content-Disposition']
+    ranged = urllib.request.Request(url, headers={'Range': 'bytes=0-3'})
+    with urllib.request.urlopen(ranged) as response:
+        assert response.status == 206
+        assert response.read() == b'RIFF'
+
+
+def test_recording_playback_redirects_to_bucket(s3_endpoint, tmp_path):
+    class S3Config(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/test.db'
+        ARCHIVE_DATABASE_URL = None
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        TESTING = True
+        SEED_ON_BOOTSTRAP = True
+        TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD = 'admin', 'admin'
+        TEST_FREELANCER_USERNAME, TEST_FREELANCER_PASSWORD = 'agent', 'agent'
+        RECORDING_STORAGE = 's3'
+        S3_PREFIX = f'test-{uuid.uuid4().hex}'
+
+    for name, value in s3_endpoint.items():
+        setattr(S3Config, name, value)
+    app = create_app(S3Config)
+    with app.app_context():
+        agent = User.query.filter_by(username='agent').one()
+        customer = Customer(name='홍길동', phone='010-1234-5678', call_status='대기', assigned_agent_id=agent.id)
+        db.session.add(customer)
+        db.session.commit()
+        customer_id = customer.id
+
+    agent_client = app.test_client()
+    agent_client.post('/login', data={'username': 'agent', 'password': 'agent'})
+    response = agent_client.post(f'/customer/{customer_id}/submit', content_type='multipart/form-data',
+                                 data={'recording': (io.BytesIO(DATA), 'call.wav')})
+    assert response.status_code == 302
+    assert not os.listdir(S3Config.UPLOAD_FOLDER)
+
+    with app.app_context():
+        submission = Submission.query.filter_by(customer_id=customer_id).one()
+        assert app.extensions['recording_storage'].size(submission.recording_file) == len(DATA)
+
+    admin_client = app.test_client()
+    admin_client.post('/login', data={'username': 'admin', 'password': 'admin'})
+    response = admin_client.get(f'/admin/submission/{submission.id}/recording')
+    assert response.status_code == 302
+    assert 'no-store' in response.headers['Cache-Control']
+    with urllib.request.urlopen(response.headers['Location']) as body:
+        assert body.read() == DATA
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()